@@ -1,18 +1,35 @@
 from flask import Flask
-from flasgger import Swagger
 from app.interfaces.flask_controller import bp
+from app.interfaces.api_docs import init_api_docs
+from app.interfaces.cli import graph_stats_command, openapi_export_command
+from app.interfaces.compression import compress_response
+from app.interfaces.json_provider import create_json_provider
+from app.infrastructure.health import get_health_probe
+from config import Config
 
-def create_app():
+API_DOCS_TEMPLATE = {
+    "swagger": "2.0",
+    "info": {
+        "title": "API de Componentes de Arquitectura",
+        "description": "Documentación interactiva de la API de componentes.",
+        "version": "1.0.0"
+    },
+    "basePath": "/",
+    "schemes": ["http"],
+}
+
+def create_app(config_overrides: dict = None):
     app = Flask(__name__)
-    Swagger(app, template={
-        "swagger": "2.0",
-        "info": {
-            "title": "API de Componentes de Arquitectura",
-            "description": "Documentación interactiva de la API de componentes.",
-            "version": "1.0.0"
-        },
-        "basePath": "/",
-        "schemes": ["http"],
-    })
+    app.config.from_object(Config)
+    if config_overrides:
+        app.config.update(config_overrides)
+    app.json = create_json_provider(app, app.config.get('JSON_SERIALIZER'))
+    init_api_docs(app, API_DOCS_TEMPLATE)
     app.register_blueprint(bp)
+    app.after_request(compress_response)
+    app.cli.add_command(graph_stats_command)
+    app.cli.add_command(openapi_export_command)
+    if app.config.get('HEALTH_PROBE_AUTOSTART') and not app.testing:
+        with app.app_context():
+            get_health_probe()
     return app
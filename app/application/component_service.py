@@ -1,16 +1,66 @@
+import heapq
+import uuid
+from flask import current_app
 from app.domain.component import Component
-from app.infrastructure.neo4j_repository import Neo4jComponentRepository
-from typing import List, Optional
+from app.domain.component_repository import ComponentRepository
+from app.domain.component_search import search_page, search_terms
+from app.infrastructure.change_log import get_change_log
+from app.infrastructure.graph_events import VersionedCache
+from app.infrastructure.repository_factory import current_graph_version, get_repository
+from app.infrastructure.suggest_index import get_suggest_index
+from app.infrastructure.write_coalescer import get_write_coalescer
+from typing import Any, Dict, List, Optional, Tuple
+
+def _stats_cache() -> VersionedCache:
+    cache = current_app.extensions.get('stats_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('stats_cache', VersionedCache(ttl=current_app.config.get('STATS_CACHE_TTL', 60)))
+    return cache
+
+CENTRALITY_METRICS = ('degree', 'pagerank', 'betweenness')
+
+def _analysis_cache() -> VersionedCache:
+    cache = current_app.extensions.get('analysis_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('analysis_cache', VersionedCache(ttl=current_app.config.get('ANALYSIS_CACHE_TTL', 300)))
+    return cache
+
+def _layout_cache():
+    cache = current_app.extensions.get('layout_cache')
+    if cache is None:
+        from app.infrastructure.layout import LayoutCache
+        cache = current_app.extensions.setdefault('layout_cache', LayoutCache(current_app.config.get('LAYOUT_INCREMENTAL_MAX', 200)))
+    return cache
+
+def subgraph_page(rows: List[Tuple[Component, List[Dict[str, Any]]]], limit: int) -> Dict[str, Any]:
+    """
+    Build a subgraph response from up to `limit + 1` repository rows (the extra one only tells
+    whether there is a next page): {'nodes', 'edges', 'next'}.
+    """
+    page = rows[:limit]
+    return {
+        'nodes': [component for component, _ in page],
+        'edges': [edge for _, edges in page for edge in edges],
+        'next': page[-1][0].id if len(rows) > limit else None,
+    }
 
 class ComponentService:
     """Use case for managing components."""
-    def __init__(self):
-        """Initializes the service with a Neo4j repository instance."""
-        self.repo = Neo4jComponentRepository()
+    def __init__(self, repo: Optional[ComponentRepository] = None):
+        """
+        Initializes the service with a repository.
+
+        Args:
+            repo (ComponentRepository, optional): Repository to use. Defaults to the configured backend,
+                whose single creates and updates are group-committed when WRITE_COALESCING is on.
+        """
+        self._coalesce = repo is None
+        self.repo = repo if repo is not None else get_repository()
 
     def create_component(self, data: dict) -> Component:
         """
         Create a new component in the database.
+        A random ID is assigned when none is given.
 
         Args:
             data (dict): Dictionary with component properties.
@@ -19,6 +69,11 @@ class ComponentService:
             Component: The created component instance.
         """
         component = Component.from_dict(data)
+        if not component.id:
+            component.id = str(uuid.uuid4())
+        coalescer = get_write_coalescer('create') if self._coalesce else None
+        if coalescer is not None:
+            return coalescer.submit(component)
         return self.repo.create(component)
 
     def get_all_components(self) -> List[Component]:
@@ -53,6 +108,9 @@ class ComponentService:
         Returns:
             Optional[Component]: The updated component if found, else None.
         """
+        coalescer = get_write_coalescer('update') if self._coalesce else None
+        if coalescer is not None:
+            return coalescer.submit((component_id, data))
         return self.repo.update(component_id, data)
 
     def delete_component(self, component_id: str) -> bool:
@@ -67,6 +125,27 @@ class ComponentService:
         """
         return self.repo.delete(component_id)
 
+    def purge_components(self, filters: dict, batch_size: int, dry_run: bool = False) -> dict:
+        """
+        Delete every component matching the filters, and their relationships, in bounded batches.
+
+        Args:
+            filters (dict): Component attributes and the values to match.
+            batch_size (int): Maximum components deleted per transaction.
+            dry_run (bool): Only count the matching components and the batches it would take.
+
+        Returns:
+            dict: {'matched': int, 'deleted': int, 'batches': int, 'dry_run': bool}
+        """
+        matched = self.repo.count_by(**filters)
+        batches = -(-matched // batch_size)
+        if dry_run or matched == 0:
+            return {'matched': matched, 'deleted': 0, 'batches': batches, 'dry_run': dry_run}
+        current_app.logger.info(f"Eliminando {matched} componentes {filters} en {batches} lotes de {batch_size}")
+        deleted = self.repo.delete_by(batch_size, **filters)
+        current_app.logger.info(f"Eliminados {deleted}/{matched} componentes {filters}")
+        return {'matched': matched, 'deleted': deleted, 'batches': batches, 'dry_run': False}
+
     def connect_components(self, id_from: str, id_to: str, props: dict) -> bool:
         """
         Create a relationship between two components.
@@ -81,6 +160,157 @@ class ComponentService:
         """
         return self.repo.connect_components(id_from, id_to, props)
 
+    def search_components(self, query: str, offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """
+        Full-text search of components by label, description, technology and host,
+        ignoring case and accents.
+
+        Args:
+            query (str): Words that must all appear (whole, as a prefix or inside a word).
+            offset (int): Number of ranked hits to skip.
+            limit (int): Maximum number of hits to return.
+
+        Returns:
+            Dict[str, Any]: {'items': [{'component', 'score', 'highlights'}], 'next': offset of
+            the next page or None}. Highlights wrap the matches of each field in <em> tags.
+        """
+        terms = search_terms(query)
+        return search_page(self.repo.search(terms, offset, limit + 1), terms, offset, limit)
+
+    def get_subgraph(self, filters: Dict[str, str], include_boundary: bool = False,
+                     after: Optional[str] = None, limit: int = 1000) -> Dict[str, Any]:
+        """
+        The components matching every filter and the CONNECTS_TO relationships among them,
+        one page at a time.
+
+        Args:
+            filters (dict): Component attributes the nodes must match.
+            include_boundary (bool): Also return the relationships between a matching component
+                and a non-matching one (flagged with 'boundary': True).
+            after (str, optional): 'next' cursor of the previous page.
+            limit (int): Maximum number of components per page.
+
+        Returns:
+            Dict[str, Any]: {'nodes', 'edges', 'next'}. Every relationship is returned in the
+            page of one of its matching endpoints; 'next' is None on the last page.
+        """
+        return subgraph_page(self.repo.subgraph(filters, include_boundary, after or '', limit + 1), limit)
+
+    def suggest_components(self, prefix: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Autocomplete components by the start of their label, id or a label word, ignoring
+        case and accents. Served from the in-memory suggestion index, not the repository.
+
+        Args:
+            prefix (str): Text typed so far.
+            limit (int): Maximum number of suggestions.
+
+        Returns:
+            List[Dict[str, str]]: {'id', 'label'} of the matching components.
+        """
+        return get_suggest_index().suggest(prefix, limit)
+
+    def get_graph_stats(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Aggregate statistics of the component graph, cached until the graph changes
+        (see current_graph_version).
+
+        Args:
+            top (int): Number of hubs and orphan ids to include.
+
+        Returns:
+            Dict[str, Any]: Node, attribute, relationship and degree statistics.
+        """
+        version = current_graph_version()
+        stats = _stats_cache().get_or_compute(top, version, lambda: self.repo.graph_stats(top))
+        return dict(stats, graph_version=version)
+
+    def get_centrality(self, metric: str, top: int = 20, samples: int = 64, write: bool = False) -> Dict[str, Any]:
+        """
+        Rank components by a centrality measure of the CONNECTS_TO graph. The graph is loaded
+        in bulk once per graph version and the scores are cached until the graph changes
+        (see current_graph_version).
+
+        Args:
+            metric (str): 'degree', 'pagerank' or 'betweenness'.
+            top (int): Number of components to return, best first.
+            samples (int): Source components sampled to estimate betweenness.
+            write (bool): Also store every score as the property centrality_<metric> of each component.
+
+        Returns:
+            Dict[str, Any]: The ranking, the graph size and version, and the number of
+            components written (None unless `write`).
+        """
+        from app.infrastructure import centrality
+        version = current_graph_version()
+        cache = _analysis_cache()
+        topology = cache.get_or_compute('topology', version, lambda: centrality.Topology(*self.repo.export_topology()))
+        params = {'samples': samples} if metric == 'betweenness' else {}
+        result = cache.get_or_compute((metric, tuple(params.items())), version,
+                                      lambda: {name: values.tolist() for name, values in centrality.METRICS[metric](topology, **params).items()})
+        scores = result['score']
+        ranking = [
+            {'id': topology.ids[i], **{name: values[i] for name, values in result.items()}}
+            for i in heapq.nlargest(top, range(len(scores)), key=scores.__getitem__)
+        ]
+        written = None
+        if write:
+            written = self.repo.set_scores(f'centrality_{metric}', dict(zip(topology.ids, scores)),
+                                           current_app.config.get('ANALYSIS_WRITE_BATCH_SIZE', 10000))
+        return {'metric': metric, 'graph_version': version, 'nodes': topology.size,
+                'relationships': topology.edges, 'top': ranking, 'written': written}
+
+    def get_layout(self, algorithm: str = 'auto', filters: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Node coordinates for drawing the graph, or the subgraph of the components matching
+        `filters`, cached per graph version (see current_graph_version) and relaxed
+        incrementally after small changes.
+
+        Args:
+            algorithm (str): 'auto', 'force' or 'hierarchical' (see app.infrastructure.layout).
+            filters (dict, optional): Component attributes the nodes must match.
+
+        Returns:
+            Dict[str, Any]: 'nodes' ({'id', 'x', 'y'}), 'edges' ([source, target]), the
+            algorithm, the graph version and whether the layout was relaxed incrementally.
+        """
+        from app.infrastructure.centrality import Topology
+        version = current_graph_version()
+        cache = _analysis_cache()
+        topology = cache.get_or_compute('topology', version, lambda: Topology(*self.repo.export_topology()))
+        key_filters = tuple(sorted((filters or {}).items()))
+        if key_filters:
+            whole = topology
+            topology = cache.get_or_compute(('topology', key_filters), version,
+                                            lambda: whole.restrict(c.id for c in self.repo.find_by(**filters)))
+        layout = _layout_cache().get((algorithm, key_filters), version, topology, algorithm)
+        positions = layout['positions']
+        return {
+            'algorithm': algorithm,
+            'graph_version': version,
+            'incremental': layout['incremental'],
+            'nodes': [{'id': component_id, 'x': positions[component_id][0], 'y': positions[component_id][1]}
+                      for component_id in topology.ids],
+            'edges': [list(edge) for edge in topology.edge_list()],
+        }
+
+    def get_changes(self, since: int, limit: int) -> Optional[Dict[str, Any]]:
+        """
+        Read the change log after a sequence number.
+
+        Args:
+            since (int): Last sequence number the caller applied (0 to read from the start).
+            limit (int): Maximum number of changes to return.
+
+        Returns:
+            Optional[Dict[str, Any]]: The page of changes, or None if the change feed is disabled.
+
+        Raises:
+            ChangeLogTruncated: If changes after `since` are no longer retained.
+        """
+        log = get_change_log()
+        return log.read(since, limit) if log is not None else None
+
     def close(self):
         """Closes the repository connection."""
         self.repo.close()
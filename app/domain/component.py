@@ -1,44 +1,39 @@
-from typing import List, Dict, Any
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
 
+COMPONENT_FIELDS = (
+    'id', 'label', 'component_type', 'category', 'location',
+    'technology', 'host', 'description', 'interface'
+)
+
+@dataclass
 class Component:
     """
     Domain entity for a deployment architecture component.
     Represents a system component with its main properties.
+    Being a dataclass, it is serialized natively by fast JSON encoders (orjson)
+    without building an intermediate dict.
+
+    Attributes:
+        id (str, optional): Unique identifier.
+        label (str): Display label for the component.
+        component_type (str): Type of the component (e.g., Service, Database).
+        category (str): High-level category (e.g., API, DB, Other).
+        location (str): Physical or logical location.
+        technology (str): Technology stack used.
+        host (str): Hostname or address.
+        description (str): Description of the component.
+        interface (str): Main interface type (e.g., REST, gRPC).
     """
-    def __init__(
-        self,
-        id: str = None,
-        label: str = '',
-        component_type: str = '',
-        category: str = '',
-        location: str = '',
-        technology: str = '',
-        host: str = '',
-        description: str = '',
-        interface: str = ''
-    ):
-        """
-        Initialize a Component instance.
-        Args:
-            id (str, optional): Unique identifier.
-            label (str): Display label for the component.
-            component_type (str): Type of the component (e.g., Service, Database).
-            category (str): High-level category (e.g., API, DB, Other).
-            location (str): Physical or logical location.
-            technology (str): Technology stack used.
-            host (str): Hostname or address.
-            description (str): Description of the component.
-            interface (str): Main interface type (e.g., REST, gRPC).
-        """
-        self.id = id
-        self.label = label
-        self.component_type = component_type
-        self.category = category
-        self.location = location
-        self.technology = technology
-        self.host = host
-        self.description = description
-        self.interface = interface
+    id: Optional[str] = None
+    label: str = ''
+    component_type: str = ''
+    category: str = ''
+    location: str = ''
+    technology: str = ''
+    host: str = ''
+    description: str = ''
+    interface: str = ''
 
     def to_dict(self) -> dict:
         """
@@ -0,0 +1,164 @@
+from typing import Any, Dict, List, Optional, Protocol, Tuple, runtime_checkable
+from app.domain.component import Component
+
+@runtime_checkable
+class ComponentRepository(Protocol):
+    """
+    Port for component persistence.
+    Every storage adapter (Neo4j, in-memory, ...) must implement these operations
+    so the application layer and the CSV import pipeline never depend on a concrete backend.
+    """
+    def close(self) -> None:
+        """Release any resource held by the repository."""
+        ...
+
+    def ping(self) -> bool:
+        """Check that the backend is reachable."""
+        ...
+
+    def create(self, component: Component) -> Component:
+        """Persist a new component and return it."""
+        ...
+
+    def get_by_id(self, component_id: str) -> Optional[Component]:
+        """Retrieve a component by its ID, or None if not found."""
+        ...
+
+    def get_all(self) -> List[Component]:
+        """Retrieve all components."""
+        ...
+
+    def find_by(self, **filters: Any) -> List[Component]:
+        """Retrieve the components whose attributes match every given filter."""
+        ...
+
+    def count_by(self, **filters: Any) -> int:
+        """Return the number of components whose attributes match every given filter."""
+        ...
+
+    def delete_by(self, batch_size: int, **filters: Any) -> int:
+        """
+        Delete the components matching every filter, and their relationships,
+        committing at most `batch_size` components per transaction. Returns the number deleted.
+        """
+        ...
+
+    def exists(self, component_id: str) -> bool:
+        """Return True if a component with the given ID exists."""
+        ...
+
+    def count(self) -> int:
+        """Return the number of components."""
+        ...
+
+    def update(self, component_id: str, data: dict) -> Optional[Component]:
+        """Update a component by its ID and return it, or None if not found."""
+        ...
+
+    def delete(self, component_id: str) -> bool:
+        """Delete a component and its relationships. Return False if not found."""
+        ...
+
+    def get_content_hashes(self) -> Dict[str, Optional[str]]:
+        """Return every component ID with its stored content hash (None if never synced)."""
+        ...
+
+    def upsert_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Create or overwrite components in one batch. Each row holds the component
+        fields plus 'content_hash'. Returns the number of rows written.
+        """
+        ...
+
+    def merge_components(self, rows: List[Dict[str, Any]], on_conflict: str = 'skip') -> List[bool]:
+        """
+        Create the components of a batch that do not exist and resolve the existing ones
+        according to `on_conflict`: 'skip' or 'error' leave them untouched, 'update' overwrites
+        them with the row's non-empty fields, 'replace' makes them exactly the row.
+        Returns one flag per row, in order: True if the component was created.
+        """
+        ...
+
+    def create_many(self, components: List[Component]) -> List[Optional[Component]]:
+        """
+        Create a batch of components with distinct IDs in one transaction.
+        Returns the created component per input, in order, or None where the ID already exists.
+        """
+        ...
+
+    def update_many(self, updates: List[Tuple[str, dict]]) -> List[Optional[Component]]:
+        """
+        Apply a batch of (component_id, data) updates in one transaction, in order.
+        Returns the updated component per update, or None where the ID does not exist.
+        """
+        ...
+
+    def delete_many(self, component_ids: List[str]) -> int:
+        """Delete the given components and their relationships in one batch. Returns the number deleted."""
+        ...
+
+    def connect_components(self, id_from: str, id_to: str, props: dict) -> bool:
+        """Create a CONNECTS_TO relationship. Return False if an endpoint is missing."""
+        ...
+
+    def upsert_relationship(self, id_from: str, id_to: str, props: Dict[str, Any]) -> Optional[str]:
+        """
+        Create or update the CONNECTS_TO relationship between two components.
+        Returns 'created', 'updated', or None if an endpoint is missing.
+        """
+        ...
+
+    def upsert_relationships(self, edges: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Create or update a batch of CONNECTS_TO relationships in one transaction.
+        Each edge holds 'source', 'target' and 'props'. Returns one status per edge,
+        in order: 'created', 'updated', or None if an endpoint is missing.
+        """
+        ...
+
+    def count_relationships(self) -> int:
+        """Return the number of CONNECTS_TO relationships."""
+        ...
+
+    def search(self, terms: List[str], offset: int, limit: int) -> List[Tuple[Component, float]]:
+        """
+        Full-text search over label, description, technology and host. `terms` are folded words
+        (see component_search.search_terms) that must all match a word, a word prefix or inside one.
+        Returns up to `limit` (component, score) hits after skipping `offset`, best first.
+        """
+        ...
+
+    def subgraph(self, filters: Dict[str, Any], include_boundary: bool, after: str, limit: int) -> List[Tuple[Component, List[Dict[str, Any]]]]:
+        """
+        Page of the components matching every filter, ordered by id: up to `limit` of them with
+        an id greater than `after`, each with its CONNECTS_TO relationships to other matching
+        components (outgoing only, so every relationship shows up once) and, if
+        `include_boundary`, the ones in either direction with components that do not match.
+        Relationships are {'source', 'target', 'props', 'boundary'}.
+        Raises:
+            ValueError: If a filter is not a Component attribute.
+        """
+        ...
+
+    def export_topology(self) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """
+        Return every component id and every CONNECTS_TO relationship as a (source, target) pair,
+        in bulk, for graph analytics.
+        """
+        ...
+
+    def set_scores(self, name: str, scores: Dict[str, float], batch_size: int) -> int:
+        """
+        Store an analytics score as the property `name` of each component, `batch_size`
+        components per transaction. Scores stay through updates until the component is deleted
+        or replaced. Returns the number of components updated.
+        """
+        ...
+
+    def graph_stats(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Aggregate statistics of the graph: node counts by label and by component attribute,
+        relationship counts by type and type_of_relation, degree distribution, the `top`
+        hubs by in/out degree and the orphan components.
+        """
+        ...
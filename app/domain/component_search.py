@@ -0,0 +1,84 @@
+import html
+import re
+import unicodedata
+from typing import Any, Dict, List, Tuple
+from app.domain.component import Component
+
+# Component attributes covered by full-text search
+SEARCH_FIELDS = ('label', 'description', 'technology', 'host')
+
+_WORD = re.compile(r'\w+')
+
+def _fold_char(char: str) -> str:
+    return ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c)).lower()
+
+def fold(text: str) -> str:
+    """Lower-case `text` and strip its accents ('Configuración' -> 'configuracion')."""
+    return ''.join(_fold_char(char) for char in text)
+
+def words(text: str) -> List[str]:
+    """Split `text` into folded words."""
+    return _WORD.findall(fold(text))
+
+def search_terms(query: str) -> List[str]:
+    """Split a user query into folded words, dropping duplicates."""
+    return list(dict.fromkeys(words(query)))
+
+def lucene_query(terms: List[str]) -> str:
+    """
+    Full-text query matching every term as a whole word, a word prefix or inside a word,
+    in that order of relevance. Terms come from search_terms, so they hold no Lucene syntax.
+    """
+    return ' AND '.join(f'({term}^3 OR {term}*^2 OR *{term}*)' for term in terms)
+
+def _match_spans(text: str, terms: List[str]) -> List[Tuple[int, int]]:
+    """Spans of `text` (original positions) where a term occurs, ignoring case and accents."""
+    folded, origin = [], []
+    for i, char in enumerate(text):
+        for c in _fold_char(char):
+            folded.append(c)
+            origin.append(i)
+    folded = ''.join(folded)
+    spans = []
+    for term in terms:
+        start = folded.find(term)
+        while start != -1:
+            end = start + len(term)
+            spans.append((origin[start], origin[end - 1] + 1))
+            start = folded.find(term, end)
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+def highlight(component: Component, terms: List[str], pre: str = '<em>', post: str = '</em>') -> Dict[str, str]:
+    """
+    Return the searchable fields of `component` that match a term, HTML-escaped, with every
+    match wrapped in `pre` ... `post`.
+    """
+    highlights = {}
+    for field in SEARCH_FIELDS:
+        text = getattr(component, field) or ''
+        spans = _match_spans(text, terms)
+        if not spans:
+            continue
+        parts, last = [], 0
+        for start, end in spans:
+            parts.append(html.escape(text[last:start]))
+            parts.append(pre + html.escape(text[start:end]) + post)
+            last = end
+        parts.append(html.escape(text[last:]))
+        highlights[field] = ''.join(parts)
+    return highlights
+
+def search_page(hits: List[Tuple[Component, float]], terms: List[str], offset: int, limit: int) -> Dict[str, Any]:
+    """
+    Build a search response from up to `limit + 1` ranked hits (the extra one only tells
+    whether there is a next page): {'items': [{'component', 'score', 'highlights'}], 'next'}.
+    """
+    items = [{'component': component, 'score': score, 'highlights': highlight(component, terms)}
+             for component, score in hits[:limit]]
+    return {'items': items, 'next': offset + limit if len(hits) > limit else None}
@@ -0,0 +1,177 @@
+import math
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+from flask import current_app
+
+class AdmissionRejected(Exception):
+    """
+    Raised when an import cannot be admitted: the queue is full or no slot freed in time.
+    """
+    def __init__(self, retry_after: int):
+        super().__init__(f"Import rejected, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class Neo4jImportSlots:
+    """
+    Cluster-wide import slots kept as (:ImportLock {slot}) nodes, so every API process
+    sharing the database respects the same limit. A slot is leased to an owner token and
+    expires after `ttl` seconds, so a crashed worker cannot hold it forever.
+    """
+    def __init__(self, slots: int, ttl: float = 3600):
+        self.slots = slots
+        self.ttl = ttl
+        self._constraint_created = False
+
+    @staticmethod
+    def _claim(tx, slot: int, owner: str, ttl_ms: int) -> bool:
+        # Writing checked_at takes the node's write lock before the owner is read,
+        # so two processes can never claim the same slot.
+        result = tx.run(
+            "MERGE (l:ImportLock {slot: $slot}) "
+            "SET l.checked_at = timestamp() "
+            "WITH l WHERE l.owner IS NULL OR l.expires_at < timestamp() "
+            "SET l.owner = $owner, l.expires_at = timestamp() + $ttl_ms "
+            "RETURN l.slot AS slot",
+            slot=slot, owner=owner, ttl_ms=ttl_ms
+        )
+        return result.single() is not None
+
+    def acquire(self, owner: str) -> Optional[int]:
+        """
+        Claim a free slot for `owner`.
+        Returns:
+            Optional[int]: The claimed slot, or None if all of them are taken.
+        """
+        from app.infrastructure.neo4j_driver import get_driver, get_database, guarded
+        driver = get_driver()
+        with guarded(), driver.session(database=get_database()) as session:
+            if not self._constraint_created:
+                session.execute_write(lambda tx: tx.run(
+                    "CREATE CONSTRAINT import_lock_slot IF NOT EXISTS "
+                    "FOR (l:ImportLock) REQUIRE l.slot IS UNIQUE"
+                ).consume())
+                self._constraint_created = True
+            for slot in range(self.slots):
+                if session.execute_write(self._claim, slot, owner, int(self.ttl * 1000)):
+                    return slot
+        return None
+
+    def release(self, slot: int, owner: str):
+        from app.infrastructure.neo4j_driver import get_driver, get_database, guarded
+        driver = get_driver()
+        with guarded(), driver.session(database=get_database()) as session:
+            session.execute_write(lambda tx: tx.run(
+                "MATCH (l:ImportLock {slot: $slot, owner: $owner}) REMOVE l.owner, l.expires_at",
+                slot=slot, owner=owner
+            ).consume())
+
+class ImportAdmission:
+    """
+    Bulkhead for the import endpoints.
+    At most `max_concurrent` imports run at once in this process and at most `max_queued`
+    wait for a slot (each waiting request holds a server thread, so the two together bound
+    the threads imports can take away from reads). Requests beyond that, or still waiting
+    after `queue_timeout` seconds, are rejected with a Retry-After estimated from the
+    duration of recent imports. With `cluster_slots` the limit also applies across processes.
+    """
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, max_concurrent: int = 1, max_queued: int = 1, queue_timeout: float = 30,
+                 cluster_slots: Optional[Neo4jImportSlots] = None):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.cluster_slots = cluster_slots
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiting = 0
+        self._avg_duration: Optional[float] = None
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to be free for a new request."""
+        duration = self._avg_duration if self._avg_duration is not None else self.queue_timeout
+        return max(1, math.ceil(duration * (self._waiting + 1) / self.max_concurrent))
+
+    @contextmanager
+    def admit(self):
+        """
+        Hold an import slot for the duration of the block.
+        Raises:
+            AdmissionRejected: If the queue is full or no slot freed within queue_timeout.
+        """
+        with self._lock:
+            if self._active + self._waiting >= self.max_concurrent + self.max_queued:
+                raise AdmissionRejected(self.retry_after())
+            self._waiting += 1
+        deadline = time.monotonic() + self.queue_timeout
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        with self._lock:
+            self._waiting -= 1
+            if not acquired:
+                raise AdmissionRejected(self.retry_after())
+            self._active += 1
+        try:
+            with self._cluster_slot(deadline):
+                started = time.monotonic()
+                yield
+                self._record_duration(time.monotonic() - started)
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._slots.release()
+
+    @contextmanager
+    def _cluster_slot(self, deadline: float):
+        if self.cluster_slots is None:
+            yield
+            return
+        owner = uuid.uuid4().hex
+        slot = self.cluster_slots.acquire(owner)
+        while slot is None:
+            if time.monotonic() >= deadline:
+                raise AdmissionRejected(self.retry_after())
+            time.sleep(self.POLL_INTERVAL)
+            slot = self.cluster_slots.acquire(owner)
+        try:
+            yield
+        finally:
+            self.cluster_slots.release(slot, owner)
+
+    def _record_duration(self, seconds: float):
+        with self._lock:
+            if self._avg_duration is None:
+                self._avg_duration = seconds
+            else:
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * seconds
+
+def get_import_admission() -> ImportAdmission:
+    """
+    Return the application's import bulkhead, configured by IMPORT_MAX_CONCURRENT,
+    IMPORT_MAX_QUEUED, IMPORT_QUEUE_TIMEOUT and, with the neo4j backend,
+    IMPORT_CLUSTER_SLOTS (0 disables the cluster-wide limit) and IMPORT_CLUSTER_LOCK_TTL.
+    """
+    admission = current_app.extensions.get('import_admission')
+    if admission is None:
+        config = current_app.config
+        cluster_slots = None
+        if config.get('IMPORT_CLUSTER_SLOTS', 0) > 0 and config.get('REPOSITORY_BACKEND', 'neo4j').lower() == 'neo4j':
+            cluster_slots = Neo4jImportSlots(config['IMPORT_CLUSTER_SLOTS'], ttl=config.get('IMPORT_CLUSTER_LOCK_TTL', 3600))
+        admission = current_app.extensions.setdefault('import_admission', ImportAdmission(
+            max_concurrent=config.get('IMPORT_MAX_CONCURRENT', 1),
+            max_queued=config.get('IMPORT_MAX_QUEUED', 1),
+            queue_timeout=config.get('IMPORT_QUEUE_TIMEOUT', 30),
+            cluster_slots=cluster_slots,
+        ))
+    return admission
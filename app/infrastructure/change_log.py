@@ -0,0 +1,552 @@
+import bisect
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+class ChangeLogTruncated(Exception):
+    """
+    Raised when the changes after the requested sequence number were dropped by retention;
+    the consumer has to resynchronize from the full component list.
+    """
+    def __init__(self, floor: int):
+        super().__init__(f"Changes up to {floor} are no longer retained")
+        self.floor = floor
+
+def _entry(entity: str, op: str, key: Optional[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    return {'entity': entity, 'op': op, 'key': key, 'data': data}
+
+def _component(op: str, component) -> Dict[str, Any]:
+    data = component.to_dict() if hasattr(component, 'to_dict') else dict(component)
+    data.pop('content_hash', None)
+    return _entry('component', op, data['id'], data)
+
+def _relationship(op: str, source: str, target: str, props: Dict[str, Any]) -> Dict[str, Any]:
+    return _entry('relationship', op, f"{source}->{target}", {'source': source, 'target': target, **(props or {})})
+
+# One function per mutating repository method, called with the method's result and arguments,
+# returning the change log entries of what was actually written.
+def _create(result, component):
+    return [_component('create', result)]
+
+def _update(result, component_id, data):
+    return [_component('update', result)] if result is not None else []
+
+def _delete(result, component_id):
+    return [_entry('component', 'delete', component_id, {})] if result else []
+
+def _create_many(results, components):
+    return [_component('create', c) for c in results if c is not None]
+
+def _update_many(results, updates):
+    return [_component('update', c) for c in results if c is not None]
+
+def _delete_many(result, component_ids):
+    return [_entry('component', 'delete', cid, {}) for cid in component_ids] if result else []
+
+def _delete_by(result, batch_size, **filters):
+    return [_entry('component', 'delete_where', None, filters)] if result else []
+
+def _upsert_many(result, rows):
+    return [_component('update', row) for row in rows]
+
+def _merge_components(created, rows, on_conflict='skip'):
+    entries = []
+    for row, was_created in zip(rows, created):
+        if was_created:
+            entries.append(_component('create', row))
+        elif on_conflict in ('update', 'replace'):
+            # 'update' only wrote the row's non-empty fields
+            fields = row if on_conflict == 'replace' else {k: v for k, v in row.items() if v not in (None, '')}
+            entries.append(_component('update', fields))
+    return entries
+
+def _connect_components(result, id_from, id_to, props):
+    return [_relationship('create', id_from, id_to, props)] if result else []
+
+def _upsert_relationship(status, id_from, id_to, props):
+    return [_relationship('create' if status == 'created' else 'update', id_from, id_to, props)] if status else []
+
+def _upsert_relationships(statuses, edges):
+    return [_relationship('create' if status == 'created' else 'update', edge['source'], edge['target'], edge.get('props'))
+            for edge, status in zip(edges, statuses) if status]
+
+def _load_csv(entity):
+    # The staged file is deleted after the import: only the counts are worth logging
+    def entries(result, url, *args, **kwargs):
+        return [_entry(entity, 'import', None, dict(result))]
+    return entries
+
+CHANGE_RECORDERS = {
+    'create': _create, 'update': _update, 'delete': _delete,
+    'create_many': _create_many, 'update_many': _update_many,
+    'delete_many': _delete_many, 'delete_by': _delete_by,
+    'upsert_many': _upsert_many, 'merge_components': _merge_components,
+    'connect_components': _connect_components,
+    'upsert_relationship': _upsert_relationship, 'upsert_relationships': _upsert_relationships,
+    'load_csv_components': _load_csv('component'), 'load_csv_edges': _load_csv('relationship'),
+}
+
+def requires_resync(change: Dict[str, Any]) -> bool:
+    """
+    True for the entries of bulk operations ('delete_where' with the filters, 'import' with the
+    counts), which do not say which keys changed: a consumer cannot apply them one by one and has
+    to reload the graph (GET /components) as of their seq, then go on reading after it.
+    """
+    return change['key'] is None
+
+def describe_changes(method: str, result: Any, args: tuple, kwargs: dict) -> List[Dict[str, Any]]:
+    """Return the change log entries (without 'seq' and 'ts') of a call of a mutating repository method."""
+    recorder = CHANGE_RECORDERS.get(method)
+    return recorder(result, *args, **kwargs) if recorder is not None else []
+
+def fold_superseded(chain: List[Dict[str, Any]], upto: int, protected: Set[int]) -> Tuple[List[int], Dict[int, Dict[str, Any]]]:
+    """
+    Compact the entries of one key, given in seq order. Entries with seq <= upto followed by
+    another one are dropped, except the `protected` seqs. Updates only hold the fields they
+    wrote, so the fields of dropped entries are folded into the next kept one unless a create or
+    delete resets them. Returns the seqs to drop and the new data of the entries that absorbed
+    fields, by seq.
+    """
+    drop, rewrite = [], {}
+    carried = None
+    for position, entry in enumerate(chain):
+        data = entry['data']
+        if entry['op'] == 'update' and carried:
+            data = {**carried, **data}
+        if entry['seq'] <= upto and position < len(chain) - 1 and entry['seq'] not in protected:
+            drop.append(entry['seq'])
+            carried = data
+        else:
+            if data != entry['data']:
+                rewrite[entry['seq']] = data
+            carried = None
+    return drop, rewrite
+
+READ_HEAD_QUERY = "OPTIONAL MATCH (h:ChangeLogHead {name: 'head'}) RETURN h.seq AS seq, h.floor AS floor"
+READ_CHANGES_QUERY = "MATCH (c:Change) WHERE c.seq > $since RETURN c ORDER BY c.seq LIMIT $limit"
+
+def changes_page(floor: int, last_seq: int, changes: List[Dict[str, Any]], since: int, limit: int) -> Dict[str, Any]:
+    """
+    Build the page returned by ChangeLog.read from the stored entries after `since`.
+    Raises:
+        ChangeLogTruncated: If changes after `since` were dropped by retention.
+    """
+    if since < floor:
+        raise ChangeLogTruncated(floor)
+    changes = changes[:limit]
+    next_seq = changes[-1]['seq'] if changes else since
+    return {'changes': changes, 'next': next_seq, 'last_seq': last_seq,
+            'has_more': bool(changes) and next_seq < last_seq}
+
+class ChangeLog:
+    """
+    Ordered log of the graph mutations, each with a monotonic sequence number, so consumers
+    can mirror the graph by reading the changes after the last sequence they applied.
+
+    Each entry has 'seq', 'ts', 'entity' ('component' or 'relationship'), 'op' ('create',
+    'update', 'delete', 'delete_where' or 'import'), 'key' (component id or 'source->target',
+    None for bulk operations) and 'data' (the fields written, the full component where known).
+    Deleting a component also deletes its relationships. Bulk operations cannot be replayed
+    entry by entry: see requires_resync.
+
+    Retention drops the entries older than the last `retention` sequence numbers; reading from
+    before them raises ChangeLogTruncated. Every `compact_every` sequence numbers the log is
+    compacted: older entries superseded by a later one for the same key are removed, which keeps
+    the mirrored state correct while the last `compact_every` changes stay exact (see
+    fold_superseded). An update only holds the fields it wrote, so the fields of the entries it
+    supersedes are folded into it; after compaction it may be the first entry of its key, so
+    consumers apply updates as upserts. A component delete is kept even if the component was
+    created again when relationships of it were logged before: replaying it is what drops those
+    relationships.
+    """
+    def __init__(self, retention: int = 100000, compact_every: int = 10000):
+        self.retention = retention
+        self.compact_every = compact_every
+        self._compacting = threading.Lock()
+        self._listeners: List[Callable[[List[Dict[str, Any]]], Any]] = []
+
+    def add_listener(self, callback: Callable[[List[Dict[str, Any]]], Any]):
+        """Call `callback` with the entries appended by this process, right after each append."""
+        self._listeners.append(callback)
+
+    def record(self, method: str, result: Any, args: tuple, kwargs: dict):
+        """
+        Append the changes made by a successful call of a mutating repository method and publish them.
+        """
+        entries = self.stage(None, method, result, args, kwargs)
+        if entries is not None:
+            self.publish(entries)
+
+    def prepare(self):
+        """Get ready to append inside a write transaction (create the schema); no-op by default."""
+
+    def stage(self, tx, method: str, result: Any, args: tuple, kwargs: dict) -> Optional[List[Dict[str, Any]]]:
+        """
+        Append the changes made by a call of a mutating repository method, inside its write
+        transaction `tx` when there is one, so they commit together with the write. Returns the
+        entries, to publish once the write has committed, or None if the call changed nothing.
+        """
+        entries = describe_changes(method, result, args, kwargs)
+        if not entries:
+            return None
+        ts = time.time()
+        for entry in entries:
+            entry['ts'] = ts
+        self.append(entries, tx)
+        return entries
+
+    def settle(self, entries: List[Dict[str, Any]]) -> Optional[Tuple[int, int]]:
+        """
+        Give committed entries their sequence numbers if append could not, and return the first
+        and last seq numbered (None if none). By default append numbers them at once.
+        """
+        seqs = [entry['seq'] for entry in entries if 'seq' in entry]
+        return (min(seqs), max(seqs)) if seqs else None
+
+    def publish(self, entries: List[Dict[str, Any]]):
+        """Number committed entries, pass them to the listeners and start maintenance when it is due."""
+        try:
+            span = self.settle(entries)
+        except Exception:
+            # The entries are committed; the next settle, from any process, numbers them
+            logger.exception("No se pudieron numerar las entradas del registro de cambios")
+            span = None
+        for listener in self._listeners:
+            try:
+                listener(entries)
+            except Exception:
+                logger.exception("Error en un suscriptor del registro de cambios")
+        if span is not None and (span[0] - 1) // self.compact_every != span[1] // self.compact_every:
+            threading.Thread(target=self.maintain, name='change-log-compaction', daemon=True).start()
+
+    def maintain(self):
+        """Apply retention and compaction; skipped if another run is in progress in this process."""
+        if not self._compacting.acquire(blocking=False):
+            return
+        try:
+            head = self.head()
+            self.truncate(head - self.retention)
+            self.compact(head - self.compact_every)
+        except Exception:
+            logger.exception("No se pudo compactar el registro de cambios")
+        finally:
+            self._compacting.release()
+
+    def read(self, since: int, limit: int) -> Dict[str, Any]:
+        """
+        Return the first `limit` changes with seq > `since`, in order.
+        Returns:
+            Dict[str, Any]: {'changes': [...], 'next': seq to pass as `since` next time,
+            'last_seq': newest seq, 'has_more': bool}
+        Raises:
+            ChangeLogTruncated: If changes after `since` were dropped by retention.
+        """
+        floor, last_seq, changes = self._read(since, limit)
+        return changes_page(floor, last_seq, changes, since, limit)
+
+    def append(self, entries: List[Dict[str, Any]], tx=None) -> Optional[int]:
+        """
+        Store the entries, with `tx` in that write transaction of the repository's database.
+        If the log can number them at once, sets their consecutive 'seq' and returns the first
+        one; otherwise returns None and settle() numbers them after the commit.
+        """
+        raise NotImplementedError
+
+    def head(self) -> int:
+        raise NotImplementedError
+
+    def truncate(self, floor: int):
+        """Drop the entries with seq <= floor."""
+        raise NotImplementedError
+
+    def compact(self, upto: int):
+        """
+        Drop the entries with seq <= upto superseded by a later entry for the same key, except
+        component deletes preceded by relationship entries of the component, folding the fields
+        of dropped updates into the entry that supersedes them.
+        """
+        raise NotImplementedError
+
+    def _read(self, since: int, limit: int):
+        """Return (floor, last seq, up to `limit` entries with seq > since)."""
+        raise NotImplementedError
+
+class MemoryChangeLog(ChangeLog):
+    """Change log kept in process memory, for the in-memory repository."""
+    def __init__(self, retention: int = 100000, compact_every: int = 10000):
+        super().__init__(retention, compact_every)
+        self._lock = threading.Lock()
+        self._entries: List[Dict[str, Any]] = []
+        self._seqs: List[int] = []
+        self._latest: Dict[tuple, int] = {}
+        self._head = 0
+        self._floor = 0
+
+    def append(self, entries, tx=None):
+        with self._lock:
+            first = self._head + 1
+            for entry in entries:
+                self._head += 1
+                entry['seq'] = self._head
+                self._entries.append(entry)
+                self._seqs.append(self._head)
+                if entry['key'] is not None:
+                    self._latest[(entry['entity'], entry['key'])] = self._head
+            return first
+
+    def head(self):
+        return self._head
+
+    def truncate(self, floor):
+        with self._lock:
+            if floor <= self._floor:
+                return
+            self._floor = floor
+            self._keep(lambda e: e['seq'] > floor)
+            self._latest = {k: seq for k, seq in self._latest.items() if seq > floor}
+
+    def compact(self, upto):
+        with self._lock:
+            # First seq of a relationship entry naming each component
+            related: Dict[str, int] = {}
+            chains: Dict[tuple, List[Dict[str, Any]]] = {}
+            for e in self._entries:
+                if e['key'] is None:
+                    continue
+                if e['entity'] == 'relationship':
+                    related.setdefault(e['data']['source'], e['seq'])
+                    related.setdefault(e['data']['target'], e['seq'])
+                chains.setdefault((e['entity'], e['key']), []).append(e)
+            protected = {e['seq'] for e in self._entries
+                         if e['entity'] == 'component' and e['op'] == 'delete' and related.get(e['key'], e['seq']) < e['seq']}
+            dropped = set()
+            for chain in chains.values():
+                if len(chain) < 2 or chain[0]['seq'] > upto:
+                    continue
+                drop, rewrite = fold_superseded(chain, upto, protected)
+                dropped.update(drop)
+                for e in chain:
+                    if e['seq'] in rewrite:
+                        e['data'] = rewrite[e['seq']]
+            self._keep(lambda e: e['seq'] not in dropped)
+
+    def _keep(self, predicate):
+        self._entries = [e for e in self._entries if predicate(e)]
+        self._seqs = [e['seq'] for e in self._entries]
+
+    def _read(self, since, limit):
+        with self._lock:
+            start = bisect.bisect_right(self._seqs, since)
+            return self._floor, self._head, [dict(e) for e in self._entries[start:start + limit]]
+
+class Neo4jChangeLog(ChangeLog):
+    """
+    Change log stored in Neo4j as (:Change) nodes, shared by every API process.
+
+    Changes are appended in the transaction of the write they describe, after it, as
+    (:PendingChange) nodes without a sequence number, so both commit or neither does and
+    concurrent writes do not wait for each other. Once the write has committed, settle() numbers
+    every pending entry in a short transaction of its own that holds the write lock of the single
+    (:ChangeLogHead) node: only that step is serialized, and since seqs are handed out under the
+    lock, readers never see a gap that is filled later. Pending entries are numbered in the
+    order they were staged (writes to the same node stage in commit order, as they wait for its
+    lock), each write's entries together. Entries left pending by a process that stopped between
+    the commit and settle() are numbered by the next settle() of any process.
+    Bulk writes that run as CALL { ... } IN TRANSACTIONS cannot share a transaction and are
+    logged right after they complete.
+    """
+    def __init__(self, retention: int = 100000, compact_every: int = 10000):
+        super().__init__(retention, compact_every)
+        self._schema_created = False
+
+    def _session(self):
+        from app.infrastructure.neo4j_driver import get_database, get_driver
+        return get_driver().session(database=get_database())
+
+    SCHEMA = (
+        "CREATE CONSTRAINT change_log_head IF NOT EXISTS FOR (h:ChangeLogHead) REQUIRE h.name IS UNIQUE",
+        "CREATE INDEX pending_change_order IF NOT EXISTS FOR (c:PendingChange) ON (c.staged_at)",
+        "CREATE INDEX change_seq IF NOT EXISTS FOR (c:Change) ON (c.seq)",
+        "CREATE INDEX change_key IF NOT EXISTS FOR (c:Change) ON (c.entity, c.key)",
+        "CREATE INDEX change_source IF NOT EXISTS FOR (c:Change) ON (c.source)",
+        "CREATE INDEX change_target IF NOT EXISTS FOR (c:Change) ON (c.target)",
+    )
+
+    def prepare(self):
+        """Create the constraint and indexes of the log once per process (not allowed inside a write)."""
+        if self._schema_created:
+            return
+        from app.infrastructure.neo4j_driver import guarded
+        with guarded(), self._session() as session:
+            for statement in self.SCHEMA:
+                session.run(statement).consume()
+        self._schema_created = True
+
+    def _write(self, work, *args):
+        from app.infrastructure.neo4j_driver import guarded
+        self.prepare()
+        with guarded(), self._session() as session:
+            return session.execute_write(work, *args)
+
+    # Pending entries numbered per settle transaction
+    SETTLE_BATCH = 10000
+
+    @staticmethod
+    def _append(tx, batch, rows):
+        # One staging instant for the whole write keeps its entries together
+        tx.run(
+            "WITH datetime.realtime() AS staged_at "
+            "UNWIND range(0, size($rows) - 1) AS i "
+            "WITH staged_at, i, $rows[i] AS row "
+            "CREATE (:PendingChange {batch: $batch, i: i, staged_at: staged_at, ts: row.ts, entity: row.entity, "
+            "                        op: row.op, key: row.key, data: row.data, source: row.source, target: row.target})",
+            batch=batch, rows=rows
+        ).consume()
+
+    @staticmethod
+    def _settle(tx, limit):
+        # Setting a property of the head takes its write lock before the pending entries are read
+        return [record.data() for record in tx.run(
+            "MERGE (h:ChangeLogHead {name: 'head'}) ON CREATE SET h.seq = 0, h.floor = 0 "
+            "SET h.settled_at = timestamp() "
+            "WITH h "
+            "MATCH (c:PendingChange) "
+            "WITH h, c ORDER BY c.staged_at, c.batch, c.i LIMIT $limit "
+            "WITH h, collect(c) AS pending "
+            "WITH h, pending, h.seq AS base "
+            "SET h.seq = base + size(pending) "
+            "WITH base, pending "
+            "UNWIND range(0, size(pending) - 1) AS i "
+            "WITH base + i + 1 AS seq, pending[i] AS c "
+            "WITH seq, c, c.batch AS batch, c.i AS position "
+            "REMOVE c:PendingChange, c.staged_at, c.batch, c.i "
+            "SET c:Change, c.seq = seq "
+            "RETURN batch, position, seq",
+            limit=limit
+        )]
+
+    def append(self, entries, tx=None):
+        batch = uuid.uuid4().hex
+        for i, entry in enumerate(entries):
+            entry['_pending'] = (batch, i)
+        # Relationship entries keep their endpoints as properties, for compaction
+        rows = [{'ts': e['ts'], 'entity': e['entity'], 'op': e['op'], 'key': e['key'],
+                 'data': json.dumps(e['data'], default=str),
+                 'source': e['data'].get('source') if e['entity'] == 'relationship' else None,
+                 'target': e['data'].get('target') if e['entity'] == 'relationship' else None}
+                for e in entries]
+        if tx is not None:
+            self._append(tx, batch, rows)
+            return None
+        self._write(self._append, batch, rows)
+        self.settle(entries)
+        return entries[0].get('seq')
+
+    def settle(self, entries):
+        pending = {entry.pop('_pending'): entry for entry in entries if '_pending' in entry}
+        span = None
+        while True:
+            numbered = self._write(self._settle, self.SETTLE_BATCH)
+            for record in numbered:
+                entry = pending.pop((record['batch'], record['position']), None)
+                if entry is not None:
+                    entry['seq'] = record['seq']
+            if numbered:
+                first = span[0] if span else numbered[0]['seq']
+                span = (first, numbered[-1]['seq'])
+            if len(numbered) < self.SETTLE_BATCH:
+                return span
+
+    def head(self):
+        from app.infrastructure.neo4j_driver import guarded
+        with guarded(), self._session() as session:
+            record = session.execute_read(lambda tx: tx.run(READ_HEAD_QUERY).single())
+        return record['seq'] or 0
+
+    def truncate(self, floor):
+        if floor <= 0:
+            return
+        self._write(lambda tx: tx.run(
+            "MATCH (h:ChangeLogHead {name: 'head'}) WHERE h.floor < $floor SET h.floor = $floor", floor=floor).consume())
+        self._run_in_transactions(
+            "MATCH (c:Change) WHERE c.seq <= $floor "
+            "CALL { WITH c DELETE c } IN TRANSACTIONS OF 10000 ROWS", floor=floor)
+
+    # Keys compacted per transaction
+    COMPACT_BATCH = 1000
+
+    def compact(self, upto):
+        from app.infrastructure.neo4j_driver import guarded
+        with guarded(), self._session() as session:
+            keys = session.execute_read(lambda tx: [record['k'] for record in tx.run(
+                "MATCH (c:Change) WHERE c.key IS NOT NULL "
+                "WITH c.entity AS entity, c.key AS key, min(c.seq) AS first, count(*) AS entries "
+                "WHERE first <= $upto AND entries > 1 "
+                "RETURN [entity, key] AS k", upto=upto)])
+        for start in range(0, len(keys), self.COMPACT_BATCH):
+            self._write(self._compact_keys, keys[start:start + self.COMPACT_BATCH], upto)
+
+    @staticmethod
+    def _compact_keys(tx, keys, upto):
+        chains: Dict[tuple, List[Dict[str, Any]]] = {}
+        protected = set()
+        for record in tx.run(
+            "UNWIND $keys AS k "
+            "MATCH (c:Change {entity: k[0], key: k[1]}) "
+            "RETURN c.entity AS entity, c.key AS key, c.seq AS seq, c.op AS op, c.data AS data, "
+            "       c.entity = 'component' AND c.op = 'delete' AND ("
+            "         EXISTS { MATCH (r:Change {source: c.key}) WHERE r.seq < c.seq } OR "
+            "         EXISTS { MATCH (r:Change {target: c.key}) WHERE r.seq < c.seq }) AS protected "
+            "ORDER BY c.seq", keys=keys):
+            chains.setdefault((record['entity'], record['key']), []).append(
+                {'seq': record['seq'], 'op': record['op'], 'data': json.loads(record['data'])})
+            if record['protected']:
+                protected.add(record['seq'])
+        drop, rewrite = [], []
+        for chain in chains.values():
+            dropped, rewritten = fold_superseded(chain, upto, protected)
+            drop += dropped
+            rewrite += [{'seq': seq, 'data': json.dumps(data, default=str)} for seq, data in rewritten.items()]
+        tx.run("UNWIND $rewrite AS row MATCH (c:Change {seq: row.seq}) SET c.data = row.data", rewrite=rewrite).consume()
+        tx.run("UNWIND $drop AS seq MATCH (c:Change {seq: seq}) DELETE c", drop=drop).consume()
+
+    def _run_in_transactions(self, query, **params):
+        from app.infrastructure.neo4j_driver import guarded
+        with guarded(), self._session() as session:
+            session.run(query, **params).consume()
+
+    def _read(self, since, limit):
+        from app.infrastructure.neo4j_driver import guarded
+        def work(tx):
+            head = tx.run(READ_HEAD_QUERY).single()
+            changes = [dict(record['c']) for record in tx.run(READ_CHANGES_QUERY, since=since, limit=limit)]
+            return head['floor'] or 0, head['seq'] or 0, changes
+        with guarded(), self._session() as session:
+            floor, last_seq, changes = session.execute_read(work)
+        for change in changes:
+            change['data'] = json.loads(change['data'])
+        return floor, last_seq, changes
+
+def get_change_log() -> Optional[ChangeLog]:
+    """
+    Return the application's change log, or None when CHANGE_FEED is off. It lives in the
+    database with the neo4j backend and in memory otherwise. Configured by
+    CHANGE_LOG_RETENTION and CHANGE_LOG_COMPACT_EVERY.
+    """
+    if not current_app.config.get('CHANGE_FEED', True):
+        return None
+    log = current_app.extensions.get('change_log')
+    if log is None:
+        config = current_app.config
+        cls = Neo4jChangeLog if config.get('REPOSITORY_BACKEND', 'neo4j').lower() == 'neo4j' else MemoryChangeLog
+        log = current_app.extensions.setdefault('change_log', cls(
+            retention=config.get('CHANGE_LOG_RETENTION', 100000),
+            compact_every=config.get('CHANGE_LOG_COMPACT_EVERY', 10000),
+        ))
+    return log
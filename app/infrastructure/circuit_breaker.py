@@ -0,0 +1,64 @@
+import math
+import threading
+import time
+
+class DatabaseUnavailable(Exception):
+    """
+    Raised when the database cannot be reached, or is known to be down and is not retried yet.
+    Mapped to 503 Service Unavailable with Retry-After by the API.
+    """
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """
+    Fails fast while a dependency is down instead of letting every request wait on it.
+    After `failure_threshold` consecutive failures the circuit opens and calls are rejected
+    for `reset_timeout` seconds; then a single trial call is let through (half-open) and its
+    outcome closes the circuit again or reopens it for another period.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self._opened_at + self.reset_timeout - time.monotonic()))
+
+    def before_call(self):
+        """
+        Raises:
+            DatabaseUnavailable: If the circuit is open, or half-open with the trial call in flight.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            now = time.monotonic()
+            # A trial whose outcome was never recorded is replaced after another period
+            if now - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._opened_at = now
+                return
+            raise DatabaseUnavailable("Database unavailable (circuit open)", self.retry_after())
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
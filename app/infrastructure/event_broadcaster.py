@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+from app.infrastructure.change_log import ChangeLogTruncated, requires_resync
+
+logger = logging.getLogger(__name__)
+
+class TooManySubscribers(Exception):
+    """Raised when the broadcaster already serves its maximum number of subscribers."""
+
+class Subscriber:
+    """
+    Bounded queue of the events pending for one client. A client that falls `maxsize` events
+    behind loses its backlog, which is replaced by a single resync marker.
+    """
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.resyncs = 0
+
+    def offer(self, event: Optional[Dict[str, Any]]):
+        """Queue an event without waiting; None tells the client to disconnect."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            if event is None:
+                self.queue.put_nowait(None)
+                return
+            self.resyncs += 1
+            # The client reloads what it missed (up to and including this change) and carries on
+            self.queue.put_nowait({'event': 'resync', 'seq': event['seq']})
+
+class ChangeBroadcaster:
+    """
+    Pushes the change log to event stream subscribers.
+    A single task per process tails the log (one query per `poll_interval`, however many
+    clients are connected) and fans each change out to the subscribers' bounded queues
+    without waiting, so a slow client never delays the others or the poller, and no
+    thread is held per subscriber. The task runs only while someone is subscribed.
+    """
+    def __init__(self, repo, poll_interval: float = 0.5, queue_size: int = 1000,
+                 max_subscribers: int = 1000, batch_limit: int = 1000):
+        """
+        Args:
+            repo: Async repository providing change_log_head() and read_changes(since, limit).
+        """
+        self.repo = repo
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.batch_limit = batch_limit
+        self.seq: Optional[int] = None
+        self._subscribers: Set[Subscriber] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    async def subscribe(self) -> Subscriber:
+        """
+        Register a client; it receives the changes committed from now on.
+        Raises:
+            TooManySubscribers: If max_subscribers are already connected.
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            raise TooManySubscribers()
+        if self.seq is None:
+            self.seq = await self.repo.change_log_head()
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._poll())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def _publish(self, event: Dict[str, Any]):
+        for subscriber in list(self._subscribers):
+            subscriber.offer(event)
+
+    async def _poll(self):
+        while self._subscribers:
+            try:
+                page = await self.repo.read_changes(self.seq, self.batch_limit)
+            except ChangeLogTruncated:
+                # This process fell behind the log's retention: every client has to reload
+                self.seq = await self.repo.change_log_head()
+                self._publish({'event': 'resync', 'seq': self.seq})
+                continue
+            except Exception as e:
+                logger.warning(f"No se pudo leer el registro de cambios: {e}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            for change in page['changes']:
+                # Bulk changes cannot be applied by clients: they reload up to them
+                self._publish({'event': 'resync', 'seq': change['seq']} if requires_resync(change) else change)
+            self.seq = page['next']
+            if not page['has_more']:
+                await asyncio.sleep(self.poll_interval)
+        # Nobody listens: stop tailing, the next subscriber starts from the head again
+        self._task = None
+        self.seq = None
+
+    async def close(self):
+        """Stop the poller and disconnect every subscriber."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for subscriber in list(self._subscribers):
+            subscriber.offer(None)
+        self._subscribers.clear()
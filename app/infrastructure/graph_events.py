@@ -0,0 +1,141 @@
+import contextlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+from app.infrastructure.change_log import describe_changes
+
+# Repository methods that change the graph
+MUTATING_METHODS = frozenset({
+    'create', 'update', 'delete', 'connect_components',
+    'upsert_relationship', 'upsert_relationships',
+    'upsert_many', 'delete_many', 'merge_components', 'delete_by',
+    'create_many', 'update_many',
+    'load_csv_components', 'load_csv_edges',
+})
+
+logger = logging.getLogger(__name__)
+
+class GraphVersion:
+    """
+    Monotonic counter of the graph changes made through this process.
+    Caches of derived data (statistics, analytics...) are keyed by it. Listeners are
+    called with the change log entries of each successful write made through this process,
+    whether or not a change log is kept (see app.infrastructure.change_log).
+    """
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[List[Dict[str, Any]]], Any]] = []
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+    def add_listener(self, callback: Callable[[List[Dict[str, Any]]], Any]):
+        """Call `callback` with the entries of each write made through this process, once it has been applied."""
+        self._listeners.append(callback)
+
+    def publish(self, entries: List[Dict[str, Any]]):
+        for listener in self._listeners:
+            try:
+                listener(entries)
+            except Exception:
+                logger.exception("Error en un suscriptor de las escrituras del grafo")
+
+class ObservedRepository:
+    """
+    Forwards every call to the wrapped repository and bumps the graph version
+    after each mutating call, whatever its outcome, then passes the changes of a
+    successful call to the graph version's listeners. They are also appended to
+    the change log, when one is given: inside the write transaction
+    when the repository offers recording(hook) (see Neo4jComponentRepository), so
+    the write and its entries commit together, and right after it otherwise.
+    """
+    def __init__(self, repo, version: GraphVersion, changes=None):
+        self._repo = repo
+        self._version = version
+        self._changes = changes
+
+    @property
+    def wrapped(self):
+        return self._repo
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._repo, name)
+        if name not in MUTATING_METHODS or not callable(attr):
+            return attr
+
+        def mutating(*args, **kwargs):
+            if self._changes is None:
+                try:
+                    result = attr(*args, **kwargs)
+                finally:
+                    self._version.bump()
+                entries = describe_changes(name, result, args, kwargs)
+                if entries:
+                    self._version.publish(entries)
+                return result
+            staged = []
+
+            def record(tx, result):
+                staged[:] = [self._changes.stage(tx, name, result, args, kwargs)]
+
+            recording = getattr(self._repo, 'recording', None)
+            try:
+                self._changes.prepare()
+                with recording(record) if recording is not None else contextlib.nullcontext():
+                    result = attr(*args, **kwargs)
+                    if not staged:
+                        # The write did not run in a managed transaction
+                        try:
+                            record(None, result)
+                        except Exception:
+                            logger.error(f"Se aplicó {name} pero no se pudo registrar en el registro de cambios")
+                            raise
+            finally:
+                self._version.bump()
+            if staged[0] is not None:
+                self._changes.publish(staged[0])
+                self._version.publish(staged[0])
+            return result
+        return mutating
+
+class VersionedCache:
+    """
+    Values computed from the graph, valid while the graph version is unchanged and
+    for at most `ttl` seconds (the bound on staleness when the version only counts the
+    writes of this process, see repository_factory.current_graph_version).
+    """
+    def __init__(self, ttl: float = 60):
+        self.ttl = ttl
+        self._entries: Dict[Any, Tuple[int, float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, version: int) -> Any:
+        """Return the value cached for `key` at `version`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and time.monotonic() - entry[1] <= self.ttl:
+                return entry[2]
+        return None
+
+    def put(self, key: Any, version: int, value: Any):
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), value)
+
+    def get_or_compute(self, key: Any, version: int, compute: Callable[[], Any]) -> Any:
+        value = self.get(key, version)
+        if value is None:
+            value = compute()
+            self.put(key, version, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
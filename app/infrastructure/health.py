@@ -0,0 +1,139 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+class HealthProbe:
+    """
+    Checks the database from a background thread every `interval` seconds and caches the
+    outcome, so health endpoints answer from memory and requests never pay for a probe.
+    Statuses: 'starting' (no check yet), 'ok', 'slow' (slower than `max_latency` seconds),
+    'unstable' (fewer than `failure_threshold` checks in a row failed), 'failing' and 'stale'
+    (no check completed lately, e.g. a probe stuck on the network).
+    The thread is (re)started in the calling process, so it survives a gunicorn fork.
+    """
+    def __init__(self, check: Callable[[], Optional[Dict[str, Any]]], interval: float = 5,
+                 max_latency: float = 1.0, failure_threshold: int = 2):
+        """
+        Args:
+            check (callable): Raises if the database is unreachable; may return extra details
+                (e.g. connection pool state) to include in the snapshot.
+        """
+        self.check = check
+        self.interval = interval
+        self.max_latency = max_latency
+        self.failure_threshold = failure_threshold
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._checked = threading.Event()
+        self._state: Dict[str, Any] = {'status': 'starting', 'checked_at': None, 'latency_ms': None,
+                                       'consecutive_failures': 0, 'error': None, 'details': {}}
+
+    def start(self, wait: bool = False):
+        """
+        Start the probe thread in this process unless it is already running. With `wait`, block
+        until the first check completes (at most `max_latency` seconds, beyond which it is 'slow').
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name=f"health-probe-{os.getpid()}", daemon=True)
+                self._thread.start()
+        if wait:
+            self._checked.wait(self.max_latency)
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def run_once(self):
+        """Run one check and cache its outcome."""
+        started = time.monotonic()
+        try:
+            details = self.check() or {}
+            error = None
+        except Exception as e:
+            details, error = {}, str(e)
+        latency = time.monotonic() - started
+        with self._lock:
+            failures = self._state['consecutive_failures'] + 1 if error else 0
+            if error:
+                status = 'failing' if failures >= self.failure_threshold else 'unstable'
+                logger.warning(f"Sonda de salud fallida ({failures} seguidas): {error}")
+            else:
+                status = 'slow' if latency > self.max_latency else 'ok'
+            self._state = {'status': status, 'checked_at': time.time(), 'latency_ms': round(latency * 1000, 2),
+                           'consecutive_failures': failures, 'error': error, 'details': details}
+        self._checked.set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the cached outcome of the last check, with its age and the readiness verdict.
+        """
+        with self._lock:
+            state = dict(self._state)
+        age = time.time() - state['checked_at'] if state['checked_at'] is not None else None
+        if age is not None and age > 3 * self.interval + self.max_latency:
+            state['status'] = 'stale'
+        state['age_s'] = round(age, 3) if age is not None else None
+        # A single failed check ('unstable') is tolerated; slow, failing or stale checks drain the instance
+        state['ready'] = state['status'] in ('ok', 'unstable')
+        return state
+
+def neo4j_check() -> Dict[str, Any]:
+    """
+    Probe Neo4j through the process driver: a read round trip plus the connection pool and
+    circuit breaker state. Raises if the database cannot be reached.
+    """
+    from app.infrastructure.neo4j_driver import breaker, get_database, get_driver, guarded
+    driver = get_driver()
+    with guarded(), driver.session(database=get_database()) as session:
+        session.execute_read(lambda tx: tx.run("RETURN 1").consume())
+    return {'backend': 'neo4j', 'circuit': breaker.state, 'pool': _pool_state(driver)}
+
+def _pool_state(driver) -> Optional[Dict[str, int]]:
+    """Connections open and in use, read from the driver internals when available."""
+    try:
+        pool = driver._pool
+        connections = [c for per_address in list(pool.connections.values()) for c in list(per_address)]
+        return {
+            'open': len(connections),
+            'in_use': sum(1 for c in connections if c.in_use),
+            'max': pool.pool_config.max_connection_pool_size,
+        }
+    except Exception:
+        return None
+
+def get_health_probe(wait: bool = False) -> HealthProbe:
+    """
+    Return the application's health probe, started in the current process (see HealthProbe.start
+    for `wait`). gunicorn starts it right after the fork and create_app in the development
+    server, so the first readiness check already has an answer. Configured by
+    HEALTH_PROBE_INTERVAL, HEALTH_MAX_LATENCY_MS and HEALTH_FAILURE_THRESHOLD.
+    """
+    probe = current_app.extensions.get('health_probe')
+    if probe is None:
+        config = current_app.config
+        if config.get('REPOSITORY_BACKEND', 'neo4j').lower() == 'neo4j':
+            check = neo4j_check
+        else:
+            from app.infrastructure.repository_factory import get_repository
+            repo = get_repository()
+            check = lambda: {'backend': 'memory', 'reachable': repo.ping()}
+        probe = current_app.extensions.setdefault('health_probe', HealthProbe(
+            check,
+            interval=config.get('HEALTH_PROBE_INTERVAL', 5),
+            max_latency=config.get('HEALTH_MAX_LATENCY_MS', 1000) / 1000,
+            failure_threshold=config.get('HEALTH_FAILURE_THRESHOLD', 2),
+        ))
+    probe.start(wait)
+    return probe
@@ -0,0 +1,135 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from flask import current_app
+
+class HashingStream:
+    """
+    Wraps a binary upload stream and hashes its bytes while the CSV readers consume it.
+    Bytes are hashed once even when a reader seeks back and re-reads the start of the file.
+    """
+    def __init__(self, stream):
+        self._stream = stream
+        self._hash = hashlib.sha256()
+        self._hashed = 0
+
+    def _update(self, start: int, data: bytes):
+        end = start + len(data)
+        if start <= self._hashed < end:
+            self._hash.update(data[self._hashed - start:])
+            self._hashed = end
+
+    def read(self, size: int = -1) -> bytes:
+        start = self._stream.tell()
+        data = self._stream.read(size)
+        self._update(start, data)
+        return data
+
+    def readline(self, size: int = -1) -> bytes:
+        start = self._stream.tell()
+        data = self._stream.readline(size)
+        self._update(start, data)
+        return data
+
+    def __iter__(self):
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._stream.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._stream.tell()
+
+    def hexdigest(self) -> str:
+        """
+        Return the SHA-256 of the whole stream, hashing any bytes the readers did not consume.
+        """
+        position = self._stream.tell()
+        self._stream.seek(self._hashed)
+        for chunk in iter(lambda: self._stream.read(64 * 1024), b''):
+            self._hash.update(chunk)
+            self._hashed += len(chunk)
+        self._stream.seek(position)
+        return self._hash.hexdigest()
+
+class ImportFingerprintStore:
+    """
+    Remembers the result of completed imports by upload fingerprint, so an identical
+    upload can be answered without touching the database. Each result is recorded with
+    the graph state after the import (see graph_state) and only replayed while the graph
+    is still in that state. Entries expire after `ttl` seconds and the least recently
+    used are evicted beyond `max_entries`.
+    """
+    def __init__(self, ttl: float = 3600, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, state: Any) -> Optional[Any]:
+        """
+        Return the recorded result for `key`, or None if unknown, expired, or recorded when the
+        graph was in another state (or the state is unknown).
+        """
+        if state is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            recorded_at, recorded_state, result = entry
+            if time.monotonic() - recorded_at > self.ttl:
+                del self._entries[key]
+                return None
+            if recorded_state != state:
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: str, result: Any, state: Any):
+        """Record the result of a completed import and the graph state right after it."""
+        if state is None:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), state, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+def graph_state() -> Optional[Any]:
+    """
+    A token that changes with every write to the graph, whichever process makes it: the change
+    log head (shared through the database with Neo4j), or the graph version of this process with
+    the in-memory backend. None with Neo4j and CHANGE_FEED off, when imports are never replayed.
+    """
+    from app.infrastructure.change_log import get_change_log
+    log = get_change_log()
+    if log is not None:
+        return ('change_log', log.head())
+    if current_app.config.get('REPOSITORY_BACKEND', 'neo4j').lower() == 'memory':
+        from app.infrastructure.repository_factory import get_graph_version
+        return ('graph_version', get_graph_version().value)
+    return None
+
+def get_fingerprint_store() -> ImportFingerprintStore:
+    """
+    Return the application's fingerprint store, configured by IMPORT_FINGERPRINT_TTL
+    and IMPORT_FINGERPRINT_MAX_ENTRIES.
+    """
+    store = current_app.extensions.get('import_fingerprints')
+    if store is None:
+        store = current_app.extensions.setdefault('import_fingerprints', ImportFingerprintStore(
+            ttl=current_app.config.get('IMPORT_FINGERPRINT_TTL', 3600),
+            max_entries=current_app.config.get('IMPORT_FINGERPRINT_MAX_ENTRIES', 256),
+        ))
+    return store
@@ -0,0 +1,165 @@
+import bisect
+import gzip
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from flask import current_app
+
+_RESULT_ID = re.compile(r'^[0-9a-f]{32}$')
+
+class ImportResultWriter:
+    """
+    Sink for the per-row outcomes of an import.
+    Rows are streamed to a gzip JSON-lines side file as they are produced instead of being
+    kept in memory; only the first `max_errors` errors are retained for the response.
+    Every `chunk_rows` rows a new gzip member is started and its first seq and byte offset are
+    added to an index file, so a page can be read by seeking to its chunk instead of
+    decompressing the file from the start.
+    Exposes append/extend so the import functions can use it in place of a list.
+    """
+    def __init__(self, directory: str, max_errors: int = 20, chunk_rows: int = 1000):
+        self.result_id = uuid.uuid4().hex
+        self.max_errors = max_errors
+        self.chunk_rows = chunk_rows
+        self.first_errors: List[Dict[str, Any]] = []
+        self.rows = 0
+        self._path = os.path.join(directory, f"{self.result_id}.jsonl.gz")
+        self._tmp_path = self._path + '.tmp'
+        self._raw = open(self._tmp_path, 'wb')
+        self._file = gzip.GzipFile(fileobj=self._raw, mode='wb')
+        # (first seq, byte offset) of each gzip member
+        self._chunks = [(0, 0)]
+        self._lock = threading.Lock()
+
+    def append(self, detail: Dict[str, Any]):
+        with self._lock:
+            if self.rows and self.rows % self.chunk_rows == 0:
+                self._file.close()
+                self._chunks.append((self.rows, self._raw.tell()))
+                self._file = gzip.GzipFile(fileobj=self._raw, mode='wb')
+            self._file.write(json.dumps({'seq': self.rows, **detail}, ensure_ascii=False).encode('utf-8'))
+            self._file.write(b'\n')
+            self.rows += 1
+            if is_error(detail) and len(self.first_errors) < self.max_errors:
+                self.first_errors.append(detail)
+
+    def extend(self, details):
+        for detail in details:
+            self.append(detail)
+
+    def close(self):
+        """Finish the side file and make it visible to readers."""
+        with self._lock:
+            if not self._raw.closed:
+                self._file.close()
+                self._raw.close()
+                with open(index_path(self._path), 'w') as index:
+                    json.dump(self._chunks, index)
+                os.replace(self._tmp_path, self._path)
+
+    def summarize(self, result: dict) -> dict:
+        """
+        Close the side file and replace the streamed details of `result` by a reference to it.
+        Details produced outside the writer (e.g. a connection error) are left in place.
+        """
+        self.close()
+        if result.get('details') is self:
+            del result['details']
+        result['result_id'] = self.result_id
+        result['rows'] = self.rows
+        result['first_errors'] = self.first_errors
+        return result
+
+def is_error(detail: Dict[str, Any]) -> bool:
+    return 'error' in detail or str(detail.get('status', '')).startswith('error')
+
+def index_path(path: str) -> str:
+    """Path of the chunk index of a side file."""
+    return path[:-len('.jsonl.gz')] + '.idx.json'
+
+class ImportResultStore:
+    """
+    Directory of import side files, readable by any worker that shares it.
+    Files older than `ttl` seconds are removed when a new import starts.
+    """
+    def __init__(self, directory: str, ttl: float = 86400, max_errors: int = 20, chunk_rows: int = 1000):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_errors = max_errors
+        self.chunk_rows = chunk_rows
+        os.makedirs(directory, exist_ok=True)
+
+    def create_writer(self) -> ImportResultWriter:
+        self.purge_expired()
+        return ImportResultWriter(self.directory, self.max_errors, self.chunk_rows)
+
+    def purge_expired(self):
+        cutoff = time.time() - self.ttl
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def read_page(self, result_id: str, status: Optional[str] = None, after: int = -1, limit: int = 100) -> Optional[dict]:
+        """
+        Read a page of per-row outcomes, decompressing from the chunk that holds the row after the cursor.
+        Args:
+            result_id (str): Import result identifier.
+            status (str, optional): Keep only rows with this status ('error' matches every error).
+            after (int): Return rows whose sequence number is greater than this cursor.
+            limit (int): Maximum rows to return.
+        Returns:
+            Optional[dict]: {'items': list, 'next': cursor or None}, or None if the result is unknown.
+        """
+        if not _RESULT_ID.match(result_id):
+            return None
+        path = os.path.join(self.directory, f"{result_id}.jsonl.gz")
+        if not os.path.exists(path):
+            return None
+        offset = 0
+        try:
+            with open(index_path(path)) as index:
+                chunks = json.load(index)
+            offset = chunks[bisect.bisect_right([seq for seq, _ in chunks], after + 1) - 1][1]
+        except (OSError, ValueError, IndexError):
+            pass
+        items = []
+        with open(path, 'rb') as raw:
+            raw.seek(offset)
+            with gzip.open(raw, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    row = json.loads(line)
+                    if row['seq'] <= after:
+                        continue
+                    if status == 'error':
+                        if not is_error(row):
+                            continue
+                    elif status and row.get('status') != status:
+                        continue
+                    if len(items) == limit:
+                        return {'items': items, 'next': items[-1]['seq']}
+                    items.append(row)
+        return {'items': items, 'next': None}
+
+def get_result_store() -> ImportResultStore:
+    """
+    Return the application's import result store, configured by IMPORT_RESULTS_DIR,
+    IMPORT_RESULTS_TTL and IMPORT_RESULT_MAX_ERRORS.
+    """
+    store = current_app.extensions.get('import_results')
+    if store is None:
+        directory = current_app.config.get('IMPORT_RESULTS_DIR') or os.path.join(tempfile.gettempdir(), 'arquitectbot-import-results')
+        store = current_app.extensions.setdefault('import_results', ImportResultStore(
+            directory,
+            ttl=current_app.config.get('IMPORT_RESULTS_TTL', 86400),
+            max_errors=current_app.config.get('IMPORT_RESULT_MAX_ERRORS', 20),
+        ))
+    return store
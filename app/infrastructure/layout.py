@@ -0,0 +1,334 @@
+"""
+Server-side graph layout for visualization clients.
+
+- force: Fruchterman-Reingold force-directed layout vectorized with NumPy. Repulsion is exact
+  while the number of node pairs is small and approximated Barnes-Hut style over a hierarchy
+  of grids otherwise: distant nodes push as the centroids of their cells.
+- hierarchical: layered layout of each connected component (cycles are broken by reversing
+  a few relationships), with barycenter ordering to reduce crossings.
+- auto: hierarchical for the components without cycles, force-directed for the rest.
+
+Components are laid out separately (except with force) and packed in rows. Coordinates are in
+units of the ideal edge length.
+"""
+import heapq
+import math
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+from app.infrastructure.centrality import Topology
+
+LAYOUT_ALGORITHMS = ('auto', 'force', 'hierarchical')
+
+# Node pairs per iteration above which repulsion uses the grid approximation
+EXACT_PAIR_BUDGET = 1_000_000
+# Pairwise rows computed at once, to bound memory
+_PAIR_CHUNK = 2_000_000
+# Deepest grid level of the repulsion approximation
+_MAX_GRID_LEVEL = 20
+
+def _pairwise_repulsion(points: np.ndarray, sources: np.ndarray, weights: Optional[np.ndarray], k: float) -> np.ndarray:
+    """Repulsion k^2 / d on every point from every source (optionally weighted by mass)."""
+    disp = np.zeros_like(points)
+    rows = max(1, _PAIR_CHUNK // max(len(sources), 1))
+    for start in range(0, len(points), rows):
+        delta = points[start:start + rows, None, :] - sources[None, :, :]
+        dist2 = np.maximum((delta ** 2).sum(axis=2), 1e-6)
+        factor = k * k / dist2
+        if weights is not None:
+            factor = factor * weights
+        disp[start:start + rows] = (delta * factor[:, :, None]).sum(axis=1)
+    return disp
+
+class _Grid:
+    """Occupied cells of a size x size grid over the unit square: centroid and mass of each."""
+    def __init__(self, unit: np.ndarray, pos: np.ndarray, size: int):
+        self.size = size
+        self.xy = np.minimum((unit * size).astype(np.int64), size - 1)
+        self.cells, self.of_node = np.unique(self.xy[:, 0] * size + self.xy[:, 1], return_inverse=True)
+        self.mass = np.bincount(self.of_node).astype(float)
+        self.centroids = np.stack([np.bincount(self.of_node, weights=pos[:, d]) / self.mass for d in range(2)], axis=1)
+
+    def lookup(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Index of the occupied cell at each (x, y), and whether there is one."""
+        key = xs * self.size + ys
+        found = np.minimum(np.searchsorted(self.cells, key), len(self.cells) - 1)
+        return found, (xs >= 0) & (xs < self.size) & (ys >= 0) & (ys < self.size) & (self.cells[found] == key)
+
+def _near_pairs(grid: _Grid) -> Tuple[np.ndarray, np.ndarray]:
+    """Every (i, j), i != j, of nodes in the same or adjacent cells of `grid`."""
+    n = len(grid.xy)
+    order = np.argsort(grid.of_node, kind='stable')
+    counts = grid.mass.astype(np.int64)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    firsts, seconds = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            neighbour, occupied = grid.lookup(grid.xy[:, 0] + dx, grid.xy[:, 1] + dy)
+            count = np.where(occupied, counts[neighbour], 0)
+            first = np.repeat(np.arange(n), count)
+            offset = np.arange(len(first)) - np.repeat(np.cumsum(count) - count, count)
+            second = order[np.repeat(starts[neighbour], count) + offset]
+            different = first != second
+            firsts.append(first[different])
+            seconds.append(second[different])
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+def _grid_repulsion(pos: np.ndarray, k: float) -> np.ndarray:
+    """
+    Barnes-Hut style repulsion over a hierarchy of grids (the levels of a quadtree): at each
+    level a node is pushed by the centroids of the cells that are children of its parent's
+    neighbours but not neighbours of its own cell. Levels are added until cells hold a few
+    nodes each, and at the finest one a node is pushed exactly by the nodes of its own and
+    adjacent cells. Every level is a fixed number of vectorized operations per node.
+    """
+    n = len(pos)
+    low = pos.min(axis=0)
+    span = max(float((pos.max(axis=0) - low).max()), 1e-9) * (1 + 1e-9)
+    unit = (pos - low) / span
+    disp = np.zeros_like(pos)
+    block = np.arange(-2, 4)
+    rows = max(1, _PAIR_CHUNK // 36)
+    level = 1
+    while True:
+        level += 1
+        grid = _Grid(unit, pos, 2 ** level)
+        for start in range(0, n, rows):
+            chunk = slice(start, start + rows)
+            own = grid.xy[chunk]
+            xs = np.repeat((own[:, 0] // 2 * 2)[:, None] + block[None, :], 6, axis=1)
+            ys = np.tile((own[:, 1] // 2 * 2)[:, None] + block[None, :], (1, 6))
+            cells, occupied = grid.lookup(xs, ys)
+            far = occupied & ((np.abs(xs - own[:, :1]) > 1) | (np.abs(ys - own[:, 1:]) > 1))
+            delta = pos[chunk, None, :] - grid.centroids[cells]
+            dist2 = np.maximum((delta ** 2).sum(axis=2), 1e-6)
+            factor = np.where(far, k * k * grid.mass[cells] / dist2, 0.0)
+            disp[chunk] += (delta * factor[:, :, None]).sum(axis=1)
+        # Stop once the exact near field costs a few pairs per node (or cells get tiny)
+        if (grid.mass ** 2).sum() <= 4 * n or level >= _MAX_GRID_LEVEL:
+            break
+    first, second = _near_pairs(grid)
+    delta = pos[first] - pos[second]
+    factor = k * k / np.maximum((delta ** 2).sum(axis=1), 1e-6)
+    for d in range(2):
+        disp[:, d] += np.bincount(first, weights=delta[:, d] * factor, minlength=n)
+    return disp
+
+def force_layout(matrix, initial: Optional[np.ndarray] = None, movable: Optional[np.ndarray] = None,
+                 iterations: int = 50, temperature: Optional[float] = None, seed: int = 0) -> np.ndarray:
+    """
+    Fruchterman-Reingold layout of the graph with adjacency `matrix`.
+    Args:
+        initial (np.ndarray, optional): Starting positions (n x 2); random otherwise.
+        movable (np.ndarray, optional): Indices of the nodes allowed to move; all by default.
+        temperature (float, optional): Maximum initial displacement, cooled linearly to zero.
+    Returns:
+        np.ndarray: n x 2 positions.
+    """
+    n = matrix.shape[0]
+    if n == 0:
+        return np.zeros((0, 2))
+    k = 1.0
+    rng = np.random.default_rng(seed)
+    pos = initial.astype(float).copy() if initial is not None else rng.uniform(0, math.sqrt(n), (n, 2))
+    rows = np.arange(n) if movable is None else np.asarray(movable, dtype=np.int64)
+    if len(rows) == 0:
+        return pos
+    sources, targets = matrix.nonzero()
+    hot = temperature if temperature is not None else max(math.sqrt(n) / 10, 1.0)
+    for i in range(iterations):
+        if len(rows) * n <= EXACT_PAIR_BUDGET:
+            repulsion = _pairwise_repulsion(pos[rows], pos, None, k)
+        else:
+            repulsion = _grid_repulsion(pos, k)[rows]
+        delta = pos[sources] - pos[targets]
+        pull = delta * np.sqrt((delta ** 2).sum(axis=1))[:, None] / k
+        attraction = np.zeros_like(pos)
+        for d in range(2):
+            attraction[:, d] = np.bincount(targets, weights=pull[:, d], minlength=n) - np.bincount(sources, weights=pull[:, d], minlength=n)
+        # A weak pull to the centre keeps disconnected parts from drifting away
+        gravity = -0.05 * (pos[rows] - pos.mean(axis=0))
+        disp = repulsion + attraction[rows] + gravity
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), 1e-9)
+        step = hot * (1 - i / iterations)
+        pos[rows] += disp / length[:, None] * np.minimum(length, step)[:, None]
+    return pos
+
+def _acyclic_order(matrix) -> Tuple[np.ndarray, bool]:
+    """
+    Order the nodes so that most relationships point forward: repeatedly take the node with
+    the fewest remaining incoming relationships. Returns the order and whether the graph is acyclic.
+    """
+    n = matrix.shape[0]
+    indptr, indices = matrix.indptr, matrix.indices
+    indegree = np.bincount(indices, minlength=n).tolist()
+    heap = [(d, v) for v, d in enumerate(indegree)]
+    heapq.heapify(heap)
+    done = [False] * n
+    order, acyclic = [], True
+    while heap:
+        d, v = heapq.heappop(heap)
+        if done[v] or d != indegree[v]:
+            continue
+        if d > 0:
+            acyclic = False
+        done[v] = True
+        order.append(v)
+        for w in indices[indptr[v]:indptr[v + 1]]:
+            if not done[w]:
+                indegree[w] -= 1
+                heapq.heappush(heap, (indegree[w], w))
+    return np.array(order, dtype=np.int64), acyclic
+
+def hierarchical_layout(matrix, sweeps: int = 4) -> np.ndarray:
+    """
+    Layered layout: longest-path layers along an acyclic order (relationships pointing backwards
+    are reversed), then `sweeps` down and up passes ordering each layer by the barycenter of
+    the neighbours. Returns n x 2 positions with y = -layer.
+    """
+    n = matrix.shape[0]
+    if n == 0:
+        return np.zeros((0, 2))
+    order, _ = _acyclic_order(matrix)
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n)
+    sources, targets = matrix.nonzero()
+    forward = rank[sources] < rank[targets]
+    upper = np.where(forward, sources, targets)
+    lower = np.where(forward, targets, sources)
+    by_rank = np.argsort(rank[upper], kind='stable')
+    layers = [0] * n
+    for a, b in zip(upper[by_rank].tolist(), lower[by_rank].tolist()):
+        if layers[b] <= layers[a]:
+            layers[b] = layers[a] + 1
+    layer = np.array(layers, dtype=np.int64)
+    x = rank.astype(float)
+
+    def reorder(values):
+        position = np.empty(n)
+        ordered = np.lexsort((values, layer))
+        layer_sorted = layer[ordered]
+        starts = np.searchsorted(layer_sorted, layer_sorted)
+        position[ordered] = np.arange(n) - starts
+        return position
+
+    x = reorder(x)
+    for _ in range(sweeps):
+        for parents, children in ((upper, lower), (lower, upper)):
+            count = np.bincount(children, minlength=n)
+            total = np.bincount(children, weights=x[parents], minlength=n)
+            barycenter = np.where(count > 0, total / np.maximum(count, 1), x)
+            x = reorder(barycenter)
+    width = np.bincount(layer)
+    return np.stack([(x - (width[layer] - 1) / 2) * 1.5, -layer * 2.0], axis=1)
+
+def _pack(pieces: List[Tuple[np.ndarray, np.ndarray]], n: int, gap: float = 2.0) -> np.ndarray:
+    """Place component layouts (node indices, positions) in rows, largest first."""
+    pos = np.zeros((n, 2))
+    boxes = []
+    for idx, coords in pieces:
+        coords = coords - coords.min(axis=0)
+        boxes.append((idx, coords, coords.max(axis=0)))
+    boxes.sort(key=lambda box: -len(box[0]))
+    area = sum((w + gap) * (h + gap) for _, _, (w, h) in boxes)
+    row_width = max(math.sqrt(area) * 1.5, max((w for _, _, (w, _h) in boxes), default=0))
+    x = y = row_height = 0.0
+    for idx, coords, (w, h) in boxes:
+        if x > 0 and x + w > row_width:
+            x, y, row_height = 0.0, y + row_height + gap, 0.0
+        pos[idx] = coords + (x, y)
+        x += w + gap
+        row_height = max(row_height, h)
+    return pos
+
+def compute_layout(topology: Topology, algorithm: str = 'auto', seed: int = 0) -> np.ndarray:
+    """Positions (n x 2, in topology.ids order) for 'auto', 'force' or 'hierarchical'."""
+    matrix = topology.matrix
+    n = topology.size
+    if algorithm == 'force' or n == 0:
+        return force_layout(matrix, seed=seed)
+    count, labels = csgraph.connected_components(matrix, directed=True, connection='weak')
+    members = np.argsort(labels, kind='stable')
+    bounds = np.searchsorted(labels[members], np.arange(count + 1))
+    pieces = []
+    for c in range(count):
+        idx = members[bounds[c]:bounds[c + 1]]
+        if len(idx) == 1:
+            pieces.append((idx, np.zeros((1, 2))))
+            continue
+        sub = matrix[idx][:, idx].tocsr()
+        if algorithm == 'hierarchical' or _acyclic_order(sub)[1]:
+            pieces.append((idx, hierarchical_layout(sub)))
+        else:
+            pieces.append((idx, force_layout(sub, seed=seed)))
+    return _pack(pieces, n)
+
+class LayoutCache:
+    """
+    Layouts per key (algorithm and filters), valid for one graph version and topology object
+    (a topology reloaded when its cache expires is diffed, so changes that did not move the
+    version are picked up). After a small change
+    a force-directed layout is relaxed incrementally: it starts from the previous positions and
+    only the affected nodes (new nodes, endpoints of added or removed relationships, neighbours
+    of removed nodes, and their neighbours) move. Larger changes, or other algorithms, are laid
+    out from scratch. Computations are serialized.
+    """
+    def __init__(self, incremental_max: int = 200):
+        self.incremental_max = incremental_max
+        self._entries: Dict[Any, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, version: int, topology: Topology, algorithm: str) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: {'positions': {id: (x, y)}, 'incremental': bool}
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['version'] == version and entry['topology'] is topology:
+                return entry['layout']
+            edges = set(topology.edge_list())
+            layout = None
+            if entry is not None and algorithm == 'force':
+                layout = self._relax(entry, topology, edges)
+            if layout is None:
+                coords = compute_layout(topology, algorithm)
+                layout = {'positions': dict(zip(topology.ids, map(tuple, coords.round(3).tolist()))), 'incremental': False}
+            self._entries[key] = {'version': version, 'topology': topology, 'layout': layout, 'edges': edges}
+            return layout
+
+    def _relax(self, entry: Dict[str, Any], topology: Topology, edges) -> Optional[Dict[str, Any]]:
+        previous = entry['layout']['positions']
+        position = {component_id: i for i, component_id in enumerate(topology.ids)}
+        affected = {component_id for component_id in topology.ids if component_id not in previous}
+        for source, target in entry['edges'] ^ edges:
+            affected.update(node for node in (source, target) if node in position)
+        removed = set(previous) - set(position)
+        for source, target in entry['edges']:
+            if source in removed and target in position:
+                affected.add(target)
+            elif target in removed and source in position:
+                affected.add(source)
+        if len(affected) > self.incremental_max:
+            return None
+        if not affected:
+            return {'positions': {i: previous[i] for i in topology.ids}, 'incremental': True}
+        neighbours = sparse.csr_matrix(topology.matrix + topology.matrix.T)
+        seeds = np.array([position[node] for node in affected], dtype=np.int64)
+        movable = np.union1d(seeds, neighbours[seeds].nonzero()[1])
+        rng = np.random.default_rng(len(topology.ids))
+        coords = np.zeros((topology.size, 2))
+        placed = np.zeros(topology.size, dtype=bool)
+        for component_id, i in position.items():
+            if component_id in previous:
+                coords[i] = previous[component_id]
+                placed[i] = True
+        centre = coords[placed].mean(axis=0) if placed.any() else np.zeros(2)
+        for i in np.nonzero(~placed)[0]:
+            around = [j for j in neighbours[i].indices if placed[j]]
+            # New nodes start next to their laid-out neighbours
+            coords[i] = (coords[around].mean(axis=0) if around else centre) + rng.normal(0, 0.5, 2)
+        coords = force_layout(topology.matrix, initial=coords, movable=movable, iterations=30, temperature=1.0)
+        return {'positions': dict(zip(topology.ids, map(tuple, coords.round(3).tolist()))), 'incremental': True}
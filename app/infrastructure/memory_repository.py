@@ -0,0 +1,475 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.domain.component import Component, COMPONENT_FIELDS
+from app.domain.component_search import SEARCH_FIELDS
+from app.infrastructure.text_index import TextIndex
+
+INDEXED_FIELDS = tuple(field for field in COMPONENT_FIELDS if field not in ('id', 'description'))
+
+class InMemoryComponentRepository:
+    """
+    Repository for components kept in process memory.
+    Implements the ComponentRepository port without any external service, so the API
+    and the import pipeline can be tested and load-tested without Neo4j.
+    Components are indexed by ID, by attribute value and by the words of their searchable
+    fields, and relationships are kept as adjacency lists in both directions.
+    All operations are guarded by a lock.
+    """
+    def __init__(self):
+        """
+        Initialize empty stores and indexes.
+        """
+        self._lock = threading.RLock()
+        self._components: Dict[str, Component] = {}
+        self._index: Dict[str, Dict[str, Set[str]]] = {field: defaultdict(set) for field in INDEXED_FIELDS}
+        self._outgoing: Dict[str, Dict[str, dict]] = defaultdict(dict)
+        self._incoming: Dict[str, Set[str]] = defaultdict(set)
+        self._content_hashes: Dict[str, str] = {}
+        self._text = TextIndex()
+        self._scores: Dict[str, Dict[str, float]] = defaultdict(dict)
+
+    def close(self):
+        """
+        Nothing to release; kept for interface compatibility.
+        """
+
+    @contextmanager
+    def recording(self, hook):
+        """
+        Hold the lock for a whole write. There is no transaction to pass to `hook`, so the caller
+        logs the write right after it, still under the lock: changes are logged in the order
+        they were made.
+        """
+        with self._lock:
+            yield
+
+    def ping(self) -> bool:
+        """
+        The in-memory store is always reachable.
+        """
+        return True
+
+    @staticmethod
+    def _copy(component: Component) -> Component:
+        """
+        Return a detached copy so callers cannot mutate the stored instance.
+        """
+        return Component.from_dict(component.to_dict())
+
+    def _index_add(self, component: Component):
+        for field in INDEXED_FIELDS:
+            self._index[field][getattr(component, field)].add(component.id)
+        self._text.add(component.id, (getattr(component, field) for field in SEARCH_FIELDS))
+
+    def _index_remove(self, component: Component):
+        for field in INDEXED_FIELDS:
+            ids = self._index[field].get(getattr(component, field))
+            if ids is not None:
+                ids.discard(component.id)
+                if not ids:
+                    del self._index[field][getattr(component, field)]
+        self._text.remove(component.id)
+
+    def create(self, component: Component) -> Component:
+        """
+        Store a new component.
+        Args:
+            component (Component): The component to persist.
+        Returns:
+            Component: The stored component.
+        Raises:
+            ValueError: If a component with the same ID already exists.
+        """
+        with self._lock:
+            if component.id in self._components:
+                raise ValueError(f"Component {component.id} already exists")
+            stored = self._copy(component)
+            self._components[stored.id] = stored
+            self._index_add(stored)
+            return self._copy(stored)
+
+    def get_by_id(self, component_id: str) -> Optional[Component]:
+        """
+        Retrieve a component by its ID.
+        Args:
+            component_id (str): The unique identifier of the component.
+        Returns:
+            Optional[Component]: The component if found, else None.
+        """
+        with self._lock:
+            component = self._components.get(component_id)
+            return self._copy(component) if component else None
+
+    def get_all(self) -> List[Component]:
+        """
+        Retrieve all components.
+        Returns:
+            List[Component]: List of all components.
+        """
+        with self._lock:
+            return [self._copy(component) for component in self._components.values()]
+
+    def find_by(self, **filters: Any) -> List[Component]:
+        """
+        Retrieve the components whose attributes match every filter.
+        Indexed attributes are resolved by set intersection; the rest are checked per candidate.
+        Args:
+            **filters: Component attribute names and the values to match.
+        Returns:
+            List[Component]: Matching components.
+        Raises:
+            ValueError: If a filter is not a Component attribute.
+        """
+        unknown = set(filters) - set(COMPONENT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown component attributes: {sorted(unknown)}")
+        with self._lock:
+            if 'id' in filters:
+                candidates = {filters['id']} & self._components.keys()
+            else:
+                candidates = None
+            for field, value in filters.items():
+                if field in self._index:
+                    ids = self._index[field].get(value, set())
+                    candidates = set(ids) if candidates is None else candidates & ids
+            if candidates is None:
+                candidates = set(self._components)
+            return [
+                self._copy(self._components[cid]) for cid in candidates
+                if all(getattr(self._components[cid], field) == value for field, value in filters.items())
+            ]
+
+    def count_by(self, **filters: Any) -> int:
+        """
+        Count the components matching every filter.
+        """
+        return len(self.find_by(**filters))
+
+    def delete_by(self, batch_size: int, **filters: Any) -> int:
+        """
+        Delete the components matching every filter, and their relationships.
+        The lock is released between batches so readers are not blocked for the whole purge.
+        Returns:
+            int: Number of components deleted.
+        """
+        ids = [component.id for component in self.find_by(**filters)]
+        deleted = 0
+        for start in range(0, len(ids), batch_size):
+            deleted += self.delete_many(ids[start:start + batch_size])
+        return deleted
+
+    def exists(self, component_id: str) -> bool:
+        """
+        Check whether a component with the given ID exists.
+        """
+        with self._lock:
+            return component_id in self._components
+
+    def count(self) -> int:
+        """
+        Count the stored components.
+        """
+        with self._lock:
+            return len(self._components)
+
+    def update(self, component_id: str, data: dict) -> Optional[Component]:
+        """
+        Update a component by its ID. Unknown keys are ignored.
+        Args:
+            component_id (str): The unique identifier of the component.
+            data (dict): Dictionary with updated properties.
+        Returns:
+            Optional[Component]: The updated component if found, else None.
+        """
+        data.pop('id', None)
+        with self._lock:
+            component = self._components.get(component_id)
+            if component is None:
+                return None
+            self._index_remove(component)
+            self._content_hashes.pop(component_id, None)
+            for key, value in data.items():
+                if key in COMPONENT_FIELDS:
+                    setattr(component, key, value)
+            self._index_add(component)
+            return self._copy(component)
+
+    def delete(self, component_id: str) -> bool:
+        """
+        Delete a component and all its relationships.
+        Args:
+            component_id (str): The unique identifier of the component.
+        Returns:
+            bool: True if deleted, False if not found.
+        """
+        with self._lock:
+            component = self._components.pop(component_id, None)
+            if component is None:
+                return False
+            self._index_remove(component)
+            self._content_hashes.pop(component_id, None)
+            self._scores.pop(component_id, None)
+            for target in self._outgoing.pop(component_id, {}):
+                self._incoming[target].discard(component_id)
+            for source in self._incoming.pop(component_id, set()):
+                self._outgoing[source].pop(component_id, None)
+            return True
+
+    def get_content_hashes(self) -> Dict[str, Optional[str]]:
+        """
+        Return every component ID with its stored content hash (None if never synced).
+        """
+        with self._lock:
+            return {cid: self._content_hashes.get(cid) for cid in self._components}
+
+    def upsert_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Create or overwrite a batch of components.
+        Args:
+            rows (List[Dict[str, Any]]): Component fields, including 'id' and 'content_hash'.
+        Returns:
+            int: Number of rows written.
+        """
+        with self._lock:
+            for row in rows:
+                existing = self._components.get(row['id'])
+                if existing is None:
+                    stored = Component.from_dict(row)
+                    self._components[stored.id] = stored
+                    self._index_add(stored)
+                else:
+                    self._index_remove(existing)
+                    for key in COMPONENT_FIELDS:
+                        if key in row:
+                            setattr(existing, key, row[key])
+                    self._index_add(existing)
+                if 'content_hash' in row:
+                    self._content_hashes[row['id']] = row['content_hash']
+            return len(rows)
+
+    def merge_components(self, rows: List[Dict[str, Any]], on_conflict: str = 'skip') -> List[bool]:
+        """
+        Create missing components and resolve existing ones by `on_conflict`
+        ('skip', 'error', 'update' or 'replace').
+        Returns:
+            List[bool]: True per row if the component was created.
+        """
+        created = []
+        with self._lock:
+            for row in rows:
+                existing = self._components.get(row['id'])
+                if existing is None:
+                    stored = Component.from_dict(row)
+                    self._components[stored.id] = stored
+                    self._index_add(stored)
+                    created.append(True)
+                    continue
+                created.append(False)
+                if on_conflict not in ('update', 'replace'):
+                    continue
+                self._index_remove(existing)
+                self._content_hashes.pop(existing.id, None)
+                if on_conflict == 'replace':
+                    # Like SET c = row.props in Neo4j, which drops every other property
+                    self._scores.pop(existing.id, None)
+                for key in COMPONENT_FIELDS:
+                    if on_conflict == 'replace':
+                        setattr(existing, key, row.get(key, ''))
+                    elif row.get(key):
+                        setattr(existing, key, row[key])
+                self._index_add(existing)
+        return created
+
+    def create_many(self, components: List[Component]) -> List[Optional[Component]]:
+        """
+        Create a batch of components.
+        Returns:
+            List[Optional[Component]]: The stored component per input, or None if its ID already exists.
+        """
+        created = []
+        with self._lock:
+            for component in components:
+                try:
+                    created.append(self.create(component))
+                except ValueError:
+                    created.append(None)
+        return created
+
+    def update_many(self, updates: List[Tuple[str, dict]]) -> List[Optional[Component]]:
+        """
+        Apply a batch of (component_id, data) updates in order.
+        Returns:
+            List[Optional[Component]]: The updated component per update, or None if not found.
+        """
+        with self._lock:
+            return [self.update(component_id, dict(data)) for component_id, data in updates]
+
+    def delete_many(self, component_ids: List[str]) -> int:
+        """
+        Delete a batch of components and their relationships.
+        Returns:
+            int: Number of components deleted.
+        """
+        with self._lock:
+            return sum(1 for cid in component_ids if self.delete(cid))
+
+    def connect_components(self, id_from: str, id_to: str, props: dict) -> bool:
+        """
+        Create a CONNECTS_TO relationship between two components.
+        Args:
+            id_from (str): ID of the source component.
+            id_to (str): ID of the target component.
+            props (dict): Properties for the relationship.
+        Returns:
+            bool: True if the connection was created, False otherwise.
+        """
+        return self.upsert_relationship(id_from, id_to, props or {}) is not None
+
+    def upsert_relationship(self, id_from: str, id_to: str, props: Dict[str, Any]) -> Optional[str]:
+        """
+        Create the CONNECTS_TO relationship between two components, or update its properties if it exists.
+        Returns:
+            Optional[str]: 'created', 'updated', or None if either component does not exist.
+        """
+        with self._lock:
+            if id_from not in self._components or id_to not in self._components:
+                return None
+            existing = self._outgoing[id_from].get(id_to)
+            if existing is not None:
+                existing.update(props)
+                return 'updated'
+            self._outgoing[id_from][id_to] = dict(props)
+            self._incoming[id_to].add(id_from)
+            return 'created'
+
+    def upsert_relationships(self, edges: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Create or update a batch of CONNECTS_TO relationships.
+        Returns:
+            List[Optional[str]]: 'created', 'updated', or None per edge, in order.
+        """
+        with self._lock:
+            return [self.upsert_relationship(edge['source'], edge['target'], edge.get('props', {})) for edge in edges]
+
+    def count_relationships(self) -> int:
+        """
+        Count the CONNECTS_TO relationships.
+        """
+        with self._lock:
+            return sum(len(targets) for targets in self._outgoing.values())
+
+    def search(self, terms: List[str], offset: int, limit: int) -> List[Tuple[Component, float]]:
+        """
+        Full-text search with the in-memory text index.
+        Args:
+            terms (List[str]): Folded query words; all of them must match.
+            offset (int), limit (int): Page of the ranked hits.
+        Returns:
+            List[Tuple[Component, float]]: (component, score) hits, best first.
+        """
+        with self._lock:
+            hits = self._text.search(terms)[offset:offset + limit]
+            return [(self._copy(self._components[cid]), round(score, 4)) for cid, score in hits]
+
+    def subgraph(self, filters: Dict[str, Any], include_boundary: bool, after: str, limit: int) -> List[Tuple[Component, List[Dict[str, Any]]]]:
+        """
+        Page of matching components with their relationships, from the indexes and adjacency lists.
+        """
+        with self._lock:
+            matching = {c.id: c for c in self.find_by(**filters)}
+            page = sorted(cid for cid in matching if cid > after)[:limit]
+            result = []
+            for cid in page:
+                edges = [
+                    {'source': cid, 'target': target, 'props': dict(props), 'boundary': target not in matching}
+                    for target, props in self._outgoing.get(cid, {}).items()
+                    if include_boundary or target in matching
+                ]
+                if include_boundary:
+                    edges += [
+                        {'source': source, 'target': cid, 'props': dict(self._outgoing[source][cid]), 'boundary': True}
+                        for source in sorted(self._incoming.get(cid, set())) if source not in matching
+                    ]
+                result.append((matching[cid], edges))
+            return result
+
+    def export_topology(self) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """
+        Return every component id and every relationship as a (source, target) pair.
+        """
+        with self._lock:
+            edges = [(source, target) for source, targets in self._outgoing.items() for target in targets]
+            return list(self._components), edges
+
+    def set_scores(self, name: str, scores: Dict[str, float], batch_size: int) -> int:
+        """
+        Store an analytics score per component (kept apart from the Component fields).
+        As with node properties in Neo4j, scores survive updates and are dropped when the
+        component is deleted or replaced.
+        """
+        with self._lock:
+            updated = 0
+            for component_id, score in scores.items():
+                if component_id in self._components:
+                    self._scores[component_id][name] = score
+                    updated += 1
+            return updated
+
+    def get_scores(self, component_id: str) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._scores.get(component_id, {}))
+
+    def get_relationships(self, component_id: str) -> Dict[str, Dict[str, dict]]:
+        """
+        Return the outgoing and incoming relationships of a component.
+        Returns:
+            dict: {'outgoing': {target_id: props}, 'incoming': {source_id: props}}
+        """
+        with self._lock:
+            return {
+                'outgoing': {target: dict(props) for target, props in self._outgoing.get(component_id, {}).items()},
+                'incoming': {source: dict(self._outgoing[source][component_id]) for source in self._incoming.get(component_id, set())},
+            }
+
+    def graph_stats(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Aggregate statistics of the graph, computed from the indexes and adjacency lists.
+        Returns:
+            Dict[str, Any]: See ComponentRepository.graph_stats.
+        """
+        with self._lock:
+            attributes = {
+                field: {value: len(ids) for value, ids in self._index[field].items()}
+                for field in INDEXED_FIELDS
+            }
+            by_relation = defaultdict(int)
+            for targets in self._outgoing.values():
+                for props in targets.values():
+                    by_relation[props.get('type_of_relation') or ''] += 1
+            out_degree = {cid: len(self._outgoing.get(cid, {})) for cid in self._components}
+            in_degree = {cid: len(self._incoming.get(cid, set())) for cid in self._components}
+            distribution = defaultdict(int)
+            for cid in self._components:
+                distribution[out_degree[cid] + in_degree[cid]] += 1
+            orphans = sorted(cid for cid in self._components if out_degree[cid] + in_degree[cid] == 0)
+
+            def hubs(degrees):
+                ranked = sorted((d, cid) for cid, d in degrees.items() if d > 0)
+                ranked.sort(key=lambda item: -item[0])
+                return [{'id': cid, 'label': self._components[cid].label, 'degree': d} for d, cid in ranked[:top]]
+
+            total_relationships = sum(by_relation.values())
+            return {
+                'nodes': {'total': len(self._components), 'by_label': {'Component': len(self._components)} if self._components else {}},
+                'attributes': attributes,
+                'relationships': {
+                    'total': total_relationships,
+                    'by_type': {'CONNECTS_TO': total_relationships} if total_relationships else {},
+                    'by_type_of_relation': dict(by_relation),
+                },
+                'degree_distribution': [{'degree': d, 'nodes': n} for d, n in sorted(distribution.items())],
+                'top_hubs': {'in': hubs(in_degree), 'out': hubs(out_degree)},
+                'orphans': {'count': len(orphans), 'ids': orphans[:top]},
+            }
@@ -0,0 +1,56 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+from flask import current_app
+
+class MetricsRegistry:
+    """
+    Process-local counters and summaries rendered in the Prometheus text format.
+    Each gunicorn worker keeps its own registry; scrape every worker or aggregate upstream.
+    """
+    def __init__(self):
+        self._counters: Dict[Tuple[str, tuple], float] = defaultdict(float)
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, help: str = '', **labels: str):
+        """Add `value` to the counter `name` with the given labels."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._help.setdefault(name, ('counter', help))
+            self._counters[key] += value
+
+    def observe(self, name: str, value: float, help: str = '', **labels: str):
+        """Record one observation of the summary `name` (exported as _sum and _count)."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._help.setdefault(name, ('summary', help))
+            self._counters[(name + '_sum', key)] += value
+            self._counters[(name + '_count', key)] += 1
+
+    def value(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def render(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            described = dict(self._help)
+        lines = []
+        for name, (kind, help) in sorted(described.items()):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (sample, labels), value in counters:
+                if sample == name or (kind == 'summary' and sample in (name + '_sum', name + '_count')):
+                    rendered = ','.join(f'{k}="{v}"' for k, v in labels)
+                    lines.append(f"{sample}{{{rendered}}} {value:g}" if rendered else f"{sample} {value:g}")
+        return '\n'.join(lines) + '\n'
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Return the application's metrics registry.
+    """
+    metrics = current_app.extensions.get('metrics')
+    if metrics is None:
+        metrics = current_app.extensions.setdefault('metrics', MetricsRegistry())
+    return metrics
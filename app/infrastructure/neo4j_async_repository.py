@@ -0,0 +1,231 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from neo4j import AsyncGraphDatabase
+from app.domain.component import Component
+from app.infrastructure.change_log import READ_CHANGES_QUERY, READ_HEAD_QUERY, changes_page
+from app.infrastructure.neo4j_driver import get_database, guarded
+from app.domain.component_search import lucene_query
+from app.infrastructure.neo4j_repository import (
+    GRAPH_STATS_QUERIES, SEARCH_INDEX, SEARCH_INDEX_QUERY, SEARCH_QUERY, STATS_ATTRIBUTES, Neo4jComponentRepository,
+)
+
+def create_async_driver():
+    """
+    Create an asyncio Neo4j driver from the same environment variables as the sync driver.
+    It must be created and closed inside the event loop that uses it.
+    """
+    uri = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
+    user = os.environ.get("NEO4J_USER", "neo4j")
+    password = os.environ.get("NEO4J_PASSWORD", "test1234")
+    max_pool_size = int(os.environ.get("NEO4J_MAX_POOL_SIZE", "100"))
+    return AsyncGraphDatabase.driver(uri, auth=(user, password), max_connection_pool_size=max_pool_size)
+
+class AsyncNeo4jComponentRepository:
+    """
+    Read-only asyncio counterpart of Neo4jComponentRepository.
+    Queries are awaited instead of blocking a thread, so one process can keep as many
+    queries in flight as the connection pool allows. Like the sync repository, every call
+    goes through the process circuit breaker.
+    """
+    def __init__(self, driver):
+        """
+        Bind the repository to an async driver owned by the caller.
+        """
+        self.driver = driver
+        self.database = get_database()
+
+    async def close(self):
+        """
+        Release the repository. The driver belongs to the caller.
+        """
+
+    async def ping(self) -> bool:
+        """
+        Check that the database answers a trivial query.
+        """
+        with guarded():
+            async with self.driver.session(database=self.database) as session:
+                record = await session.execute_read(self._single, "RETURN 1 as test")
+                return bool(record and record["test"] == 1)
+
+    @staticmethod
+    async def _single(tx, query: str, **params):
+        return await (await tx.run(query, **params)).single()
+
+    async def get_by_id(self, component_id: str) -> Optional[Component]:
+        """
+        Retrieve a Component node by its ID.
+        Args:
+            component_id (str): The unique identifier of the component.
+        Returns:
+            Optional[Component]: The component if found, else None.
+        """
+        with guarded():
+            async with self.driver.session(database=self.database) as session:
+                return await session.execute_read(self._get_component, component_id)
+
+    @staticmethod
+    async def _get_component(tx, component_id: str) -> Optional[Component]:
+        result = await tx.run("MATCH (c:Component {id: $id}) RETURN c", id=component_id)
+        record = await result.single()
+        return Neo4jComponentRepository._node_to_component(record["c"]) if record else None
+
+    async def get_all(self) -> List[Component]:
+        """
+        Retrieve all Component nodes.
+        Returns:
+            List[Component]: List of all components.
+        """
+        with guarded():
+            async with self.driver.session(database=self.database) as session:
+                return await session.execute_read(self._find, "MATCH (c:Component) RETURN c", {})
+
+    @staticmethod
+    async def _find(tx, query: str, params: dict) -> List[Component]:
+        result = await tx.run(query, **params)
+        return [Neo4jComponentRepository._node_to_component(record["c"]) async for record in result]
+
+    async def count(self) -> int:
+        """
+        Count the Component nodes.
+        """
+        with guarded():
+            async with self.driver.session(database=self.database) as session:
+                record = await session.execute_read(self._single, "MATCH (c:Component) RETURN count(c) as count")
+                return record["count"]
+
+    async def change_log_head(self) -> int:
+        """
+        Return the newest sequence number of the change log (0 if empty).
+        """
+        with guarded():
+            async with self.driver.session(database=self.database) as session:
+                record = await session.execute_read(self._single, READ_HEAD_QUERY)
+                return record["seq"] or 0
+
+    async def read_changes(self, since: int, limit: int) -> Dict[str, Any]:
+        """
+        Read the change log like ChangeLog.read.
+        Raises:
+            ChangeLogTruncated: If changes after `since` were dropped by retention.
+        """
+        with guarded():
+            async with self.driver.session(database=self.database) as session:
+                head, changes = await session.execute_read(self._read_changes, since, limit)
+        for change in changes:
+            change['data'] = json.loads(change['data'])
+        return changes_page(head['floor'] or 0, head['seq'] or 0, changes, since, limit)
+
+    @staticmethod
+    async def _read_changes(tx, since: int, limit: int):
+        head = await (await tx.run(READ_HEAD_QUERY)).single()
+        result = await tx.run(READ_CHANGES_QUERY, since=since, limit=limit)
+        return head, [dict(record["c"]) async for record in result]
+
+    async def _ensure_search_index(self):
+        """
+        Create the full-text index (once per process, shared with the sync repository) and wait
+        until it is online.
+        """
+        if Neo4jComponentRepository._search_index_ready:
+            return
+        with guarded():
+            async with self.driver.session(database=self.database) as session:
+                await (await session.run(SEARCH_INDEX_QUERY)).consume()
+                await (await session.run("CALL db.awaitIndex($name, 300)", name=SEARCH_INDEX)).consume()
+        Neo4jComponentRepository._search_index_ready = True
+
+    async def search(self, terms: List[str], offset: int, limit: int) -> List[Tuple[Component, float]]:
+        """
+        Full-text search like Neo4jComponentRepository.search.
+        """
+        if not terms:
+            return []
+        await self._ensure_search_index()
+        with guarded():
+            async with self.driver.session(database=self.database) as session:
+                return await session.execute_read(self._search, lucene_query(terms), offset, limit)
+
+    @staticmethod
+    async def _search(tx, query: str, offset: int, limit: int) -> List[Tuple[Component, float]]:
+        result = await tx.run(SEARCH_QUERY, index=SEARCH_INDEX, query=query, skip=offset, limit=limit)
+        return [(Neo4jComponentRepository._node_to_component(record["node"]), round(record["score"], 4))
+                async for record in result]
+
+    async def subgraph(self, filters: Dict[str, Any], include_boundary: bool, after: str, limit: int) -> List[Tuple[Component, List[Dict[str, Any]]]]:
+        """
+        Page of matching components with their relationships, like Neo4jComponentRepository.subgraph.
+        Raises:
+            ValueError: If a filter is not a Component attribute.
+        """
+        query = Neo4jComponentRepository._subgraph_query(filters)
+        with guarded():
+            async with self.driver.session(database=self.database) as session:
+                return await session.execute_read(self._subgraph, query, dict(
+                    filters, after=after, limit=limit, include_boundary=include_boundary))
+
+    @staticmethod
+    async def _subgraph(tx, query: str, params: dict) -> List[Tuple[Component, List[Dict[str, Any]]]]:
+        result = await tx.run(query, **params)
+        return [(Neo4jComponentRepository._node_to_component(record["node"]), record["outgoing"] + record["incoming"])
+                async for record in result]
+
+    async def graph_stats(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Aggregate statistics of the graph, with the queries of Neo4jComponentRepository.graph_stats.
+        """
+        with guarded():
+            async with self.driver.session(database=self.database) as session:
+                return await session.execute_read(self._graph_stats, top)
+
+    @staticmethod
+    async def _graph_stats(tx, top: int) -> Dict[str, Any]:
+        rows = {}
+        for name, query in GRAPH_STATS_QUERIES.items():
+            result = await tx.run(query, top=top, fields=list(STATS_ATTRIBUTES))
+            rows[name] = [dict(record) async for record in result]
+        return Neo4jComponentRepository._stats_from_rows(rows)
+
+class AsyncRepositoryAdapter:
+    """
+    Exposes a synchronous in-process repository (e.g. the in-memory one) through the async read interface.
+    Only suitable for repositories whose calls never block on I/O.
+    """
+    def __init__(self, repo, changes=None):
+        """
+        Args:
+            changes (ChangeLog, optional): In-process change log read by the event stream.
+        """
+        self.repo = repo
+        self.changes = changes
+
+    async def close(self):
+        self.repo.close()
+
+    async def ping(self) -> bool:
+        return self.repo.ping()
+
+    async def get_by_id(self, component_id: str) -> Optional[Component]:
+        return self.repo.get_by_id(component_id)
+
+    async def get_all(self) -> List[Component]:
+        return self.repo.get_all()
+
+    async def count(self) -> int:
+        return self.repo.count()
+
+    async def search(self, terms: List[str], offset: int, limit: int) -> List[Tuple[Component, float]]:
+        return self.repo.search(terms, offset, limit)
+
+    async def subgraph(self, filters: Dict[str, Any], include_boundary: bool, after: str, limit: int) -> List[Tuple[Component, List[Dict[str, Any]]]]:
+        return self.repo.subgraph(filters, include_boundary, after, limit)
+
+    async def graph_stats(self, top: int = 10) -> Dict[str, Any]:
+        return self.repo.graph_stats(top)
+
+    async def change_log_head(self) -> int:
+        return self.changes.head()
+
+    async def read_changes(self, since: int, limit: int) -> Dict[str, Any]:
+        return self.changes.read(since, limit)
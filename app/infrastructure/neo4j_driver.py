@@ -0,0 +1,120 @@
+"""
+Process-wide Neo4j driver.
+
+A driver owns a connection pool and background state that must not cross a fork,
+so it is created lazily in the process that uses it (a gunicorn worker after fork,
+or the development server) and recreated if the PID changes.
+
+Every database call goes through guarded(): when Neo4j stops answering, the process
+circuit breaker opens and requests fail fast with DatabaseUnavailable instead of each
+one blocking on connection attempts.
+"""
+import logging
+import os
+import threading
+from contextlib import ExitStack, contextmanager
+from neo4j import GraphDatabase
+from neo4j.exceptions import ServiceUnavailable, SessionExpired
+from app.infrastructure.circuit_breaker import CircuitBreaker, DatabaseUnavailable
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_driver = None
+_driver_pid = None
+breaker = CircuitBreaker(
+    failure_threshold=int(os.environ.get("NEO4J_BREAKER_FAILURES", "5")),
+    reset_timeout=float(os.environ.get("NEO4J_BREAKER_RESET_TIMEOUT", "30")),
+)
+
+def get_database() -> str:
+    """Return the configured Neo4j database name."""
+    return os.environ.get("NEO4J_DATABASE", "neo4j")
+
+def _create_driver():
+    uri = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
+    user = os.environ.get("NEO4J_USER", "neo4j")
+    password = os.environ.get("NEO4J_PASSWORD", "test1234")
+    max_pool_size = int(os.environ.get("NEO4J_MAX_POOL_SIZE", "100"))
+    # Upper bound of the exponential backoff execute_read/execute_write apply to transient errors
+    max_retry_time = float(os.environ.get("NEO4J_MAX_RETRY_TIME", "15"))
+    logger.info(f"Conectando a Neo4j: {uri}, usuario: {user}, database: {get_database()}, pid: {os.getpid()}")
+    driver = GraphDatabase.driver(
+        uri, auth=(user, password),
+        max_connection_pool_size=max_pool_size,
+        max_transaction_retry_time=max_retry_time,
+        connection_acquisition_timeout=float(os.environ.get("NEO4J_ACQUISITION_TIMEOUT", "60")),
+    )
+    driver.verify_connectivity()
+    logger.info("Conexión a Neo4j establecida exitosamente")
+    return driver
+
+def get_driver():
+    """
+    Return the driver of the current process, creating it on first use.
+    A driver inherited from a parent process is discarded, never reused.
+    """
+    global _driver, _driver_pid
+    pid = os.getpid()
+    if _driver is not None and _driver_pid == pid:
+        return _driver
+    with guarded(), _lock:
+        if _driver is None or _driver_pid != pid:
+            _driver = _create_driver()
+            _driver_pid = pid
+        return _driver
+
+@contextmanager
+def guarded():
+    """
+    Run a database call through the circuit breaker.
+    Connectivity failures count against the breaker and are raised as DatabaseUnavailable;
+    any other outcome (including query errors) proves the database is reachable.
+    Raises:
+        DatabaseUnavailable: If the circuit is open or the database cannot be reached.
+    """
+    breaker.before_call()
+    try:
+        yield
+    except (ServiceUnavailable, SessionExpired, OSError) as e:
+        breaker.record_failure()
+        logger.error(f"Neo4j no disponible ({breaker.state}): {e}")
+        raise DatabaseUnavailable(f"Neo4j unavailable: {e}", breaker.retry_after() if breaker.state == breaker.OPEN else 1) from e
+    except DatabaseUnavailable:
+        raise
+    except Exception:
+        breaker.record_success()
+        raise
+    breaker.record_success()
+
+def init_driver(warm_connections: int = 0):
+    """
+    Create the driver for the current process and optionally pre-open connections.
+    Args:
+        warm_connections (int): Number of pooled connections to open up front.
+    """
+    driver = get_driver()
+    if warm_connections > 0:
+        warm_up(driver, warm_connections)
+    return driver
+
+def warm_up(driver, connections: int):
+    """
+    Open `connections` pool connections at once so the first requests do not pay the Bolt handshake.
+    Each session holds its connection through an open transaction until all of them are established.
+    """
+    with ExitStack() as stack:
+        for _ in range(connections):
+            session = stack.enter_context(driver.session(database=get_database()))
+            tx = stack.enter_context(session.begin_transaction())
+            tx.run("RETURN 1").consume()
+    logger.info(f"Pool de Neo4j precalentado con {connections} conexiones (pid {os.getpid()})")
+
+def close_driver():
+    """Close the driver of the current process, if any."""
+    global _driver, _driver_pid
+    with _lock:
+        if _driver is not None and _driver_pid == os.getpid():
+            _driver.close()
+        _driver = None
+        _driver_pid = None
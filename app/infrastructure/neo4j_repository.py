@@ -1,44 +1,160 @@
-from neo4j import GraphDatabase
-from app.domain.component import Component
-from typing import List, Optional
-import os
+import threading
+from contextlib import contextmanager
+from neo4j.exceptions import ConstraintError
+from app.infrastructure.circuit_breaker import DatabaseUnavailable
+from app.infrastructure.neo4j_driver import get_driver, get_database, guarded
+from app.domain.component import Component, COMPONENT_FIELDS
+from app.domain.component_search import SEARCH_FIELDS, lucene_query
+from typing import Any, Dict, List, Optional, Tuple
+
+# Full-text index over the searchable component fields, created by the application
+SEARCH_INDEX = 'component_text'
+# The 'standard-folding' analyzer makes matches case and accent insensitive
+SEARCH_INDEX_QUERY = (
+    f"CREATE FULLTEXT INDEX {SEARCH_INDEX} IF NOT EXISTS FOR (c:Component) "
+    f"ON EACH [{', '.join(f'c.{field}' for field in SEARCH_FIELDS)}] "
+    "OPTIONS {indexConfig: {`fulltext.analyzer`: 'standard-folding'}}"
+)
+SEARCH_QUERY = (
+    "CALL db.index.fulltext.queryNodes($index, $query, {skip: $skip, limit: $limit}) "
+    "YIELD node, score RETURN node, score"
+)
+
+# Component attributes counted by value in the graph statistics
+STATS_ATTRIBUTES = tuple(field for field in COMPONENT_FIELDS if field not in ('id', 'description'))
+_HUBS_QUERY = """
+MATCH (c:Component)
+WITH c, COUNT {{ {pattern} }} AS degree
+WHERE degree > 0
+RETURN c.id AS id, c.label AS label, degree
+ORDER BY degree DESC, id LIMIT $top
+"""
+# Aggregate queries of the graph statistics, each run with the parameters $top and $fields
+GRAPH_STATS_QUERIES = {
+    # Only component nodes: the change log and the import locks live in the same database
+    'labels': "MATCH (c:Component) UNWIND labels(c) AS label RETURN label, count(*) AS count",
+    'attributes': """
+        MATCH (c:Component)
+        UNWIND $fields AS field
+        RETURN field, coalesce(toString(c[field]), '') AS value, count(*) AS count
+    """,
+    'relationships': "MATCH ()-[r]->() RETURN type(r) AS type, coalesce(r.type_of_relation, '') AS relation, count(*) AS count",
+    'degrees': """
+        MATCH (c:Component)
+        WITH COUNT { (c)-[:CONNECTS_TO]-() } AS degree
+        RETURN degree, count(*) AS nodes ORDER BY degree
+    """,
+    'hubs_in': _HUBS_QUERY.format(pattern='(c)<-[:CONNECTS_TO]-()'),
+    'hubs_out': _HUBS_QUERY.format(pattern='(c)-[:CONNECTS_TO]->()'),
+    'orphans': "MATCH (c:Component) WHERE NOT (c)-[:CONNECTS_TO]-() RETURN c.id AS id ORDER BY id LIMIT $top",
+}
 
 class Neo4jComponentRepository:
     """
     Repository for components using Neo4j as backend.
     Handles all persistence and retrieval operations for Component nodes and their relationships.
+    Queries run as managed transactions (execute_read/execute_write), which the driver retries
+    with exponential backoff on transient errors; only the CALL { ... } IN TRANSACTIONS queries,
+    which cannot run inside a transaction, use auto-commit. Every call goes through the
+    process circuit breaker.
     """
-    def __init__(self):
+    _search_index_ready = False
+    _id_constraint_ready = False
+
+    def __init__(self, driver=None):
         """
-        Initialize the Neo4j driver and database connection.
+        Bind the repository to a Neo4j driver.
+        Args:
+            driver (optional): Driver to use. Defaults to the process-wide driver.
+                Either way the driver belongs to the caller and is not closed by close().
         """
-        uri = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
-        user = os.environ.get("NEO4J_USER", "neo4j")
-        password = os.environ.get("NEO4J_PASSWORD", "test1234")
-        database = os.environ.get("NEO4J_DATABASE", "neo4j")
-        
-        import logging
-        logging.getLogger("neo4j").setLevel(logging.DEBUG)
-        
-        from flask import current_app
-        current_app.logger.info(f"Conectando a Neo4j: {uri}, usuario: {user}, database: {database}")
-        
         try:
-            self.driver = GraphDatabase.driver(uri, auth=(user, password))
-            # Verificar conexión
-            self.driver.verify_connectivity()
-            current_app.logger.info("Conexión a Neo4j establecida exitosamente")
+            self.driver = driver if driver is not None else get_driver()
         except Exception as e:
+            from flask import current_app
             current_app.logger.error(f"Error al conectar con Neo4j: {str(e)}")
             raise
-            
-        self.database = database
+        self.database = get_database()
+        self._hooks = threading.local()
 
     def close(self):
         """
-        Close the Neo4j driver connection.
+        Release the repository. The driver stays open for other requests.
+        """
+
+    def _read(self, work, *args, **kwargs):
+        """
+        Run `work(tx, *args, **kwargs)` in a managed read transaction.
+        """
+        with guarded(), self.driver.session(database=self.database) as session:
+            return session.execute_read(work, *args, **kwargs)
+
+    @contextmanager
+    def recording(self, hook):
+        """
+        Call `hook(tx, result)` at the end of the managed write transaction of the next write made
+        by this thread, so whatever the hook writes (the change log entries of the write) commits
+        with it. Writes that run in auto-commit transactions do not call it.
+        """
+        self._hooks.hook = hook
+        try:
+            yield
+        finally:
+            self._hooks.__dict__.pop('hook', None)
+
+    def _write(self, work, *args, **kwargs):
+        """
+        Run `work(tx, *args, **kwargs)` in a managed write transaction.
+        """
+        self._ensure_id_constraint()
+        hook = self._hooks.__dict__.pop('hook', None)
+        if hook is not None:
+            write = work
+
+            def work(tx, *args, **kwargs):
+                result = write(tx, *args, **kwargs)
+                hook(tx, result)
+                return result
+        with guarded(), self.driver.session(database=self.database) as session:
+            return session.execute_write(work, *args, **kwargs)
+
+    def _run_auto_commit(self, query: str, **params):
+        """
+        Run a CALL { ... } IN TRANSACTIONS query, which needs an auto-commit transaction.
+        Returns:
+            Tuple[Record, SummaryCounters]: The single result record and the update counters.
         """
-        self.driver.close()
+        self._ensure_id_constraint()
+        with guarded(), self.driver.session(database=self.database) as session:
+            result = session.run(query, **params)
+            record = result.single()
+            return record, result.consume().counters
+
+    def ping(self) -> bool:
+        """
+        Check that the database answers a trivial query.
+        Returns:
+            bool: True if the database is reachable.
+        """
+        result = self._read(lambda tx: tx.run("RETURN 1 as test").single())
+        return bool(result and result["test"] == 1)
+
+    @staticmethod
+    def _node_to_component(node) -> Component:
+        """
+        Build a Component from a Neo4j node.
+        """
+        return Component(
+            id=node["id"],
+            label=node.get("label", ""),
+            component_type=node.get("component_type", ""),
+            category=node.get("category", ""),
+            location=node.get("location", ""),
+            technology=node.get("technology", ""),
+            host=node.get("host", ""),
+            description=node.get("description", ""),
+            interface=node.get("interface", "")
+        )
 
     def create(self, component: Component) -> Component:
         """
@@ -47,15 +163,18 @@ class Neo4jComponentRepository:
             component (Component): The component to persist.
         Returns:
             Component: The created component with its generated ID.
+        Raises:
+            ValueError: If a component with the same ID already exists.
         """
         from flask import current_app
         current_app.logger.info(f"Creando componente en Neo4j: {component.to_dict()}")
         
         try:
-            with self.driver.session(database=self.database) as session:
-                result = session.write_transaction(self._create_component, component)
-                current_app.logger.info(f"Componente creado exitosamente: {result.to_dict() if result else None}")
-                return result
+            result = self._write(self._create_component, component)
+            current_app.logger.info(f"Componente creado exitosamente: {result.to_dict() if result else None}")
+            return result
+        except ConstraintError:
+            raise ValueError(f"Component {component.id} already exists")
         except Exception as e:
             current_app.logger.error(f"Error al crear componente en Neo4j: {str(e)}", exc_info=True)
             raise
@@ -130,10 +249,9 @@ class Neo4jComponentRepository:
         current_app.logger.debug(f"Buscando componente por ID: {component_id}")
         
         try:
-            with self.driver.session(database=self.database) as session:
-                result = session.read_transaction(self._get_component, component_id)
-                current_app.logger.debug(f"Resultado de búsqueda: {result.to_dict() if result else None}")
-                return result
+            result = self._read(self._get_component, component_id)
+            current_app.logger.debug(f"Resultado de búsqueda: {result.to_dict() if result else None}")
+            return result
         except Exception as e:
             current_app.logger.error(f"Error al buscar componente: {str(e)}")
             raise
@@ -166,8 +284,7 @@ class Neo4jComponentRepository:
         Returns:
             List[Component]: List of all components.
         """
-        with self.driver.session(database=self.database) as session:
-            return session.read_transaction(self._get_all_components)
+        return self._read(self._get_all_components)
 
     @staticmethod
     def _get_all_components(tx) -> List[Component]:
@@ -197,8 +314,7 @@ class Neo4jComponentRepository:
         Returns:
             Optional[Component]: The updated component if found, else None.
         """
-        with self.driver.session(database=self.database) as session:
-            return session.write_transaction(self._update_component, component_id, data)
+        return self._write(self._update_component, component_id, data)
 
     @staticmethod
     def _update_component(tx, component_id: str, data: dict) -> Optional[Component]:
@@ -208,6 +324,7 @@ class Neo4jComponentRepository:
         query = """
         MATCH (c:Component {id: $id})
         SET c += $props
+        REMOVE c.content_hash
         RETURN c
         """
         data.pop('id', None)
@@ -235,8 +352,7 @@ class Neo4jComponentRepository:
         Returns:
             bool: True if deleted, False if not found.
         """
-        with self.driver.session(database=self.database) as session:
-            return session.write_transaction(self._delete_component, component_id)
+        return self._write(self._delete_component, component_id)
 
     @staticmethod
     def _delete_component(tx, component_id: str) -> bool:
@@ -247,6 +363,270 @@ class Neo4jComponentRepository:
         result = tx.run(query, id=component_id).single()
         return result and result['deleted'] > 0
 
+    def get_content_hashes(self) -> Dict[str, Optional[str]]:
+        """
+        Fetch the ID and stored content hash of every Component node in one query.
+        Returns:
+            Dict[str, Optional[str]]: Component ID -> content hash (None if never synced).
+        """
+        return self._read(lambda tx: {
+            record["id"]: record["hash"]
+            for record in tx.run("MATCH (c:Component) RETURN c.id AS id, c.content_hash AS hash")
+        })
+
+    def upsert_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Create or overwrite a batch of Component nodes in a single transaction.
+        Args:
+            rows (List[Dict[str, Any]]): Component properties, including 'id' and 'content_hash'.
+        Returns:
+            int: Number of rows written.
+        """
+        return self._write(self._upsert_many, rows)
+
+    @staticmethod
+    def _upsert_many(tx, rows: List[Dict[str, Any]]) -> int:
+        """
+        Cypher transaction to merge a batch of Component nodes by ID.
+        """
+        query = """
+        UNWIND $rows AS row
+        MERGE (c:Component {id: row.id})
+        SET c += row
+        RETURN count(c) AS written
+        """
+        return tx.run(query, rows=rows).single()["written"]
+
+    _ON_MATCH = {
+        'skip': '',
+        'error': '',
+        'update': 'ON MATCH SET c += row.patch, c.content_hash = null',
+        'replace': 'ON MATCH SET c = row.props',
+    }
+
+    def merge_components(self, rows: List[Dict[str, Any]], on_conflict: str = 'skip') -> List[bool]:
+        """
+        Create missing Component nodes and resolve existing ones with a single MERGE for the whole batch.
+        Args:
+            rows (List[Dict[str, Any]]): Component properties, each including 'id'.
+            on_conflict (str): 'skip' or 'error' (leave existing nodes untouched), 'update'
+                (overwrite with the row's non-empty fields) or 'replace' (node becomes exactly the row).
+        Returns:
+            List[bool]: True per row if the node was created, in order.
+        Raises:
+            ValueError: If the conflict policy is unknown.
+        """
+        if on_conflict not in self._ON_MATCH:
+            raise ValueError(f"Unknown conflict policy: {on_conflict}")
+        params = [
+            {'id': row['id'], 'props': row, 'patch': {k: v for k, v in row.items() if v not in ('', None)}}
+            for row in rows
+        ]
+        return self._write(self._merge_components, params, self._ON_MATCH[on_conflict])
+
+    @staticmethod
+    def _merge_components(tx, rows: List[Dict[str, Any]], on_match: str) -> List[bool]:
+        """
+        Cypher transaction to MERGE a batch of Component nodes by ID.
+        A temporary marker set on creation tells created nodes from matched ones.
+        """
+        query = f"""
+        UNWIND $rows AS row
+        MERGE (c:Component {{id: row.id}})
+        ON CREATE SET c += row.props, c._import_created = true
+        {on_match}
+        WITH row, c, c._import_created IS NOT NULL AS created
+        REMOVE c._import_created
+        RETURN row.id AS id, created
+        """
+        created = {record["id"]: record["created"] for record in tx.run(query, rows=rows)}
+        return [created.get(row['id'], False) for row in rows]
+
+    def create_many(self, components: List[Component]) -> List[Optional[Component]]:
+        """
+        Create a batch of Component nodes with distinct IDs in a single transaction.
+        Args:
+            components (List[Component]): Components to create.
+        Returns:
+            List[Optional[Component]]: The created component per input, or None if its ID already exists.
+        """
+        rows = [{'idx': i, 'props': component.to_dict()} for i, component in enumerate(components)]
+        return self._write(self._create_many, rows)
+
+    @classmethod
+    def _create_many(cls, tx, rows: List[Dict[str, Any]]) -> List[Optional[Component]]:
+        """
+        Cypher transaction to create a batch of Component nodes, leaving existing IDs untouched.
+        """
+        query = """
+        UNWIND $rows AS row
+        MERGE (c:Component {id: row.props.id})
+        ON CREATE SET c += row.props, c._import_created = true
+        WITH row, c, c._import_created IS NOT NULL AS created
+        REMOVE c._import_created
+        RETURN row.idx AS idx, created, c
+        """
+        created: List[Optional[Component]] = [None] * len(rows)
+        for record in tx.run(query, rows=rows):
+            if record["created"]:
+                created[record["idx"]] = cls._node_to_component(record["c"])
+        return created
+
+    def update_many(self, updates: List[Tuple[str, dict]]) -> List[Optional[Component]]:
+        """
+        Apply a batch of (component_id, data) updates in a single transaction, in order.
+        Returns:
+            List[Optional[Component]]: The updated component per update, or None if not found.
+        """
+        rows = [
+            {'idx': i, 'id': component_id, 'props': {k: v for k, v in data.items() if k != 'id'}}
+            for i, (component_id, data) in enumerate(updates)
+        ]
+        return self._write(self._update_many, rows)
+
+    @classmethod
+    def _update_many(cls, tx, rows: List[Dict[str, Any]]) -> List[Optional[Component]]:
+        """
+        Cypher transaction to update a batch of Component nodes by ID.
+        """
+        query = """
+        UNWIND $rows AS row
+        MATCH (c:Component {id: row.id})
+        SET c += row.props
+        REMOVE c.content_hash
+        RETURN row.idx AS idx, c
+        """
+        updated: List[Optional[Component]] = [None] * len(rows)
+        for record in tx.run(query, rows=rows):
+            updated[record["idx"]] = cls._node_to_component(record["c"])
+        return updated
+
+    def delete_many(self, component_ids: List[str]) -> int:
+        """
+        Delete a batch of Component nodes and their relationships in a single transaction.
+        Args:
+            component_ids (List[str]): IDs of the components to delete.
+        Returns:
+            int: Number of components deleted.
+        """
+        return self._write(self._delete_many, component_ids)
+
+    @staticmethod
+    def _delete_many(tx, component_ids: List[str]) -> int:
+        """
+        Cypher transaction to detach-delete a batch of Component nodes.
+        """
+        query = """
+        UNWIND $ids AS id
+        MATCH (c:Component {id: id})
+        DETACH DELETE c
+        RETURN count(c) AS deleted
+        """
+        return tx.run(query, ids=component_ids).single()["deleted"]
+
+    @staticmethod
+    def _field_terminator(delimiter: str) -> str:
+        """
+        Cypher literal for a LOAD CSV field terminator (it cannot be a parameter).
+        """
+        return "'\\t'" if delimiter == '\t' else "'" + delimiter.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+    def can_load_csv(self, url: str) -> bool:
+        """
+        Check that the server can read a file with LOAD CSV (file present in its import directory
+        and CSV imports allowed).
+        Args:
+            url (str): URL as seen by the server, e.g. file:///upload.csv.
+        Returns:
+            bool: True if the first row can be read.
+        """
+        try:
+            self._read(lambda tx: tx.run("LOAD CSV FROM $url AS row WITH row LIMIT 1 RETURN count(row) AS n", url=url).consume())
+            return True
+        except DatabaseUnavailable:
+            raise
+        except Exception:
+            return False
+
+    def load_csv_components(self, url: str, delimiter: str, on_conflict: str, batch_size: int) -> Dict[str, int]:
+        """
+        Import Component nodes with LOAD CSV, committing every `batch_size` rows.
+        Columns are mapped by position (id, label, component_type, ...), the header row is skipped
+        and rows without id are ignored.
+        Args:
+            url (str): URL of the file as seen by the server.
+            delimiter (str): Field delimiter.
+            on_conflict (str): 'skip', 'update' or 'replace' for ids that already exist.
+            batch_size (int): Rows per transaction.
+        Returns:
+            Dict[str, int]: {'rows': rows processed, 'created': nodes created}
+        """
+        props = ", ".join(f"{field}: trim(coalesce(row[{i}], ''))" for i, field in enumerate(COMPONENT_FIELDS))
+        if on_conflict == 'update':
+            on_match = "ON MATCH SET " + ", ".join(
+                f"c.{field} = CASE WHEN props.{field} <> '' THEN props.{field} ELSE c.{field} END"
+                for field in COMPONENT_FIELDS if field != 'id'
+            ) + ", c.content_hash = null"
+        elif on_conflict == 'replace':
+            on_match = "ON MATCH SET c = props"
+        else:
+            on_match = ""
+        query = f"""
+        LOAD CSV FROM $url AS row FIELDTERMINATOR {self._field_terminator(delimiter)}
+        WITH row WHERE linenumber() > 1 AND trim(coalesce(row[0], '')) <> ''
+        CALL {{
+            WITH row
+            WITH {{{props}}} AS props
+            MERGE (c:Component {{id: props.id}})
+            ON CREATE SET c += props
+            {on_match}
+        }} IN TRANSACTIONS OF {int(batch_size)} ROWS
+        RETURN count(*) AS rows
+        """
+        record, counters = self._run_auto_commit(query, url=url)
+        return {'rows': record["rows"], 'created': counters.nodes_created}
+
+    def load_csv_edges(self, url: str, delimiter: str, source_idx: int, target_idx: int, type_idx: int, batch_size: int) -> Dict[str, int]:
+        """
+        Import CONNECTS_TO relationships with LOAD CSV, committing every `batch_size` relationships.
+        The target column may hold several ids separated by ';', each expanded to its own relationship.
+        The header row is skipped: the column positions come from the caller, which reads the header
+        without its UTF-8 BOM.
+        Args:
+            url (str): URL of the file as seen by the server.
+            delimiter (str): Field delimiter.
+            source_idx (int), target_idx (int): Column positions of source and target.
+            type_idx (int): Column position of type_of_relation ('CONNECTS_TO' where empty), or -1 to always use 'CONNECTS_TO'.
+            batch_size (int): Relationships per transaction.
+        Returns:
+            Dict[str, int]: {'rows': relationships processed, 'matched': with both endpoints found, 'created': relationships created}
+        """
+        # Like the Python import: an empty or missing type falls back to 'CONNECTS_TO'
+        rel_type = (f"CASE WHEN trim(coalesce(row[{int(type_idx)}], '')) = '' THEN 'CONNECTS_TO' "
+                    f"ELSE trim(row[{int(type_idx)}]) END") if type_idx >= 0 else "'CONNECTS_TO'"
+        query = f"""
+        LOAD CSV FROM $url AS row FIELDTERMINATOR {self._field_terminator(delimiter)}
+        WITH row WHERE linenumber() > 1
+        WITH trim(coalesce(row[{int(source_idx)}], '')) AS source,
+             [t IN split(coalesce(row[{int(target_idx)}], ''), ';') WHERE trim(t) <> '' | trim(t)] AS targets,
+             {rel_type} AS rel_type
+        WHERE source <> ''
+        UNWIND targets AS target
+        CALL {{
+            WITH source, target, rel_type
+            OPTIONAL MATCH (s:Component {{id: source}})
+            OPTIONAL MATCH (t:Component {{id: target}})
+            FOREACH (_ IN CASE WHEN s IS NOT NULL AND t IS NOT NULL THEN [1] ELSE [] END |
+                MERGE (s)-[r:CONNECTS_TO]->(t)
+                SET r.type_of_relation = rel_type
+            )
+            RETURN s IS NOT NULL AND t IS NOT NULL AS found
+        }} IN TRANSACTIONS OF {int(batch_size)} ROWS
+        RETURN count(*) AS rows, sum(CASE WHEN found THEN 1 ELSE 0 END) AS matched
+        """
+        record, counters = self._run_auto_commit(query, url=url)
+        return {'rows': record["rows"], 'matched': record["matched"] or 0, 'created': counters.relationships_created}
+
     def connect_components(self, id_from: str, id_to: str, props: dict) -> bool:
         """
         Create a CONNECTS_TO relationship between two components.
@@ -257,8 +637,7 @@ class Neo4jComponentRepository:
         Returns:
             bool: True if the connection was created, False otherwise.
         """
-        with self.driver.session(database=self.database) as session:
-            return session.write_transaction(self._connect_components, id_from, id_to, props)
+        return self._write(self._connect_components, id_from, id_to, props)
 
     @staticmethod
     def _connect_components(tx, id_from: str, id_to: str, props: dict) -> bool:
@@ -272,3 +651,317 @@ class Neo4jComponentRepository:
         """
         result = tx.run(query, id_from=id_from, id_to=id_to, props=props).single()
         return result is not None
+
+    def find_by(self, **filters) -> List[Component]:
+        """
+        Retrieve the Component nodes whose properties match every filter.
+        Args:
+            **filters: Component attribute names and the values to match.
+        Returns:
+            List[Component]: Matching components.
+        Raises:
+            ValueError: If a filter is not a Component attribute.
+        """
+        query = f"MATCH (c:Component) WHERE {self._where(filters)} RETURN c"
+        return self._read(
+            lambda tx: [self._node_to_component(record["c"]) for record in tx.run(query, **filters)]
+        )
+
+    @staticmethod
+    def _where(filters: Dict[str, Any], node: str = "c") -> str:
+        """
+        WHERE clause matching every filter on the variable `node`, with one parameter per filter.
+        Raises:
+            ValueError: If a filter is not a Component attribute.
+        """
+        unknown = set(filters) - set(COMPONENT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown component attributes: {sorted(unknown)}")
+        return " AND ".join(f"{node}.{key} = ${key}" for key in filters) or "true"
+
+    def count_by(self, **filters) -> int:
+        """
+        Count the Component nodes matching every filter.
+        """
+        query = f"MATCH (c:Component) WHERE {self._where(filters)} RETURN count(c) AS count"
+        return self._read(lambda tx: tx.run(query, **filters).single()["count"])
+
+    def delete_by(self, batch_size: int, **filters) -> int:
+        """
+        Detach-delete the Component nodes matching every filter with CALL { ... } IN TRANSACTIONS,
+        so a purge of any size never holds more than `batch_size` nodes in one transaction.
+        Args:
+            batch_size (int): Nodes per transaction.
+            **filters: Component attribute names and the values to match.
+        Returns:
+            int: Number of components deleted.
+        """
+        query = f"""
+        MATCH (c:Component) WHERE {self._where(filters)}
+        CALL {{
+            WITH c
+            DETACH DELETE c
+        }} IN TRANSACTIONS OF {int(batch_size)} ROWS
+        RETURN count(*) AS deleted
+        """
+        record, _ = self._run_auto_commit(query, **filters)
+        return record["deleted"]
+
+    def exists(self, component_id: str) -> bool:
+        """
+        Check whether a Component node with the given ID exists.
+        Args:
+            component_id (str): The unique identifier of the component.
+        Returns:
+            bool: True if the component exists.
+        """
+        record = self._read(lambda tx: tx.run(
+            "MATCH (c:Component {id: $id}) RETURN count(c) as count", id=component_id
+        ).single())
+        return bool(record and record["count"] > 0)
+
+    def count(self) -> int:
+        """
+        Count the Component nodes.
+        Returns:
+            int: Number of components.
+        """
+        return self._read(lambda tx: tx.run("MATCH (c:Component) RETURN count(c) as count").single()["count"])
+
+    def upsert_relationship(self, id_from: str, id_to: str, props: dict) -> Optional[str]:
+        """
+        Create the CONNECTS_TO relationship between two components, or update its properties if it exists.
+        Args:
+            id_from (str): ID of the source component.
+            id_to (str): ID of the target component.
+            props (dict): Properties for the relationship.
+        Returns:
+            Optional[str]: 'created', 'updated', or None if either component does not exist.
+        """
+        return self._write(self._upsert_relationship, id_from, id_to, props)
+
+    @staticmethod
+    def _upsert_relationship(tx, id_from: str, id_to: str, props: dict) -> Optional[str]:
+        """
+        Cypher transaction to merge a CONNECTS_TO relationship between two components.
+        """
+        query = """
+        MATCH (source:Component {id: $id_from})
+        MATCH (target:Component {id: $id_to})
+        OPTIONAL MATCH (source)-[existing:CONNECTS_TO]->(target)
+        WITH source, target, count(existing) > 0 AS existed
+        MERGE (source)-[r:CONNECTS_TO]->(target)
+        SET r += $props
+        RETURN existed
+        """
+        record = tx.run(query, id_from=id_from, id_to=id_to, props=props).single()
+        if record is None:
+            return None
+        return 'updated' if record["existed"] else 'created'
+
+    def upsert_relationships(self, edges: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Create or update a batch of CONNECTS_TO relationships in a single transaction.
+        Args:
+            edges (List[Dict[str, Any]]): Dictionaries with 'source', 'target' and 'props'.
+        Returns:
+            List[Optional[str]]: 'created', 'updated', or None (endpoint not found) per edge, in order.
+        """
+        rows = [{'idx': i, 'source': e['source'], 'target': e['target'], 'props': e.get('props', {})} for i, e in enumerate(edges)]
+        return self._write(self._upsert_relationships, rows)
+
+    @staticmethod
+    def _upsert_relationships(tx, rows: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Cypher transaction to merge a batch of CONNECTS_TO relationships.
+        Rows whose endpoints do not exist produce no record and stay None.
+        """
+        query = """
+        UNWIND $rows AS row
+        MATCH (source:Component {id: row.source})
+        MATCH (target:Component {id: row.target})
+        WITH row, source, target, EXISTS { (source)-[:CONNECTS_TO]->(target) } AS existed
+        MERGE (source)-[r:CONNECTS_TO]->(target)
+        SET r += row.props
+        RETURN row.idx AS idx, existed
+        """
+        statuses: List[Optional[str]] = [None] * len(rows)
+        for record in tx.run(query, rows=rows):
+            statuses[record["idx"]] = 'updated' if record["existed"] else 'created'
+        return statuses
+
+    def count_relationships(self) -> int:
+        """
+        Count the CONNECTS_TO relationships.
+        Returns:
+            int: Number of relationships.
+        """
+        return self._read(lambda tx: tx.run("MATCH ()-[r:CONNECTS_TO]->() RETURN count(r) as count").single()["count"])
+
+    def _ensure_id_constraint(self):
+        """
+        Create the uniqueness constraint on Component.id (once per process). The MERGE-based
+        batch writes rely on it: without it two concurrent transactions can both create a node
+        for the same id, and CREATE would accept duplicates.
+        """
+        if Neo4jComponentRepository._id_constraint_ready:
+            return
+        from flask import current_app
+        try:
+            with guarded(), self.driver.session(database=self.database) as session:
+                session.run("CREATE CONSTRAINT component_id IF NOT EXISTS FOR (c:Component) REQUIRE c.id IS UNIQUE").consume()
+        except DatabaseUnavailable:
+            raise
+        except Exception as e:
+            # Existing duplicates prevent it; writes go on and the error is reported once
+            current_app.logger.error(f"No se pudo crear la restricción de unicidad de Component.id: {e}")
+        Neo4jComponentRepository._id_constraint_ready = True
+
+    def _ensure_search_index(self):
+        """
+        Create the full-text index over the searchable fields (once per process) and wait until
+        it is online (see SEARCH_INDEX_QUERY).
+        """
+        if Neo4jComponentRepository._search_index_ready:
+            return
+        with guarded(), self.driver.session(database=self.database) as session:
+            session.run(SEARCH_INDEX_QUERY).consume()
+            session.run("CALL db.awaitIndex($name, 300)", name=SEARCH_INDEX).consume()
+        Neo4jComponentRepository._search_index_ready = True
+
+    def search(self, terms: List[str], offset: int, limit: int) -> List[Tuple[Component, float]]:
+        """
+        Full-text search with the Neo4j full-text index, ranked by its Lucene score.
+        Args:
+            terms (List[str]): Folded query words; all of them must match.
+            offset (int), limit (int): Page of the ranked hits.
+        Returns:
+            List[Tuple[Component, float]]: (component, score) hits, best first.
+        """
+        if not terms:
+            return []
+        self._ensure_search_index()
+        result = self._read(lambda tx: list(tx.run(
+            SEARCH_QUERY, index=SEARCH_INDEX, query=lucene_query(terms), skip=offset, limit=limit
+        )))
+        return [(self._node_to_component(record["node"]), round(record["score"], 4)) for record in result]
+
+    def subgraph(self, filters: Dict[str, Any], include_boundary: bool, after: str, limit: int) -> List[Tuple[Component, List[Dict[str, Any]]]]:
+        """
+        Page of matching components with their relationships in one query: the page is taken
+        with keyset pagination on c.id and each row projects the node and, through pattern
+        comprehensions, its relationships, so nothing else is fetched per node.
+        Args:
+            filters (Dict[str, Any]): Component attribute names and the values to match.
+            include_boundary (bool): Also return relationships with non-matching components.
+            after (str): Id of the last component of the previous page ('' for the first).
+            limit (int): Maximum number of components.
+        Returns:
+            List[Tuple[Component, List[Dict[str, Any]]]]: Components and their relationships.
+        """
+        query = self._subgraph_query(filters)
+        return self._read(lambda tx: [
+            (self._node_to_component(record["node"]), record["outgoing"] + record["incoming"])
+            for record in tx.run(query, after=after, limit=limit, include_boundary=include_boundary, **filters)
+        ])
+
+    @classmethod
+    def _subgraph_query(cls, filters: Dict[str, Any]) -> str:
+        """
+        Cypher query of a subgraph page, taking $after, $limit, $include_boundary and one parameter per filter.
+        """
+        return f"""
+        MATCH (c:Component) WHERE {cls._where(filters)} AND c.id > $after
+        WITH c ORDER BY c.id LIMIT $limit
+        RETURN c {{.*}} AS node,
+            [(c)-[r:CONNECTS_TO]->(t:Component) WHERE $include_boundary OR ({cls._where(filters, "t")})
+                | {{source: c.id, target: t.id, props: properties(r), boundary: NOT ({cls._where(filters, "t")})}}] AS outgoing,
+            [(s:Component)-[r:CONNECTS_TO]->(c) WHERE $include_boundary AND NOT ({cls._where(filters, "s")})
+                | {{source: s.id, target: c.id, props: properties(r), boundary: true}}] AS incoming
+        """
+
+    def export_topology(self) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """
+        Return every component id and every CONNECTS_TO relationship in one read transaction
+        (two streamed queries, no per-node round trips).
+        Returns:
+            Tuple[List[str], List[Tuple[str, str]]]: Component ids and (source, target) pairs.
+        """
+        def work(tx):
+            ids = [record["id"] for record in tx.run("MATCH (c:Component) RETURN c.id AS id")]
+            edges = [(record["s"], record["t"]) for record in tx.run(
+                "MATCH (a:Component)-[:CONNECTS_TO]->(b:Component) RETURN a.id AS s, b.id AS t")]
+            return ids, edges
+        return self._read(work)
+
+    def set_scores(self, name: str, scores: Dict[str, float], batch_size: int) -> int:
+        """
+        Write an analytics score as the node property `name`, one UNWIND transaction per batch.
+        Args:
+            name (str): Property name (e.g. centrality_pagerank).
+            scores (Dict[str, float]): Score per component id.
+            batch_size (int): Components per transaction.
+        Returns:
+            int: Number of nodes updated.
+        """
+        rows = [{'id': component_id, 'props': {name: score}} for component_id, score in scores.items()]
+        updated = 0
+        for start in range(0, len(rows), batch_size):
+            updated += self._write(lambda tx, batch: tx.run(
+                "UNWIND $rows AS row MATCH (c:Component {id: row.id}) SET c += row.props RETURN count(c) AS n",
+                rows=batch
+            ).single()["n"], rows[start:start + batch_size])
+        return updated
+
+    def graph_stats(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Aggregate statistics of the graph in a handful of aggregate queries (no per-node round trips).
+        Args:
+            top (int): Number of hubs and orphan ids to return.
+        Returns:
+            Dict[str, Any]: See ComponentRepository.graph_stats.
+        """
+        return self._read(self._graph_stats, top)
+
+    @classmethod
+    def _graph_stats(cls, tx, top: int) -> Dict[str, Any]:
+        """
+        Cypher transaction computing the graph statistics.
+        """
+        return cls._stats_from_rows({
+            name: [dict(record) for record in tx.run(query, top=top, fields=list(STATS_ATTRIBUTES))]
+            for name, query in GRAPH_STATS_QUERIES.items()
+        })
+
+    @staticmethod
+    def _stats_from_rows(rows: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Assemble the graph statistics from the records of each query of GRAPH_STATS_QUERIES.
+        """
+        by_label = {r["label"]: r["count"] for r in rows['labels']}
+        attributes = {field: {} for field in STATS_ATTRIBUTES}
+        for r in rows['attributes']:
+            attributes[r["field"]][r["value"]] = r["count"]
+        by_type, by_relation = {}, {}
+        for r in rows['relationships']:
+            by_type[r["type"]] = by_type.get(r["type"], 0) + r["count"]
+            if r["type"] == 'CONNECTS_TO':
+                by_relation[r["relation"]] = by_relation.get(r["relation"], 0) + r["count"]
+        distribution = [{'degree': r["degree"], 'nodes': r["nodes"]} for r in rows['degrees']]
+        hubs = {
+            direction: [{'id': r["id"], 'label': r["label"], 'degree': r["degree"]} for r in rows[f'hubs_{direction}']]
+            for direction in ('in', 'out')
+        }
+        orphan_count = next((d['nodes'] for d in distribution if d['degree'] == 0), 0)
+        return {
+            'nodes': {'total': by_label.get('Component', 0), 'by_label': by_label},
+            'attributes': attributes,
+            'relationships': {
+                'total': sum(by_type.values()),
+                'by_type': by_type,
+                'by_type_of_relation': by_relation,
+            },
+            'degree_distribution': distribution,
+            'top_hubs': hubs,
+            'orphans': {'count': orphan_count, 'ids': [r["id"] for r in rows['orphans']]},
+        }
@@ -0,0 +1,46 @@
+from flask import current_app
+from app.domain.component_repository import ComponentRepository
+from app.infrastructure.change_log import get_change_log
+from app.infrastructure.graph_events import GraphVersion, ObservedRepository
+
+def get_graph_version() -> GraphVersion:
+    """
+    Return the application's graph version, bumped by every write made through get_repository().
+    """
+    version = current_app.extensions.get('graph_version')
+    if version is None:
+        version = current_app.extensions.setdefault('graph_version', GraphVersion())
+    return version
+
+def current_graph_version() -> int:
+    """
+    Version of the graph to key caches of derived data on. With CHANGE_FEED on it is the change
+    log head, which moves with the writes made by every process; otherwise it is this process's
+    graph version, and writes made by other processes only show up when cached values expire.
+    """
+    log = get_change_log()
+    if log is not None:
+        return log.head()
+    return get_graph_version().value
+
+def get_repository() -> ComponentRepository:
+    """
+    Return the component repository selected by the REPOSITORY_BACKEND setting.
+    'memory' returns the in-memory store shared by the whole application;
+    'neo4j' (default) returns a new Neo4j repository that the caller must close.
+    Either way writes are observed to keep the graph version and the change log up to date.
+    Raises:
+        ValueError: If the configured backend is unknown.
+    """
+    backend = current_app.config.get('REPOSITORY_BACKEND', 'neo4j').lower()
+    if backend == 'memory':
+        repo = current_app.extensions.get('component_repository')
+        if repo is None:
+            from app.infrastructure.memory_repository import InMemoryComponentRepository
+            repo = current_app.extensions.setdefault('component_repository', InMemoryComponentRepository())
+    elif backend == 'neo4j':
+        from app.infrastructure.neo4j_repository import Neo4jComponentRepository
+        repo = Neo4jComponentRepository()
+    else:
+        raise ValueError(f"Unknown repository backend: {backend}")
+    return ObservedRepository(repo, get_graph_version(), get_change_log())
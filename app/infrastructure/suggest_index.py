@@ -0,0 +1,285 @@
+import asyncio
+import bisect
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from flask import current_app
+from app.domain.component_search import words
+from app.infrastructure.change_log import ChangeLogTruncated, get_change_log, requires_resync
+from app.infrastructure.repository_factory import get_graph_version, get_repository
+
+logger = logging.getLogger(__name__)
+
+_init_lock = threading.Lock()
+
+def normalize(text: str) -> str:
+    """Fold case and accents and collapse punctuation, so 'Gestión-API' and 'gestion api' match."""
+    return ' '.join(words(text or ''))
+
+class SuggestIndex:
+    """
+    In-memory prefix index of component labels and ids for autocompletion.
+    Three sorted lists of (key, id) are searched with bisect: whole labels, ids, and label
+    suffixes starting at each later word (so 'serv' finds 'Token Service'). Suggestions come
+    from them in that order, so a query costs O(log n + limit) and never reaches the database.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._labels: Dict[str, str] = {}
+        self._by_label: List[Tuple[str, str]] = []
+        self._by_id: List[Tuple[str, str]] = []
+        self._by_word: List[Tuple[str, str]] = []
+        # Last change log seq applied
+        self.seq = 0
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    @staticmethod
+    def _keys(component_id: str, label: str):
+        key = normalize(label)
+        parts = key.split(' ')
+        return ([(key, component_id)] if key else [],
+                [(normalize(component_id), component_id)],
+                [(' '.join(parts[i:]), component_id) for i in range(1, len(parts))])
+
+    def load(self, components: Iterable[Tuple[str, str]], seq: int = 0):
+        """Replace the whole index with (id, label) pairs, built in bulk and swapped in at once."""
+        labels = dict(components)
+        by_label, by_id, by_word = [], [], []
+        for component_id, label in labels.items():
+            label_keys, id_keys, word_keys = self._keys(component_id, label)
+            by_label += label_keys
+            by_id += id_keys
+            by_word += word_keys
+        by_label.sort()
+        by_id.sort()
+        by_word.sort()
+        with self._lock:
+            self._labels, self._by_label, self._by_id, self._by_word = labels, by_label, by_id, by_word
+            self.seq = seq
+
+    def put(self, component_id: str, label: str):
+        with self._lock:
+            self.remove(component_id)
+            self._labels[component_id] = label
+            for keys, index in zip(self._keys(component_id, label), (self._by_label, self._by_id, self._by_word)):
+                for key in keys:
+                    bisect.insort(index, key)
+
+    def remove(self, component_id: str):
+        with self._lock:
+            label = self._labels.pop(component_id, None)
+            if label is None:
+                return
+            for keys, index in zip(self._keys(component_id, label), (self._by_label, self._by_id, self._by_word)):
+                for key in keys:
+                    i = bisect.bisect_left(index, key)
+                    if i < len(index) and index[i] == key:
+                        del index[i]
+
+    def apply(self, changes: List[Dict[str, Any]]) -> bool:
+        """
+        Apply change log entries. Returns False if one of them (a bulk delete or import)
+        cannot be applied entry by entry and the index has to be reloaded.
+        """
+        with self._lock:
+            for change in changes:
+                if change['entity'] != 'component':
+                    continue
+                if requires_resync(change):
+                    return False
+                if change['op'] == 'delete':
+                    self.remove(change['key'])
+                elif change['op'] == 'create' or 'label' in change['data']:
+                    self.put(change['key'], change['data'].get('label', ''))
+            return True
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Return up to `limit` {'id', 'label'} whose label, id or a later label word starts with
+        `prefix`, ignoring case and accents; label matches first, then ids, then words.
+        """
+        key = normalize(prefix)
+        if not key:
+            return []
+        found: Dict[str, str] = {}
+        with self._lock:
+            for index in (self._by_label, self._by_id, self._by_word):
+                i = bisect.bisect_left(index, (key, ''))
+                while i < len(index) and len(found) < limit and index[i][0].startswith(key):
+                    component_id = index[i][1]
+                    found.setdefault(component_id, self._labels[component_id])
+                    i += 1
+                if len(found) >= limit:
+                    break
+        return [{'id': component_id, 'label': label} for component_id, label in found.items()]
+
+class SuggestIndexFollower:
+    """
+    Keeps a SuggestIndex in step with the graph from a background thread: it tails the change
+    log every `interval` seconds (so writes made by other processes show up too) and reloads the
+    index when it cannot follow (log truncated, bulk operations), or every `reload_interval`
+    seconds when the change feed is disabled. Writes made in this process are applied at once,
+    with or without the change feed; after a bulk one the index is reloaded on the next tick.
+    """
+    def __init__(self, app, index: SuggestIndex, interval: float = 1, reload_interval: float = 300):
+        self.app = app
+        self.index = index
+        self.interval = interval
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._reload_pending = threading.Event()
+
+    def apply(self, changes: List[Dict[str, Any]]):
+        """Apply the changes of a write made in this process, or have the thread reload the index."""
+        if not self.index.apply(changes):
+            self._reload_pending.set()
+
+    def start(self):
+        """Start the follower thread in this process unless it is already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"suggest-index-{os.getpid()}", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def reload(self):
+        """Load every component id and label in one query."""
+        log = get_change_log()
+        seq = log.head() if log is not None else 0
+        repo = get_repository()
+        try:
+            components = repo.get_all()
+        finally:
+            repo.close()
+        self.index.load(((c.id, c.label) for c in components), seq)
+        logger.info(f"Índice de sugerencias cargado: {len(self.index)} componentes")
+
+    def follow(self):
+        """Apply the changes logged since the last one applied, reloading if they cannot be followed."""
+        log = get_change_log()
+        if log is None:
+            return
+        while True:
+            try:
+                page = log.read(self.index.seq, 1000)
+            except ChangeLogTruncated:
+                self.reload()
+                return
+            if not self.index.apply(page['changes']):
+                self.reload()
+                return
+            self.index.seq = page['next']
+            if not page['has_more']:
+                return
+
+    def _run(self):
+        waited = 0.0
+        while not self._stop.wait(self.interval):
+            waited += self.interval
+            try:
+                with self.app.app_context():
+                    if get_change_log() is not None:
+                        self.follow()
+                    elif waited >= self.reload_interval or self._reload_pending.is_set():
+                        waited = 0.0
+                        self._reload_pending.clear()
+                        self.reload()
+            except Exception as e:
+                logger.warning(f"No se pudo actualizar el índice de sugerencias: {e}")
+
+class AsyncSuggestIndexFollower:
+    """
+    Keeps a SuggestIndex in step with the graph for the async read API, which makes no writes:
+    a task tails the change log through the async repository every `interval` seconds and
+    reloads the index when it cannot follow, or reloads it every `reload_interval` seconds
+    when the change feed is disabled.
+    """
+    def __init__(self, repo, index: SuggestIndex, interval: float = 1, reload_interval: float = 300,
+                 change_feed: bool = True):
+        """
+        Args:
+            repo: Async repository providing get_all(), change_log_head() and read_changes(since, limit).
+        """
+        self.repo = repo
+        self.index = index
+        self.interval = interval
+        self.reload_interval = reload_interval
+        self.change_feed = change_feed
+        self._task: Optional[asyncio.Task] = None
+
+    async def reload(self):
+        """Load every component id and label in one query."""
+        seq = await self.repo.change_log_head() if self.change_feed else 0
+        components = await self.repo.get_all()
+        self.index.load(((c.id, c.label) for c in components), seq)
+        logger.info(f"Índice de sugerencias cargado: {len(self.index)} componentes")
+
+    async def follow(self):
+        """Apply the changes logged since the last one applied, reloading if they cannot be followed."""
+        while True:
+            try:
+                page = await self.repo.read_changes(self.index.seq, 1000)
+            except ChangeLogTruncated:
+                await self.reload()
+                return
+            if not self.index.apply(page['changes']):
+                await self.reload()
+                return
+            self.index.seq = page['next']
+            if not page['has_more']:
+                return
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        waited = 0.0
+        while True:
+            await asyncio.sleep(self.interval)
+            waited += self.interval
+            try:
+                if self.change_feed:
+                    await self.follow()
+                elif waited >= self.reload_interval:
+                    waited = 0.0
+                    await self.reload()
+            except Exception as e:
+                logger.warning(f"No se pudo actualizar el índice de sugerencias: {e}")
+
+def get_suggest_index() -> SuggestIndex:
+    """
+    Return the application's suggestion index, loaded on first use in each process (gunicorn
+    loads it right after the fork) and kept up to date by its follower thread.
+    Configured by SUGGEST_REFRESH_INTERVAL and SUGGEST_RELOAD_INTERVAL.
+    """
+    follower = current_app.extensions.get('suggest_index')
+    if follower is None:
+        with _init_lock:
+            follower = current_app.extensions.get('suggest_index')
+            if follower is None:
+                index = SuggestIndex()
+                follower = SuggestIndexFollower(
+                    current_app._get_current_object(), index,
+                    interval=current_app.config.get('SUGGEST_REFRESH_INTERVAL', 1),
+                    reload_interval=current_app.config.get('SUGGEST_RELOAD_INTERVAL', 300),
+                )
+                follower.reload()
+                get_graph_version().add_listener(follower.apply)
+                current_app.extensions['suggest_index'] = follower
+    follower.start()
+    return follower.index
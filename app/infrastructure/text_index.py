@@ -0,0 +1,63 @@
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+from app.domain.component_search import words
+
+# Relevance of a query term matching a whole word, the start of a word or its inside
+EXACT, PREFIX, INFIX = 3.0, 2.0, 1.0
+
+class TextIndex:
+    """
+    In-memory inverted index of words to documents, the fallback for the Neo4j full-text index.
+    Documents are ranked by a TF-IDF score where each term counts as an exact, prefix or
+    infix match of the document's words; every term has to match. Not thread-safe: the
+    owning repository serializes access.
+    """
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._words: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def add(self, doc_id: str, texts: Iterable[str]):
+        """Index (or re-index) a document from its text fields."""
+        self.remove(doc_id)
+        counts: Dict[str, int] = defaultdict(int)
+        for word in words(' '.join(text or '' for text in texts)):
+            counts[word] += 1
+        for word, count in counts.items():
+            self._postings[word][doc_id] = count
+        self._words[doc_id] = list(counts)
+
+    def remove(self, doc_id: str):
+        for word in self._words.pop(doc_id, ()):
+            docs = self._postings.get(word)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self._postings[word]
+
+    def search(self, terms: List[str]) -> List[Tuple[str, float]]:
+        """
+        Return the (doc_id, score) of the documents matching every term, best first.
+        """
+        if not terms:
+            return []
+        scores: Dict[str, float] = {}
+        for i, term in enumerate(terms):
+            term_scores: Dict[str, float] = defaultdict(float)
+            for word, docs in self._postings.items():
+                if term not in word:
+                    continue
+                weight = EXACT if word == term else PREFIX if word.startswith(term) else INFIX
+                idf = math.log(1 + len(self._words) / len(docs))
+                for doc_id, count in docs.items():
+                    term_scores[doc_id] = max(term_scores[doc_id], weight * idf * (1 + math.log(count)))
+            if i == 0:
+                scores = dict(term_scores)
+            else:
+                scores = {doc_id: score + term_scores[doc_id] for doc_id, score in scores.items() if doc_id in term_scores}
+            if not scores:
+                return []
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,115 @@
+"""
+Interactive API documentation (Swagger UI at /apidocs/, spec at /apispec_1.json).
+
+flasgger is only imported when the spec is first requested (or exported at build time
+with `flask openapi-export`), so it does not weigh on worker start-up. The spec is built
+once per process and cached; with API_DOCS_SPEC_FILE a precompiled spec is served instead.
+"""
+import importlib.util
+import json
+import os
+import threading
+from flask import Blueprint, Response, current_app, send_from_directory, url_for
+
+docs_bp = Blueprint('api_docs', __name__)
+
+_build_lock = threading.Lock()
+
+SPEC_ENDPOINT = 'apispec_1'
+
+_UI_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <title>{title}</title>
+  <link rel="stylesheet" href="{static}swagger-ui.css">
+</head>
+<body>
+  <div id="swagger-ui"></div>
+  <script src="{static}swagger-ui-bundle.js"></script>
+  <script src="{static}swagger-ui-standalone-preset.js"></script>
+  <script>
+    SwaggerUIBundle({{
+      url: "{spec_url}",
+      dom_id: "#swagger-ui",
+      presets: [SwaggerUIBundle.presets.apis, SwaggerUIStandalonePreset],
+      layout: "StandaloneLayout"
+    }});
+  </script>
+</body>
+</html>
+"""
+
+def swag_from(specs: dict):
+    """
+    Attach an OpenAPI operation to a view, like flasgger.swag_from with a dict
+    but without importing flasgger (which reads the same `specs_dict` attribute).
+    """
+    def decorator(function):
+        function.specs_dict = specs
+        return function
+    return decorator
+
+def build_spec(app, template: dict) -> dict:
+    """
+    Build the OpenAPI spec of every documented route of `app` with flasgger.
+    Must run inside a request context of `app`.
+    """
+    from flasgger import Swagger
+    swagger = Swagger(template=template)
+    swagger.app = app
+    swagger.load_config(app)
+    return swagger.get_apispecs(SPEC_ENDPOINT)
+
+def _swagger_ui_static() -> str:
+    """Directory of the Swagger UI assets bundled with flasgger, found without importing it."""
+    spec = importlib.util.find_spec('flasgger')
+    return os.path.join(spec.submodule_search_locations[0], 'ui3', 'static') if spec else None
+
+def get_spec() -> dict:
+    """
+    Return the cached spec, loading it from API_DOCS_SPEC_FILE or building it on first use.
+    """
+    spec = current_app.extensions.get('openapi_spec')
+    if spec is None:
+        with _build_lock:
+            spec = current_app.extensions.get('openapi_spec')
+            if spec is None:
+                spec_file = current_app.config.get('API_DOCS_SPEC_FILE')
+                if spec_file and os.path.exists(spec_file):
+                    with open(spec_file, encoding='utf-8') as f:
+                        spec = json.load(f)
+                else:
+                    spec = build_spec(current_app._get_current_object(), current_app.extensions['openapi_template'])
+                current_app.extensions['openapi_spec'] = spec
+    return spec
+
+@docs_bp.route(f'/{SPEC_ENDPOINT}.json')
+def apispec():
+    return current_app.json.response(get_spec())
+
+@docs_bp.route('/apidocs/')
+def apidocs():
+    title = current_app.extensions['openapi_template'].get('info', {}).get('title', 'API')
+    page = _UI_PAGE.format(
+        title=title,
+        static=url_for('api_docs.apidocs_static', filename=''),
+        spec_url=url_for('api_docs.apispec'),
+    )
+    return Response(page, mimetype='text/html')
+
+@docs_bp.route('/apidocs/static/<path:filename>')
+def apidocs_static(filename):
+    directory = _swagger_ui_static()
+    if directory is None:
+        return Response('Swagger UI assets not installed', status=404)
+    return send_from_directory(directory, filename, max_age=86400)
+
+def init_api_docs(app, template: dict):
+    """
+    Register the documentation routes unless API_DOCS is disabled. Nothing is built here.
+    """
+    if not app.config.get('API_DOCS', True):
+        return
+    app.extensions['openapi_template'] = template
+    app.register_blueprint(docs_bp)
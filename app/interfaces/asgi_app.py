@@ -0,0 +1,345 @@
+import asyncio
+import re
+from urllib.parse import parse_qsl, unquote
+from app.application.component_service import subgraph_page
+from app.domain.component_search import search_page, search_terms
+from app.infrastructure.change_log import ChangeLogTruncated, requires_resync
+from app.infrastructure.circuit_breaker import DatabaseUnavailable
+from app.infrastructure.event_broadcaster import ChangeBroadcaster, TooManySubscribers
+from app.infrastructure.graph_events import VersionedCache
+from app.interfaces.flask_controller import PURGE_FILTERS
+from app.interfaces.json_provider import dumps
+
+def _sse(event: dict) -> bytes:
+    """Format a change (or a resync marker) as a Server-Sent Event."""
+    if event.get('event') == 'resync':
+        return b'event: resync\ndata: ' + dumps({'seq': event['seq']}) + b'\n\n'
+    return b'id: %d\nevent: change\ndata: ' % event['seq'] + dumps(event) + b'\n\n'
+
+def _query_args(scope) -> dict:
+    """The query string parameters of a request (the first value of each), like Flask's request.args."""
+    args = {}
+    for name, value in parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True):
+        args.setdefault(name, value)
+    return args
+
+def _int_arg(args: dict, name: str, default: int, low: int, high: int = None) -> int:
+    """An integer parameter clamped to [low, high]; a missing or malformed one takes the default."""
+    try:
+        value = int(args[name])
+    except (KeyError, ValueError):
+        value = default
+    value = max(value, low)
+    return value if high is None else min(value, high)
+
+class ComponentReadApp:
+    """
+    ASGI application serving the read-only component endpoints with asyncio.
+    Mirrors these GET routes of flask_controller, same parameters and responses, so clients can
+    point read traffic at it unchanged: /components, /components/search, /components/suggest,
+    /components/<id>, /subgraph and /stats.
+    Every request awaits the repository instead of holding a thread.
+    Also streams the change log as Server-Sent Events at /events.
+    """
+    def __init__(self, repo_factory, events: dict = None, suggest: dict = None, stats_ttl: float = 60):
+        """
+        Args:
+            repo_factory (callable): Coroutine function returning the async repository.
+                Called once at startup (ASGI lifespan) or on the first request.
+            events (dict, optional): ChangeBroadcaster settings, plus 'heartbeat' (seconds
+                between keep-alive comments on idle streams).
+            suggest (dict, optional): AsyncSuggestIndexFollower settings of the suggestion index,
+                loaded on the first /components/suggest request.
+            stats_ttl (float): Seconds /stats results stay cached when the change log head
+                does not move (it never does with the change feed disabled).
+        """
+        self._repo_factory = repo_factory
+        self._events = dict(events or {})
+        self._heartbeat = self._events.pop('heartbeat', 15)
+        self._suggest = dict(suggest or {})
+        self._suggest_lock = asyncio.Lock()
+        self.suggest_follower = None
+        self._stats_cache = VersionedCache(ttl=stats_ttl)
+        self._on_shutdown = []
+        self._startup_lock = asyncio.Lock()
+        self.repo = None
+        self.broadcaster = None
+        # Fixed paths go before /components/<component_id>, which would match them too
+        self._routes = [
+            (re.compile(r'^/components/?$'), self.get_components),
+            (re.compile(r'^/components/search$'), self.search_components),
+            (re.compile(r'^/components/suggest$'), self.suggest_components),
+            (re.compile(r'^/components/(?P<component_id>[^/]+)$'), self.get_component),
+            (re.compile(r'^/subgraph/?$'), self.get_subgraph),
+            (re.compile(r'^/stats/?$'), self.get_stats),
+        ]
+
+    async def startup(self):
+        if self.repo is not None:
+            return
+        async with self._startup_lock:
+            if self.repo is None:
+                self.repo = await self._repo_factory(self)
+                self.broadcaster = ChangeBroadcaster(self.repo, **self._events)
+
+    def on_shutdown(self, callback):
+        """Register a coroutine function to await at shutdown (e.g. closing the driver)."""
+        self._on_shutdown.append(callback)
+
+    async def shutdown(self):
+        if self.suggest_follower is not None:
+            await self.suggest_follower.close()
+        if self.broadcaster is not None:
+            await self.broadcaster.close()
+        if self.repo is not None:
+            await self.repo.close()
+        for callback in self._on_shutdown:
+            await callback()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        await self.startup()
+        path = unquote(scope['path'])
+        if path == '/events' and scope['method'] == 'GET':
+            await self.stream_events(scope, receive, send)
+            return
+        for pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match:
+                if scope['method'] not in ('GET', 'HEAD'):
+                    await self._send_json(send, {'error': 'Method not allowed'}, 405)
+                    return
+                headers = []
+                try:
+                    body, status = await handler(_query_args(scope), **match.groupdict())
+                except DatabaseUnavailable as e:
+                    # Fail fast while the circuit is open, like the Flask API
+                    body, status = {'error': 'Database unavailable, retry later', 'retry_after': e.retry_after}, 503
+                    headers = [(b'retry-after', str(e.retry_after).encode())]
+                except Exception as e:
+                    body, status = {'error': f"Unexpected error: {str(e)}"}, 500
+                await self._send_json(send, body, status, head=scope['method'] == 'HEAD', headers=headers)
+                return
+        await self._send_json(send, {'error': 'Not found'}, 404)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _send_json(send, body, status: int, head: bool = False, headers=()):
+        payload = dumps(body)
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(payload)).encode()),
+                *headers,
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': b'' if head else payload})
+
+    async def stream_events(self, scope, receive, send):
+        """
+        Stream the component and relationship changes as Server-Sent Events ('change' events whose
+        id is the change's seq). A client that falls too far behind gets a 'resync' event instead of
+        the changes it missed and should reload the graph (or GET /changes) up to that seq.
+        A reconnecting client sending Last-Event-ID first receives the changes it missed.
+        """
+        try:
+            subscriber = await self.broadcaster.subscribe()
+        except TooManySubscribers:
+            await self._send_json(send, {'error': 'Too many event subscribers'}, 503)
+            return
+        # Changes up to here are replayed from the log, later ones arrive through the queue
+        live_from = self.broadcaster.seq
+        disconnected = asyncio.ensure_future(self._wait_disconnect(receive))
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),
+                ],
+            })
+            last_event_id = dict(scope.get('headers') or []).get(b'last-event-id')
+            if last_event_id and last_event_id.isdigit():
+                await self._replay(send, int(last_event_id), live_from, subscriber.queue.maxsize)
+            while not disconnected.done():
+                get = asyncio.ensure_future(subscriber.queue.get())
+                done, _ = await asyncio.wait({get, disconnected}, timeout=self._heartbeat,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if get not in done:
+                    get.cancel()
+                    if not disconnected.done():
+                        await send({'type': 'http.response.body', 'body': b': keep-alive\n\n', 'more_body': True})
+                    continue
+                events = [get.result()]
+                while not subscriber.queue.empty() and events[-1] is not None:
+                    events.append(subscriber.queue.get_nowait())
+                closing = events[-1] is None
+                body = b''.join(_sse(event) for event in events if event is not None)
+                await send({'type': 'http.response.body', 'body': body, 'more_body': not closing})
+                if closing:
+                    return
+        finally:
+            self.broadcaster.unsubscribe(subscriber)
+            disconnected.cancel()
+
+    async def _replay(self, send, since: int, until: int, limit: int):
+        """Send the changes in (since, until], or a resync marker if there are too many or they expired."""
+        if since >= until:
+            return
+        try:
+            page = await self.repo.read_changes(since, limit)
+        except ChangeLogTruncated:
+            page = None
+        if page is None or (page['has_more'] and page['next'] < until):
+            await send({'type': 'http.response.body', 'body': _sse({'event': 'resync', 'seq': until}), 'more_body': True})
+            return
+        body = b''.join(_sse({'event': 'resync', 'seq': change['seq']} if requires_resync(change) else change)
+                        for change in page['changes'] if change['seq'] <= until)
+        await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    async def get_components(self, args):
+        """
+        Retrieve all components.
+        Returns:
+            JSON list of all components.
+        """
+        components = await self.repo.get_all()
+        return components, 200
+
+    async def search_components(self, args):
+        """
+        Full-text search of components, best matches first (parameters q, offset and limit).
+        Returns:
+            JSON page of hits with highlighted fields, or error message.
+        """
+        query = args.get('q', '').strip()
+        if not query:
+            return {'error': 'Query parameter q is required'}, 400
+        offset = _int_arg(args, 'offset', 0, 0)
+        limit = _int_arg(args, 'limit', 20, 1, 100)
+        terms = search_terms(query)
+        hits = await self.repo.search(terms, offset, limit + 1)
+        return search_page(hits, terms, offset, limit), 200
+
+    async def suggest_components(self, args):
+        """
+        Autocomplete for component pickers (parameters prefix and limit), answered from this
+        process's suggestion index without querying the database.
+        Returns:
+            JSON list of suggestions.
+        """
+        limit = _int_arg(args, 'limit', 10, 1, 50)
+        index = await self._suggest_index()
+        return index.suggest(args.get('prefix', ''), limit), 200
+
+    async def _suggest_index(self):
+        """Load the suggestion index on first use and start following the change log."""
+        if self.suggest_follower is None:
+            async with self._suggest_lock:
+                if self.suggest_follower is None:
+                    from app.infrastructure.suggest_index import AsyncSuggestIndexFollower, SuggestIndex
+                    follower = AsyncSuggestIndexFollower(self.repo, SuggestIndex(), **self._suggest)
+                    await follower.reload()
+                    follower.start()
+                    self.suggest_follower = follower
+        return self.suggest_follower.index
+
+    async def get_component(self, args, component_id):
+        """
+        Retrieve a component by its ID.
+        Returns:
+            JSON of the component or error message.
+        """
+        component = await self.repo.get_by_id(component_id)
+        if component:
+            return component, 200
+        return {'error': 'Not found'}, 404
+
+    async def get_subgraph(self, args):
+        """
+        The components matching the filters and the relationships among them, in one query per
+        page (parameters: the component attributes, include_boundary, after and limit).
+        Returns:
+            JSON page of nodes and relationships.
+        """
+        filters = {name: args[name] for name in PURGE_FILTERS if name in args}
+        include_boundary = args.get('include_boundary', 'false').lower() == 'true'
+        limit = _int_arg(args, 'limit', 1000, 1, 10000)
+        rows = await self.repo.subgraph(filters, include_boundary, args.get('after') or '', limit + 1)
+        return subgraph_page(rows, limit), 200
+
+    async def get_stats(self, args):
+        """
+        Aggregate statistics of the component graph (parameter top), cached until the change
+        log head moves.
+        Returns:
+            JSON with node, attribute, relationship and degree statistics.
+        """
+        top = _int_arg(args, 'top', 10, 1, 100)
+        version = await self.repo.change_log_head()
+        stats = self._stats_cache.get(top, version)
+        if stats is None:
+            stats = await self.repo.graph_stats(top)
+            self._stats_cache.put(top, version, stats)
+        return dict(stats, graph_version=version), 200
+
+def create_asgi_app(config_overrides: dict = None) -> ComponentReadApp:
+    """
+    Build the async read API for the configured REPOSITORY_BACKEND.
+    With 'neo4j' one AsyncDriver is created per event loop at startup and closed at shutdown.
+    """
+    from config import Config
+    config = {**{key: getattr(Config, key) for key in dir(Config) if key.isupper()}, **(config_overrides or {})}
+    backend = config['REPOSITORY_BACKEND'].lower()
+
+    async def repo_factory(read_app):
+        if backend == 'memory':
+            from app.infrastructure.memory_repository import InMemoryComponentRepository
+            from app.infrastructure.neo4j_async_repository import AsyncRepositoryAdapter
+            from app.infrastructure.change_log import MemoryChangeLog
+            return AsyncRepositoryAdapter(InMemoryComponentRepository(), MemoryChangeLog())
+        if backend == 'neo4j':
+            from app.infrastructure.neo4j_async_repository import AsyncNeo4jComponentRepository, create_async_driver
+            driver = create_async_driver()
+            await driver.verify_connectivity()
+            read_app.on_shutdown(driver.close)
+            return AsyncNeo4jComponentRepository(driver)
+        raise ValueError(f"Unknown repository backend: {backend}")
+
+    return ComponentReadApp(repo_factory, events={
+        'poll_interval': config['EVENTS_POLL_INTERVAL'],
+        'queue_size': config['EVENTS_QUEUE_SIZE'],
+        'max_subscribers': config['EVENTS_MAX_SUBSCRIBERS'],
+        'heartbeat': config['EVENTS_HEARTBEAT'],
+    }, suggest={
+        'interval': config['SUGGEST_REFRESH_INTERVAL'],
+        'reload_interval': config['SUGGEST_RELOAD_INTERVAL'],
+        'change_feed': config['CHANGE_FEED'],
+    }, stats_ttl=config['STATS_CACHE_TTL'])
@@ -0,0 +1,29 @@
+import json
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from app.application.component_service import ComponentService
+
+@click.command('graph-stats')
+@click.option('--top', default=10, show_default=True, help='Number of hubs and orphan ids to show.')
+@with_appcontext
+def graph_stats_command(top):
+    """Print the aggregate statistics of the component graph (same as GET /stats)."""
+    service = ComponentService()
+    try:
+        click.echo(json.dumps(service.get_graph_stats(top), indent=2, ensure_ascii=False))
+    finally:
+        service.close()
+
+@click.command('openapi-export')
+@click.argument('output', type=click.Path(dir_okay=False, writable=True))
+@with_appcontext
+def openapi_export_command(output):
+    """Write the OpenAPI spec to OUTPUT, to be served through API_DOCS_SPEC_FILE."""
+    from app import API_DOCS_TEMPLATE
+    from app.interfaces.api_docs import build_spec
+    with current_app.test_request_context():
+        spec = build_spec(current_app._get_current_object(), API_DOCS_TEMPLATE)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(spec, f, ensure_ascii=False, indent=2)
+    click.echo(f"OpenAPI spec written to {output} ({len(spec.get('paths', {}))} paths)")
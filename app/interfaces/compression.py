@@ -0,0 +1,140 @@
+import time
+import zlib
+from flask import current_app, request
+from app.infrastructure.metrics import get_metrics
+
+try:
+    import brotli
+except ImportError:  # optional dependency: 'br' is not offered
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency: 'zstd' is not offered
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'application/javascript', 'text/')
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        out = self._z.compress(data)
+        return out + self._z.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        return self._z.flush()
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        self._c = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        out = self._c.process(data)
+        return out + self._c.flush() if flush else out
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._c = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        out = self._c.compress(data)
+        return out + self._c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) if flush else out
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+# Content-Encoding -> (encoder class, config key of its level), if the codec is installed
+ENCODERS = {'gzip': (_GzipEncoder, 'COMPRESSION_GZIP_LEVEL')}
+if brotli is not None:
+    ENCODERS['br'] = (_BrotliEncoder, 'COMPRESSION_BROTLI_LEVEL')
+if zstandard is not None:
+    ENCODERS['zstd'] = (_ZstdEncoder, 'COMPRESSION_ZSTD_LEVEL')
+
+def _negotiate() -> str:
+    """
+    Return the configured encoding the client accepts with the highest quality
+    (ties go to the server's order in COMPRESSION_ALGORITHMS), or None.
+    """
+    offered = [name.strip() for name in current_app.config.get('COMPRESSION_ALGORITHMS', '').split(',')]
+    offered = [name for name in offered if name in ENCODERS]
+    if not offered:
+        return None
+    return request.accept_encodings.best_match(offered)
+
+def _compressible(response) -> bool:
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if request.method == 'HEAD' or response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return False
+    mimetype = response.mimetype or ''
+    return any(mimetype == kind or (kind.endswith('/') and mimetype.startswith(kind)) for kind in COMPRESSIBLE_MIMETYPES)
+
+def compress_response(response):
+    """
+    after_request hook compressing responses with the negotiated gzip, br or zstd encoding.
+    Buffered bodies are compressed in one go when at least COMPRESSION_MIN_SIZE bytes;
+    streamed bodies are compressed chunk by chunk and flushed after each chunk, so they
+    are never buffered and clients receive every chunk as soon as it is produced.
+    The time spent compressing is exported as the http_response_compression_seconds metric.
+    """
+    if not _compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+    min_size = current_app.config.get('COMPRESSION_MIN_SIZE', 1024)
+    if not response.is_streamed and response.calculate_content_length() < min_size:
+        return response
+    encoding = _negotiate()
+    if encoding is None:
+        return response
+    encoder_class, level_key = ENCODERS[encoding]
+    encoder = encoder_class(current_app.config[level_key])
+    metrics = get_metrics()
+
+    def record(elapsed: float, size_in: int, size_out: int):
+        metrics.observe('http_response_compression_seconds', elapsed,
+                        help='Time spent compressing response bodies', encoding=encoding)
+        metrics.inc('http_response_compression_bytes_total', size_in,
+                    help='Response body bytes before and after compression', encoding=encoding, stage='in')
+        metrics.inc('http_response_compression_bytes_total', size_out, encoding=encoding, stage='out')
+
+    response.headers['Content-Encoding'] = encoding
+    if not response.is_streamed:
+        data = response.get_data()
+        start = time.perf_counter()
+        compressed = encoder.compress(data) + encoder.finish()
+        elapsed = time.perf_counter() - start
+        response.set_data(compressed)
+        response.headers['Server-Timing'] = f"compress;dur={elapsed * 1000:.2f}"
+        record(elapsed, len(data), len(compressed))
+        return response
+
+    body = response.response
+
+    def stream():
+        elapsed, size_in, size_out = 0.0, 0, 0
+        try:
+            for chunk in body:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode(response.charset)
+                start = time.perf_counter()
+                out = encoder.compress(chunk, flush=True)
+                elapsed += time.perf_counter() - start
+                size_in, size_out = size_in + len(chunk), size_out + len(out)
+                if out:
+                    yield out
+            tail = encoder.finish()
+            size_out += len(tail)
+            yield tail
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+            record(elapsed, size_in, size_out)
+
+    response.response = stream()
+    response.headers.pop('Content-Length', None)
+    return response
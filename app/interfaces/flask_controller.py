@@ -1,12 +1,118 @@
-from flask import Blueprint, request, jsonify, current_app
-from app.application.component_service import ComponentService
-from flasgger import swag_from
+import functools
+import os
+from flask import Blueprint, Response, request, jsonify, current_app
+from app.application.component_service import CENTRALITY_METRICS, ComponentService
+from app.interfaces.api_docs import swag_from
+from app.infrastructure.import_fingerprints import HashingStream, get_fingerprint_store, graph_state
+from app.infrastructure.import_results import get_result_store
+from app.infrastructure.metrics import get_metrics
+from app.infrastructure.admission import AdmissionRejected, get_import_admission
+from app.infrastructure.change_log import ChangeLogTruncated
+from app.infrastructure.circuit_breaker import DatabaseUnavailable
+from app.infrastructure.health import get_health_probe
 
 bp = Blueprint('component_api', __name__)
 # Use a function to create service on demand instead of at module load time
 def get_service():
     return ComponentService()
 
+FORCE_PARAMETER = {
+    'name': 'force',
+    'in': 'query',
+    'type': 'boolean',
+    'default': False,
+    'description': 'Run the import even if an identical file was already imported (otherwise the recorded result is replayed).'
+}
+
+ENGINE_PARAMETER = {
+    'name': 'engine',
+    'in': 'query',
+    'type': 'string',
+    'enum': ['python', 'load_csv'],
+    'description': 'python: rows are parsed and written by the API. load_csv: the file is staged into the Neo4j import directory and imported server-side with LOAD CSV ... IN TRANSACTIONS (falls back to python when the server cannot read it). A load_csv response only has counts: no result_id nor per-row details, whatever `details` says; for nodes a failing row aborts the import instead of being counted in errors, for relationships errors counts the rows whose endpoints do not exist. Defaults to IMPORT_ENGINE.'
+}
+
+DETAILS_PARAMETER = {
+    'name': 'details',
+    'in': 'query',
+    'type': 'string',
+    'enum': ['summary', 'full'],
+    'default': 'summary',
+    'description': 'summary: counts, the first errors and a result_id to page through every row at /import-results/<result_id>. full: every row inline in the response. Ignored by engine=load_csv, which only returns counts.'
+}
+
+def _flag(name: str) -> bool:
+    return request.values.get(name, 'false').lower() == 'true'
+
+def _replayed_import(key: str):
+    """
+    Return the recorded response for an identical completed import, or None.
+    """
+    if _flag('force'):
+        return None
+    result = get_fingerprint_store().get(key, graph_state())
+    if result is None:
+        return None
+    current_app.logger.info(f"Importación idéntica ya realizada, devolviendo resultado registrado: {key}")
+    response = jsonify(result)
+    response.headers['X-Import-Replayed'] = 'true'
+    return response, 201
+
+def _admission_controlled(view):
+    """
+    Run an import view inside the import bulkhead; when it is full answer 429 with Retry-After.
+    The check happens before the upload is read.
+    """
+    @functools.wraps(view)
+    def admitted(*args, **kwargs):
+        try:
+            with get_import_admission().admit():
+                return view(*args, **kwargs)
+        except AdmissionRejected as e:
+            current_app.logger.warning(f"Importación rechazada, demasiadas importaciones en curso (reintentar en {e.retry_after}s)")
+            get_metrics().inc('import_admission_rejected_total', help='Imports rejected by admission control', endpoint=request.endpoint)
+            response = jsonify({'error': 'Too many imports in progress, retry later', 'retry_after': e.retry_after})
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response, 429
+    return admitted
+
+@bp.errorhandler(DatabaseUnavailable)
+def _database_unavailable(e):
+    """
+    Fail fast with 503 while Neo4j is down, telling clients when the circuit is retried.
+    """
+    current_app.logger.error(f"Base de datos no disponible: {str(e)}")
+    response = jsonify({'error': 'Database unavailable, retry later', 'retry_after': e.retry_after})
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, 503
+
+def _engine() -> str:
+    engine = request.values.get('engine', current_app.config['IMPORT_ENGINE'])
+    if engine not in ('python', 'load_csv'):
+        raise ValueError(f"Invalid engine: {engine}")
+    return engine
+
+def _details_mode() -> str:
+    mode = request.values.get('details', 'summary')
+    return mode if mode in ('summary', 'full') else 'summary'
+
+def _result_writer():
+    """
+    Return the sink for per-row outcomes: a side file in summary mode, or None (inline list) in full mode.
+    """
+    return get_result_store().create_writer() if _details_mode() == 'summary' else None
+
+def _finish_result(result: dict, writer) -> dict:
+    return writer.summarize(result) if writer is not None else result
+
+def _record_import(key: str, result: dict):
+    """
+    Record a completed import so an identical upload can be replayed while the graph is
+    unchanged. Imports with errors are not recorded.
+    """
+    if result.get('errors', 0) == 0:
+        get_fingerprint_store().put(key, result, graph_state())
+
 @bp.route('/components', methods=['GET'])
 @swag_from({
     'responses': {
@@ -27,7 +133,51 @@ def get_components():
         JSON list of all components.
     """
     components = get_service().get_all_components()
-    return jsonify([c.to_dict() for c in components]), 200
+    return jsonify(components), 200
+
+@bp.route('/components/search', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {'name': 'q', 'in': 'query', 'type': 'string', 'required': True, 'description': 'Words to find in label, description, technology and host (case and accent insensitive; each word may match a whole word, a prefix or part of a word)'},
+        {'name': 'offset', 'in': 'query', 'type': 'integer', 'default': 0, 'description': 'Cursor: the "next" value of the previous page'},
+        {'name': 'limit', 'in': 'query', 'type': 'integer', 'default': 20, 'description': 'Hits per page (max 100)'}
+    ],
+    'responses': {
+        200: {'description': 'Ranked page of hits: {"items": [{"component", "score", "highlights"}], "next": cursor or null}'},
+        400: {'description': 'Missing query'}
+    }
+})
+def search_components():
+    """
+    Full-text search of components, best matches first.
+    Returns:
+        JSON page of hits with highlighted fields, or error message.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Query parameter q is required'}), 400
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    return jsonify(get_service().search_components(query, offset, limit)), 200
+
+@bp.route('/components/suggest', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {'name': 'prefix', 'in': 'query', 'type': 'string', 'required': True, 'description': 'Start of a label, of a word of the label or of an id (case and accent insensitive)'},
+        {'name': 'limit', 'in': 'query', 'type': 'integer', 'default': 10, 'description': 'Maximum number of suggestions (max 50)'}
+    ],
+    'responses': {
+        200: {'description': 'List of {"id", "label"}: label matches first, then id and word matches'}
+    }
+})
+def suggest_components():
+    """
+    Autocomplete for component pickers, answered from memory without querying the database.
+    Returns:
+        JSON list of suggestions.
+    """
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    return jsonify(get_service().suggest_components(request.args.get('prefix', ''), limit)), 200
 
 @bp.route('/components/<component_id>', methods=['GET'])
 @swag_from({
@@ -51,7 +201,7 @@ def get_component(component_id):
     """
     component = get_service().get_component(component_id)
     if component:
-        return jsonify(component.to_dict()), 200
+        return jsonify(component), 200
     return jsonify({'error': 'Not found'}), 404
 
 @bp.route('/components', methods=['POST'])
@@ -86,10 +236,13 @@ def create_component():
         JSON of the created component or error message.
     """
     data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({'error': 'A JSON object is required'}), 400
     try:
         component = get_service().create_component(data)
-        return jsonify(component.to_dict()), 201
-    except Exception as e:
+        return jsonify(component), 201
+    except ValueError as e:
+        # Only validation errors: DatabaseUnavailable goes to the blueprint's 503 handler
         return jsonify({'error': str(e)}), 400
 
 @bp.route('/components/<component_id>', methods=['PUT'])
@@ -127,7 +280,7 @@ def update_component(component_id):
     data = request.get_json()
     component = get_service().update_component(component_id, data)
     if component:
-        return jsonify(component.to_dict()), 200
+        return jsonify(component), 200
     return jsonify({'error': 'Not found'}), 404
 
 @bp.route('/components/<component_id>', methods=['DELETE'])
@@ -155,6 +308,46 @@ def delete_component(component_id):
         return '', 204
     return jsonify({'error': 'Not found'}), 404
 
+PURGE_FILTERS = ('category', 'location', 'host', 'component_type', 'technology', 'interface')
+
+@bp.route('/components', methods=['DELETE'])
+@swag_from({
+    'parameters': [
+        {'name': name, 'in': 'query', 'type': 'string', 'required': False, 'description': f'Delete only components with this {name}'}
+        for name in PURGE_FILTERS
+    ] + [
+        {'name': 'all', 'in': 'query', 'type': 'boolean', 'default': False, 'description': 'Required to delete every component when no filter is given'},
+        {'name': 'dry_run', 'in': 'query', 'type': 'boolean', 'default': False, 'description': 'Only count the matching components and the batches the purge would take'}
+    ],
+    'responses': {
+        200: {
+            'description': 'Purge result',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'matched': {'type': 'integer', 'description': 'Components matching the filters'},
+                    'deleted': {'type': 'integer', 'description': 'Components deleted with their relationships'},
+                    'batches': {'type': 'integer', 'description': 'Transactions used (or needed, with dry_run)'},
+                    'dry_run': {'type': 'boolean'}
+                }
+            }
+        },
+        400: {'description': 'No filter given without all=true'}
+    }
+})
+def purge_components():
+    """
+    Delete every component matching the query filters, with its relationships,
+    in bounded batches (PURGE_BATCH_SIZE components per transaction).
+    Returns:
+        JSON with matched/deleted counts or error message.
+    """
+    filters = {name: request.args[name] for name in PURGE_FILTERS if name in request.args}
+    if not filters and not _flag('all'):
+        return jsonify({'error': 'At least one filter is required (or all=true)'}), 400
+    result = get_service().purge_components(filters, current_app.config['PURGE_BATCH_SIZE'], dry_run=_flag('dry_run'))
+    return jsonify(result), 200
+
 @bp.route('/components/<id_from>/connect/<id_to>', methods=['POST'])
 @swag_from({
     'parameters': [
@@ -196,6 +389,243 @@ def connect_components(id_from, id_to):
         return jsonify({'message': 'Connection created'}), 201
     return jsonify({'error': 'Could not create connection'}), 400
 
+@bp.route('/stats', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {'name': 'top', 'in': 'query', 'type': 'integer', 'default': 10, 'description': 'Number of hubs and orphan ids to return (max 100)'}
+    ],
+    'responses': {
+        200: {
+            'description': 'Graph statistics',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'nodes': {'type': 'object', 'description': 'Total and counts by label'},
+                    'attributes': {'type': 'object', 'description': 'Component counts by value of each attribute'},
+                    'relationships': {'type': 'object', 'description': 'Total and counts by type and type_of_relation'},
+                    'degree_distribution': {'type': 'array', 'description': 'Number of components per degree'},
+                    'top_hubs': {'type': 'object', 'description': 'Components with the highest in and out degree'},
+                    'orphans': {'type': 'object', 'description': 'Components without relationships'},
+                    'graph_version': {'type': 'integer', 'description': 'Change log head the statistics were computed at (per-process version with CHANGE_FEED off: up to STATS_CACHE_TTL seconds stale)'}
+                }
+            }
+        }
+    }
+})
+def get_stats():
+    """
+    Aggregate statistics of the component graph, cached until the graph changes.
+    Returns:
+        JSON with node, attribute, relationship and degree statistics.
+    """
+    top = min(max(request.args.get('top', 10, type=int), 1), 100)
+    return jsonify(get_service().get_graph_stats(top)), 200
+
+CENTRALITY_SPEC = {
+    'parameters': [
+        {'name': 'metric', 'in': 'query', 'type': 'string', 'enum': list(CENTRALITY_METRICS), 'default': 'pagerank', 'description': 'degree (in + out), pagerank or betweenness (estimated from sampled sources)'},
+        {'name': 'top', 'in': 'query', 'type': 'integer', 'default': 20, 'description': 'Number of components to return (max 1000)'},
+        {'name': 'samples', 'in': 'query', 'type': 'integer', 'description': 'Source components sampled for betweenness. Defaults to ANALYSIS_BETWEENNESS_SAMPLES'}
+    ],
+    'responses': {
+        200: {
+            'description': 'Components ranked by the metric',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'metric': {'type': 'string'},
+                    'top': {'type': 'array', 'description': 'id and score (plus in/out for degree), best first'},
+                    'nodes': {'type': 'integer'},
+                    'relationships': {'type': 'integer'},
+                    'graph_version': {'type': 'integer', 'description': 'Change log head the result was computed at (per-process version with CHANGE_FEED off: up to ANALYSIS_CACHE_TTL seconds stale)'},
+                    'written': {'type': 'integer', 'description': 'Components updated (POST only)'}
+                }
+            }
+        },
+        400: {'description': 'Unknown metric'}
+    }
+}
+
+def _centrality(write: bool):
+    metric = request.values.get('metric', 'pagerank')
+    if metric not in CENTRALITY_METRICS:
+        return jsonify({'error': f"Unknown metric: {metric}"}), 400
+    top = min(max(request.values.get('top', 20, type=int), 1), 1000)
+    samples = max(request.values.get('samples', current_app.config['ANALYSIS_BETWEENNESS_SAMPLES'], type=int), 1)
+    return jsonify(get_service().get_centrality(metric, top, samples, write=write)), 200
+
+@bp.route('/analysis/centrality', methods=['GET'])
+@swag_from(CENTRALITY_SPEC)
+def get_centrality():
+    """
+    Structural importance of components, cached until the graph changes (with CHANGE_FEED off,
+    changes made by other processes are seen after at most ANALYSIS_CACHE_TTL seconds).
+    Returns:
+        JSON ranking or error message.
+    """
+    return _centrality(write=False)
+
+@bp.route('/analysis/centrality', methods=['POST'])
+@swag_from({**CENTRALITY_SPEC, 'responses': {**CENTRALITY_SPEC['responses'], 429: {'description': 'Too many bulk writes in progress'}}})
+@_admission_controlled
+def write_centrality():
+    """
+    Compute a centrality measure and store every score as the property centrality_<metric>
+    of each component. A bulk write, so it shares the import bulkhead.
+    Returns:
+        JSON ranking with the number of components written, or error message.
+    """
+    return _centrality(write=True)
+
+@bp.route('/subgraph', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {'name': name, 'in': 'query', 'type': 'string', 'description': f'Only components with this {name}'} for name in PURGE_FILTERS
+    ] + [
+        {'name': 'include_boundary', 'in': 'query', 'type': 'boolean', 'default': False, 'description': 'Also return relationships with components outside the subgraph'},
+        {'name': 'after', 'in': 'query', 'type': 'string', 'description': '"next" cursor of the previous page'},
+        {'name': 'limit', 'in': 'query', 'type': 'integer', 'default': 1000, 'description': 'Components per page (max 10000)'}
+    ],
+    'responses': {
+        200: {
+            'description': 'Page of the subgraph',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'nodes': {'type': 'array', 'description': 'Matching components, ordered by id'},
+                    'edges': {'type': 'array', 'description': 'source, target, props and boundary of each relationship'},
+                    'next': {'type': 'string', 'description': 'Cursor of the next page, or null'}
+                }
+            }
+        }
+    }
+})
+def get_subgraph():
+    """
+    The components matching the filters and the relationships among them, in one query per page.
+    Returns:
+        JSON page of nodes and relationships.
+    """
+    filters = {name: request.args[name] for name in PURGE_FILTERS if name in request.args}
+    include_boundary = _flag('include_boundary')
+    limit = min(max(request.args.get('limit', 1000, type=int), 1), 10000)
+    return jsonify(get_service().get_subgraph(filters, include_boundary, request.args.get('after'), limit)), 200
+
+@bp.route('/layout', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {'name': 'algorithm', 'in': 'query', 'type': 'string', 'enum': ['auto', 'force', 'hierarchical'], 'default': 'auto', 'description': 'auto: hierarchical for components without cycles, force-directed for the rest. force layouts are relaxed incrementally after small changes'},
+    ] + [
+        {'name': name, 'in': 'query', 'type': 'string', 'description': f'Only components with this {name}'} for name in PURGE_FILTERS
+    ],
+    'responses': {
+        200: {
+            'description': 'Node coordinates',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'nodes': {'type': 'array', 'description': 'id, x and y of each component'},
+                    'edges': {'type': 'array', 'description': '[source, target] pairs between the returned nodes'},
+                    'algorithm': {'type': 'string'},
+                    'incremental': {'type': 'boolean', 'description': 'Relaxed from the previous layout'},
+                    'graph_version': {'type': 'integer', 'description': 'Change log head the layout was computed at (per-process version with CHANGE_FEED off: up to ANALYSIS_CACHE_TTL seconds stale)'}
+                }
+            }
+        },
+        400: {'description': 'Unknown algorithm'}
+    }
+})
+def get_layout():
+    """
+    Precomputed layout of the whole graph or of the components matching the filters,
+    so clients only have to draw it.
+    Returns:
+        JSON with node coordinates and relationships, or error message.
+    """
+    algorithm = request.args.get('algorithm', 'auto')
+    if algorithm not in ('auto', 'force', 'hierarchical'):
+        return jsonify({'error': f"Unknown algorithm: {algorithm}"}), 400
+    filters = {name: request.args[name] for name in PURGE_FILTERS if name in request.args}
+    return jsonify(get_service().get_layout(algorithm, filters)), 200
+
+@bp.route('/changes', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {'name': 'since', 'in': 'query', 'type': 'integer', 'default': 0, 'description': 'Last sequence number already applied (the "next" value of the previous page); 0 reads from the start'},
+        {'name': 'limit', 'in': 'query', 'type': 'integer', 'default': 1000, 'description': 'Changes per page (max 10000)'}
+    ],
+    'responses': {
+        200: {
+            'description': 'Ordered changes after `since`',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'changes': {'type': 'array', 'description': 'Entries with seq, ts, entity, op, key and data. Bulk operations (op delete_where with the filters, or import with the counts) have key null and cannot be applied one by one: reload the graph from GET /components and continue after their seq'},
+                    'next': {'type': 'integer', 'description': 'Value of `since` for the next request'},
+                    'last_seq': {'type': 'integer', 'description': 'Newest sequence number in the log'},
+                    'has_more': {'type': 'boolean'}
+                }
+            }
+        },
+        404: {'description': 'The change feed is disabled'},
+        410: {'description': 'Changes after `since` are no longer retained: resynchronize from GET /components'}
+    }
+})
+def get_changes():
+    """
+    Incremental synchronization: the graph mutations after a sequence number, in order.
+    Returns:
+        JSON page of changes, or error message.
+    """
+    since = request.args.get('since', 0, type=int)
+    limit = min(max(request.args.get('limit', 1000, type=int), 1), 10000)
+    try:
+        page = get_service().get_changes(since, limit)
+    except ChangeLogTruncated as e:
+        return jsonify({'error': str(e), 'oldest_since': e.floor}), 410
+    if page is None:
+        return jsonify({'error': 'Change feed disabled'}), 404
+    return jsonify(page), 200
+
+@bp.route('/healthz', methods=['GET'])
+@swag_from({
+    'responses': {
+        200: {'description': 'The process is alive; includes the last cached database check'}
+    }
+})
+def healthz():
+    """
+    Liveness: answers from memory and does not depend on the database.
+    """
+    return jsonify({'status': 'alive', 'pid': os.getpid(), 'probe': get_health_probe().snapshot()}), 200
+
+@bp.route('/readyz', methods=['GET'])
+@swag_from({
+    'responses': {
+        200: {'description': 'Ready: the last background database check was recent, fast and successful'},
+        503: {'description': 'Not ready (starting, slow, failing or stale database checks): drain this instance'}
+    }
+})
+def readyz():
+    """
+    Readiness from the background database probe; no query runs on this request.
+    """
+    snapshot = get_health_probe().snapshot()
+    return jsonify(snapshot), 200 if snapshot['ready'] else 503
+
+@bp.route('/metrics', methods=['GET'])
+@swag_from({
+    'produces': ['text/plain'],
+    'responses': {
+        200: {'description': 'Metrics of this process in the Prometheus text format'}
+    }
+})
+def get_metrics_text():
+    """
+    Export the process metrics (e.g. response compression time) for Prometheus.
+    """
+    return Response(get_metrics().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @bp.route('/import-nodes-components', methods=['POST'])
 @swag_from({
     'consumes': ['multipart/form-data'],
@@ -206,7 +636,33 @@ def connect_components(id_from, id_to):
             'type': 'file',
             'required': True,
             'description': 'CSV file with columns: id, label, component_type, category, location, technology, host, description, interface'
-        }
+        },
+        {
+            'name': 'mode',
+            'in': 'query',
+            'type': 'string',
+            'enum': ['create', 'sync'],
+            'default': 'create',
+            'description': 'create: create new ids and skip existing ones. sync: write only the rows whose content changed since the last sync.'
+        },
+        {
+            'name': 'on_conflict',
+            'in': 'query',
+            'type': 'string',
+            'enum': ['skip', 'update', 'replace', 'error'],
+            'default': 'skip',
+            'description': 'With mode=create, what to do with ids that already exist: skip them, update them with the non-empty CSV values, replace them with the CSV row, or report them as errors.'
+        },
+        {
+            'name': 'delete_missing',
+            'in': 'query',
+            'type': 'boolean',
+            'default': False,
+            'description': 'With mode=sync, delete the components that are not in the file.'
+        },
+        ENGINE_PARAMETER,
+        DETAILS_PARAMETER,
+        FORCE_PARAMETER
     ],
     'responses': {
         200: {
@@ -222,29 +678,72 @@ def connect_components(id_from, id_to):
                 'type': 'object'
             }
         },
-        400: {'description': 'Validation or file error'}
+        400: {'description': 'Validation or file error'},
+        429: {'description': 'Too many imports in progress; retry after the Retry-After header'}
     }
 })
+@_admission_controlled
 def import_nodes_components():
     """
     Import component nodes from a CSV file. The CSV must have columns:
     id, label, component_type, category, location, technology, host, description, interface
     Always creates nodes in Neo4j.
+
+    With mode=sync only the rows whose content hash differs from the one stored on the
+    node are written, and delete_missing=true removes the components absent from the file.
+
+    Existing ids are resolved by on_conflict (skip, update, replace or error).
+
+    An upload identical to a completed import replays its result with the
+    X-Import-Replayed header, unless force=true.
     Returns:
-        JSON result of created/skipped components or error message.
+        JSON result of created/updated/skipped components or error message.
     """
-    from app.services import import_nodes_components_from_csv, import_and_create_nodes
+    from app.services import import_nodes_components_from_csv, import_and_create_nodes, sync_nodes, load_csv_nodes, CONFLICT_POLICIES
     if 'file' not in request.files:
         return jsonify({'error': 'No file part in the request'}), 400
     file = request.files['file']
     if file.filename == '':
         return jsonify({'error': 'No selected file'}), 400
+    mode = request.values.get('mode', 'create')
+    if mode not in ('create', 'sync'):
+        return jsonify({'error': f"Invalid mode: {mode}"}), 400
+    on_conflict = request.values.get('on_conflict', 'skip')
+    if on_conflict not in CONFLICT_POLICIES:
+        return jsonify({'error': f"Invalid on_conflict: {on_conflict}"}), 400
+    delete_missing = _flag('delete_missing')
+    key_prefix = f"import-nodes-components:{mode}:{on_conflict}:{delete_missing}:{_details_mode()}"
+    file.stream = HashingStream(file.stream)
+    writer = None
     try:
+        if _engine() == 'load_csv' and mode == 'create':
+            key = f"{key_prefix}:{file.stream.hexdigest()}"
+            replayed = _replayed_import(key)
+            if replayed:
+                return replayed
+            result = load_csv_nodes(file, on_conflict=on_conflict)
+            if result is not None:
+                _record_import(key, result)
+                return jsonify(result), 201
         components = import_nodes_components_from_csv(file)
-        result = import_and_create_nodes(components)
+        key = f"{key_prefix}:{file.stream.hexdigest()}"
+        replayed = _replayed_import(key)
+        if replayed:
+            return replayed
+        writer = _result_writer()
+        if mode == 'sync':
+            result = sync_nodes(components, delete_missing=delete_missing, details=writer)
+        else:
+            result = import_and_create_nodes(components, on_conflict=on_conflict, details=writer)
+        result = _finish_result(result, writer)
+        result['engine'] = 'python'
+        _record_import(key, result)
         return jsonify(result), 201
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
+    finally:
+        if writer is not None:
+            writer.close()
 
 @bp.route('/import-edges', methods=['POST'])
 @swag_from({
@@ -256,7 +755,16 @@ def import_nodes_components():
             'type': 'file',
             'required': True,
             'description': 'CSV file with columns: source, target, type_of_relation. The target column can contain multiple IDs separated by semicolons (;) to create multiple relationships from a single source.'
-        }
+        },
+        ENGINE_PARAMETER,
+        DETAILS_PARAMETER,
+        {
+            'name': 'workers',
+            'in': 'query',
+            'type': 'integer',
+            'description': 'Number of concurrent writers. Edges are partitioned by source id so concurrent writers never touch the same node. Defaults to IMPORT_EDGE_WORKERS.'
+        },
+        FORCE_PARAMETER
     ],
     'responses': {
         200: {
@@ -274,13 +782,19 @@ def import_nodes_components():
                     'created': {'type': 'integer', 'description': 'Number of relationships created'},
                     'updated': {'type': 'integer', 'description': 'Number of relationships updated'},
                     'errors': {'type': 'integer', 'description': 'Number of errors'},
+                    'workers': {'type': 'integer', 'description': 'Number of concurrent writers used'},
+                    'parallel_edges': {'type': 'integer', 'description': 'Edges written by the concurrent writers'},
+                    'serial_edges': {'type': 'integer', 'description': 'Edges touching nodes shared between writers, written afterwards by a single writer'},
+                    'retries': {'type': 'integer', 'description': 'Batches retried after a transient error (e.g. deadlock)'},
                     'details': {'type': 'array', 'description': 'Details of each relationship operation'}
                 }
             }
         },
-        400: {'description': 'Validation or file error'}
+        400: {'description': 'Validation or file error'},
+        429: {'description': 'Too many imports in progress; retry after the Retry-After header'}
     }
 })
+@_admission_controlled
 def import_edges():
     """
     Import edges from a CSV file. The CSV must have columns:
@@ -290,10 +804,12 @@ def import_edges():
     For example, "1,2;3;4,CONNECTS_TO" will create relationships from node 1 to nodes 2, 3, and 4.
     
     Always creates relationships in Neo4j. Only source and target are required.
+    An upload identical to a completed import replays its result with the
+    X-Import-Replayed header, unless force=true.
     Returns:
         JSON result of created/updated edges or error message.
     """
-    from app.services import import_edges_from_csv, import_and_create_edges
+    from app.services import import_edges_from_csv, import_and_create_edges, load_csv_edges
     import logging
     logging.getLogger().setLevel(logging.DEBUG)
     
@@ -310,19 +826,70 @@ def import_edges():
         
     current_app.logger.info(f"Procesando archivo: {file.filename}")
     
+    file.stream = HashingStream(file.stream)
+    writer = None
     try:
+        if _engine() == 'load_csv':
+            key = f"import-edges:{_details_mode()}:{file.stream.hexdigest()}"
+            replayed = _replayed_import(key)
+            if replayed:
+                return replayed
+            result = load_csv_edges(file)
+            if result is not None:
+                current_app.logger.info(f"Resultado: {result}")
+                _record_import(key, result)
+                return jsonify(result), 201
         edges = import_edges_from_csv(file)
         current_app.logger.info(f"Se leyeron {len(edges)} edges del CSV")
         
         if not edges:
             return jsonify({'error': 'No valid edges found in the file'}), 400
+        
+        key = f"import-edges:{_details_mode()}:{file.stream.hexdigest()}"
+        replayed = _replayed_import(key)
+        if replayed:
+            return replayed
             
-        result = import_and_create_edges(edges)
-        current_app.logger.info(f"Resultado: {result}")
+        workers = request.values.get('workers', current_app.config['IMPORT_EDGE_WORKERS'], type=int)
+        writer = _result_writer()
+        result = _finish_result(import_and_create_edges(edges, workers=workers, details=writer), writer)
+        result['engine'] = 'python'
+        current_app.logger.info(f"Resultado: {dict(result, details='...') if 'details' in result else result}")
+        _record_import(key, result)
         return jsonify(result), 201
     except ValueError as e:
         current_app.logger.error(f"Error en importación: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 400
+    except DatabaseUnavailable:
+        raise
     except Exception as e:
         current_app.logger.error(f"Error inesperado: {str(e)}", exc_info=True)
         return jsonify({'error': f"Unexpected error: {str(e)}"}), 500
+    finally:
+        if writer is not None:
+            writer.close()
+
+@bp.route('/import-results/<result_id>', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {'name': 'result_id', 'in': 'path', 'type': 'string', 'required': True, 'description': 'result_id returned by an import'},
+        {'name': 'status', 'in': 'query', 'type': 'string', 'description': 'Only rows with this status (created, updated, skipped, deleted...). "error" matches every error.'},
+        {'name': 'after', 'in': 'query', 'type': 'integer', 'description': 'Cursor: the "next" value of the previous page'},
+        {'name': 'limit', 'in': 'query', 'type': 'integer', 'default': 100, 'description': 'Rows per page (max 1000)'}
+    ],
+    'responses': {200: {'description': 'Page of per-row outcomes: {"items": [...], "next": cursor or null}'}, 404: {'description': 'Not found'}}
+})
+def get_import_results(result_id):
+    """
+    Page through the per-row outcomes of an import.
+    Args:
+        result_id (str): Identifier returned by the import.
+    Returns:
+        JSON page of rows and the cursor of the next page, or error message.
+    """
+    after = request.args.get('after', -1, type=int)
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 1000)
+    page = get_result_store().read_page(result_id, status=request.args.get('status'), after=after, limit=limit)
+    if page is None:
+        return jsonify({'error': 'Not found'}), 404
+    return jsonify(page), 200
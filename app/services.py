@@ -1,11 +1,28 @@
 import csv
-from typing import List, Dict, Any
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+import zlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from flask import current_app
 from werkzeug.datastructures import FileStorage
-from app.domain.component import Component
-from app.infrastructure.neo4j_repository import Neo4jComponentRepository
+from app.domain.component import Component, COMPONENT_FIELDS
+from app.infrastructure.circuit_breaker import DatabaseUnavailable
+from app.infrastructure.repository_factory import get_repository
 import re
 
+SYNC_BATCH_SIZE = 1000
+NODE_BATCH_SIZE = 1000
+CONFLICT_POLICIES = ('skip', 'update', 'replace', 'error')
+EDGE_BATCH_SIZE = 1000
+EDGE_BATCH_RETRIES = 3
+EDGE_RETRY_BACKOFF = 0.2
+
 def _detect_delimiter(header_line: str) -> str:
     """
     Detects the delimiter used in the CSV file based on the header line.
@@ -17,6 +34,20 @@ def _detect_delimiter(header_line: str) -> str:
     else:
         return ','
 
+def _edge_column_indexes(header: List[str]) -> Tuple[int, int, int]:
+    """
+    Finds the source, target and type_of_relation columns in a lower-cased edge CSV header.
+    source and target default to the first two columns; type_of_relation is -1 when absent.
+    """
+    source_idx = header.index('source') if 'source' in header else 0
+    target_idx = header.index('target') if 'target' in header else 1
+    type_idx = -1
+    if 'type_of_relation' in header:
+        type_idx = header.index('type_of_relation')
+    elif 'type' in header:
+        type_idx = header.index('type')
+    return source_idx, target_idx, type_idx
+
 def import_nodes_components_from_csv(file: FileStorage) -> List[Dict[str, Any]]:
     """
     Reads a CSV file with component nodes and returns a list of dictionaries.
@@ -82,13 +113,7 @@ def import_edges_from_csv(file: FileStorage) -> List[Dict[str, Any]]:
         header = [h.strip().lower() for h in header]
         
         # Buscar los índices de las columnas requeridas
-        source_idx = header.index('source') if 'source' in header else 0
-        target_idx = header.index('target') if 'target' in header else 1
-        type_idx = -1
-        if 'type_of_relation' in header:
-            type_idx = header.index('type_of_relation')
-        elif 'type' in header:
-            type_idx = header.index('type')
+        source_idx, target_idx, type_idx = _edge_column_indexes(header)
         
         current_app.logger.info(f"CSV header: {header}")
         current_app.logger.info(f"Índices detectados: source={source_idx}, target={target_idx}, type_of_relation={type_idx}")
@@ -102,7 +127,7 @@ def import_edges_from_csv(file: FileStorage) -> List[Dict[str, Any]]:
             # Extraer campos
             source = row[source_idx].strip() if source_idx < len(row) else ''
             target_str = row[target_idx].strip() if target_idx < len(row) else ''
-            rel_type = row[type_idx].strip() if type_idx >= 0 and type_idx < len(row) else 'CONNECTS_TO'
+            rel_type = (row[type_idx].strip() if type_idx >= 0 and type_idx < len(row) else '') or 'CONNECTS_TO'
             
             if not source or not target_str:
                 current_app.logger.warning(f"Row {i}: Faltan source o target, saltando fila.")
@@ -129,240 +154,391 @@ def import_edges_from_csv(file: FileStorage) -> List[Dict[str, Any]]:
     current_app.logger.info(f"Se leyeron {len(edges)} edges del CSV.")
     return edges
 
-def import_and_create_nodes(components: List[Dict[str, Any]]) -> dict:
+def import_and_create_nodes(components: List[Dict[str, Any]], on_conflict: str = 'skip', batch_size: int = NODE_BATCH_SIZE, details=None) -> dict:
     """
-    Crea nodos de componentes en Neo4j a partir de una lista de diccionarios.
+    Crea nodos de componentes en el repositorio configurado a partir de una lista de diccionarios.
+    Cada lote se escribe con un único MERGE; los IDs que ya existen se resuelven según on_conflict:
+    'skip' los omite, 'update' sobrescribe sus campos con los valores no vacíos del CSV,
+    'replace' los deja exactamente como la fila y 'error' los reporta como error sin modificarlos.
     Args:
         components (List[Dict[str, Any]]): Lista de componentes leídos del CSV.
+        on_conflict (str): Política para los IDs existentes.
+        batch_size (int): Número de filas por transacción.
+        details (optional): Destino del resultado por fila (lista o ImportResultWriter). Por defecto una lista nueva.
     Returns:
-        dict: {'created': int, 'skipped': int, 'errors': int, 'details': list}
+        dict: {'created': int, 'updated': int, 'skipped': int, 'errors': int, 'details': list}
+    Raises:
+        ValueError: Si la política de conflicto no es válida.
     """
-    current_app.logger.info(f"Iniciando creación de {len(components)} componentes en Neo4j")
+    if on_conflict not in CONFLICT_POLICIES:
+        raise ValueError(f"Invalid on_conflict: {on_conflict}. Expected one of {', '.join(CONFLICT_POLICIES)}")
+    current_app.logger.info(f"Iniciando creación de {len(components)} componentes (on_conflict={on_conflict})")
     
-    repo = Neo4jComponentRepository()
-    current_app.logger.info(f"Repositorio Neo4j inicializado")
+    repo = get_repository()
+    current_app.logger.info(f"Repositorio inicializado: {type(repo).__name__}")
     
     created = 0
+    updated = 0
     skipped = 0
     errors = 0
-    details = []
+    details = details if details is not None else []
     
-    # Verificar si la base de datos está accesible
-    try:
-        # Intentamos una operación simple para verificar la conexión
-        with repo.driver.session(database=repo.database) as session:
-            result = session.run("RETURN 1 as test").single()
-            if result:
-                current_app.logger.info(f"Conexión a Neo4j verificada: {result['test']}")
-    except Exception as e:
-        current_app.logger.error(f"Error al conectar con Neo4j: {str(e)}", exc_info=True)
-        repo.close()
-        return {'created': 0, 'skipped': 0, 'errors': len(components), 'details': [{'error': f"Error de conexión a Neo4j: {str(e)}"}]}
+    # La conectividad la vigila la sonda de /readyz y el circuit breaker; no se sondea aquí
+    # La última fila gana si un ID aparece repetido
+    rows = list({comp['id']: {field: comp.get(field, '') for field in COMPONENT_FIELDS} for comp in components}.values())
+    conflict_status = {
+        'skip': 'skipped (already exists)',
+        'update': 'updated',
+        'replace': 'updated',
+        'error': 'error: already exists',
+    }[on_conflict]
     
-    # Crear los nodos
-    for i, comp in enumerate(components):
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
         try:
-            current_app.logger.debug(f"Procesando componente {i+1}/{len(components)}: {comp}")
-            component = Component(**comp)
-            current_app.logger.debug(f"Objeto componente creado: id={component.id}")
-            
-            # Verificar si existe directamente con una consulta simple
-            with repo.driver.session(database=repo.database) as session:
-                existing_check = session.run(
-                    "MATCH (c:Component {id: $id}) RETURN count(c) as count", 
-                    id=component.id
-                ).single()
-                
-                exists = existing_check and existing_check["count"] > 0
-                
-                if exists:
-                    current_app.logger.info(f"Componente ya existe, ID: {component.id}")
-                    skipped += 1
-                    details.append({'id': component.id, 'status': 'skipped (already exists)'})
-                    continue
-                
-                # Crear el componente directamente en la sesión
-                current_app.logger.info(f"Creando componente con ID: {component.id}")
-                result = session.run(
-                    """
-                    CREATE (c:Component {
-                        id: $id,
-                        label: $label,
-                        component_type: $component_type,
-                        category: $category,
-                        location: $location,
-                        technology: $technology,
-                        host: $host,
-                        description: $description,
-                        interface: $interface
-                    })
-                    RETURN c
-                    """,
-                    id=component.id,
-                    label=component.label,
-                    component_type=component.component_type,
-                    category=component.category,
-                    location=component.location,
-                    technology=component.technology,
-                    host=component.host,
-                    description=component.description,
-                    interface=component.interface
-                ).single()
-                
-                if result:
-                    current_app.logger.info(f"Componente creado: {component.id}")
-                    created += 1
-                    details.append({'id': component.id, 'status': 'created'})
-                else:
-                    current_app.logger.error(f"No se pudo crear el componente: {component.id}")
-                    errors += 1
-                    details.append({'id': component.id, 'status': 'error: no result returned'})
-                
+            created_flags = repo.merge_components(batch, on_conflict)
+        except DatabaseUnavailable:
+            raise
         except Exception as e:
-            current_app.logger.error(f"Error al crear componente {comp.get('id', 'unknown')}: {str(e)}", exc_info=True)
-            errors += 1
-            details.append({'id': comp.get('id', None), 'status': f'error: {str(e)}'})
+            current_app.logger.error(f"Error al escribir lote de componentes: {str(e)}", exc_info=True)
+            errors += len(batch)
+            details.extend({'id': row['id'], 'status': f'error: {str(e)}'} for row in batch)
+            continue
+        for row, was_created in zip(batch, created_flags):
+            if was_created:
+                created += 1
+                details.append({'id': row['id'], 'status': 'created'})
+                continue
+            details.append({'id': row['id'], 'status': conflict_status})
+            if on_conflict == 'skip':
+                skipped += 1
+            elif on_conflict == 'error':
+                errors += 1
+            else:
+                updated += 1
+        current_app.logger.info(f"Lote escrito: {start + len(batch)}/{len(rows)} componentes")
     
-    current_app.logger.info(f"Resultado final: creados={created}, omitidos={skipped}, errores={errors}")
+    current_app.logger.info(f"Resultado final: creados={created}, actualizados={updated}, omitidos={skipped}, errores={errors}")
     repo.close()
-    return {'created': created, 'skipped': skipped, 'errors': errors, 'details': details}
+    return {'created': created, 'updated': updated, 'skipped': skipped, 'errors': errors, 'details': details}
+
+def _is_transient(error: Exception) -> bool:
+    """
+    Tells whether a failed write can be retried (deadlocks, leader switches...).
+    """
+    is_retryable = getattr(error, 'is_retryable', None)
+    return bool(is_retryable and is_retryable())
+
+def _partition_edges(edges: List[Dict[str, Any]], partitions: int):
+    """
+    Splits the edges into `partitions` disjoint streams by hash of the source id.
+    An edge goes to its stream only if every node it touches is touched by that stream alone,
+    so concurrent streams never lock the same node. The remaining edges (those touching nodes
+    shared between streams, typically hubs) are returned apart to be written by a single writer.
+    Returns:
+        Tuple[List[List[Dict]], List[Dict]]: Edges per stream and shared edges.
+    """
+    if partitions <= 1:
+        return [list(edges)], []
+    owner = [zlib.crc32(edge['source'].encode('utf-8')) % partitions for edge in edges]
+    touched_by = defaultdict(set)
+    for edge, p in zip(edges, owner):
+        touched_by[edge['source']].add(p)
+        touched_by[edge['target']].add(p)
+    streams = [[] for _ in range(partitions)]
+    shared = []
+    for edge, p in zip(edges, owner):
+        if len(touched_by[edge['source']]) == 1 and len(touched_by[edge['target']]) == 1:
+            streams[p].append(edge)
+        else:
+            shared.append(edge)
+    return streams, shared
+
+def _write_edge_stream(repo, edges: List[Dict[str, Any]], batch_size: int, logger, details) -> dict:
+    """
+    Writes a stream of edges in batches, retrying batches that fail with a transient error.
+    The outcome of each edge is appended to `details`.
+    Returns:
+        dict: {'created', 'updated', 'errors', 'batches', 'retries'}
+    """
+    summary = {'created': 0, 'updated': 0, 'errors': 0, 'batches': 0, 'retries': 0}
+    # Orden estable de bloqueo dentro de cada lote
+    edges = sorted(edges, key=lambda e: (e['source'], e['target']))
+    for start in range(0, len(edges), batch_size):
+        batch = edges[start:start + batch_size]
+        payload = [{'source': e['source'], 'target': e['target'], 'props': {'type_of_relation': e.get('type_of_relation', 'CONNECTS_TO')}} for e in batch]
+        summary['batches'] += 1
+        statuses, error = None, None
+        for attempt in range(EDGE_BATCH_RETRIES + 1):
+            try:
+                statuses = repo.upsert_relationships(payload)
+                break
+            except DatabaseUnavailable:
+                raise
+            except Exception as e:
+                if attempt < EDGE_BATCH_RETRIES and _is_transient(e):
+                    summary['retries'] += 1
+                    logger.warning(f"Error transitorio en lote de relaciones, reintentando ({attempt + 1}/{EDGE_BATCH_RETRIES}): {str(e)}")
+                    time.sleep(EDGE_RETRY_BACKOFF * (2 ** attempt))
+                    continue
+                logger.error(f"Error al escribir lote de relaciones: {str(e)}", exc_info=True)
+                error = e
+                break
+        if error is not None:
+            summary['errors'] += len(batch)
+            details.extend({'source': e['source'], 'target': e['target'], 'status': f'error: {str(error)}'} for e in batch)
+            continue
+        for edge, status in zip(batch, statuses):
+            source, target = edge['source'], edge['target']
+            if status is None:
+                summary['errors'] += 1
+                details.append({'source': source, 'target': target, 'status': 'error: nodes not found'})
+            else:
+                summary[status] += 1
+                details.append({'source': source, 'target': target, 'status': status})
+    return summary
 
-def import_and_create_edges(edges: List[Dict[str, Any]]) -> dict:
+def import_and_create_edges(edges: List[Dict[str, Any]], workers: int = 1, batch_size: int = EDGE_BATCH_SIZE, details=None) -> dict:
     """
-    Crea relaciones CONNECTS_TO en Neo4j a partir de una lista de diccionarios.
+    Crea relaciones CONNECTS_TO en el repositorio configurado a partir de una lista de diccionarios.
+    Las relaciones se escriben en lotes. Con workers > 1 se reparten por hash del source en flujos
+    disjuntos que se escriben en paralelo, cada uno con sus propias sesiones; las relaciones que tocan
+    nodos compartidos entre flujos se escriben después con un único escritor.
     Args:
         edges (List[Dict[str, Any]]): Lista de edges leídos del CSV.
+        workers (int): Número de escritores concurrentes.
+        batch_size (int): Número de relaciones por transacción.
+        details (optional): Destino del resultado por fila (lista o ImportResultWriter). Por defecto una lista nueva.
     Returns:
-        dict: {'created': int, 'updated': int, 'errors': int, 'details': list}
+        dict: {'created': int, 'updated': int, 'errors': int, 'details': list, 'workers': int,
+               'parallel_edges': int, 'serial_edges': int, 'batches': int, 'retries': int}
     """
-    current_app.logger.info(f"Iniciando creación de {len(edges)} relaciones en Neo4j")
+    logger = current_app.logger
+    logger.info(f"Iniciando creación de {len(edges)} relaciones con {workers} escritores")
     
-    repo = Neo4jComponentRepository()
-    current_app.logger.info(f"Repositorio Neo4j inicializado")
+    repo = get_repository()
+    logger.info(f"Repositorio inicializado: {type(repo).__name__}")
     
-    created = 0
-    updated = 0
-    errors = 0
-    details = []
-    
-    # Verificar si la base de datos está accesible
     try:
-        # Intentamos una operación simple para verificar la conexión
-        with repo.driver.session(database=repo.database) as session:
-            result = session.run("RETURN 1 as test").single()
-            if result:
-                current_app.logger.info(f"Conexión a Neo4j verificada: {result['test']}")
-                
-            # Verificar si hay nodos Component existentes
-            count = session.run("MATCH (c:Component) RETURN count(c) as count").single()
-            current_app.logger.info(f"Número de nodos Component existentes: {count['count']}")
-            
-            if count['count'] == 0:
-                current_app.logger.error("No hay nodos Component en la base de datos. Primero debes importar nodos.")
-                repo.close()
-                return {'created': 0, 'updated': 0, 'errors': len(edges), 'details': [{'error': "No hay nodos en la base de datos"}]}
+        # Verificar si hay nodos Component existentes
+        count = repo.count()
+        logger.info(f"Número de nodos Component existentes: {count}")
+        
+        if count == 0:
+            logger.error("No hay nodos Component en la base de datos. Primero debes importar nodos.")
+            repo.close()
+            return {'created': 0, 'updated': 0, 'errors': len(edges), 'details': [{'error': "No hay nodos en la base de datos"}]}
+    except DatabaseUnavailable:
+        raise
     except Exception as e:
-        current_app.logger.error(f"Error al conectar con Neo4j: {str(e)}", exc_info=True)
+        logger.error(f"Error al conectar con el repositorio: {str(e)}", exc_info=True)
         repo.close()
         return {'created': 0, 'updated': 0, 'errors': len(edges), 'details': [{'error': f"Error de conexión a Neo4j: {str(e)}"}]}
     
-    for i, edge in enumerate(edges):
-        source = edge['source']
-        target = edge['target']
-        rel_type = edge.get('type_of_relation', 'CONNECTS_TO')
-        
-        try:
-            current_app.logger.info(f"Procesando relación {i+1}/{len(edges)}: {source} -> {target} ({rel_type})")
-            
-            with repo.driver.session(database=repo.database) as session:
-                # Verificar si ambos nodos existen
-                check_result = session.run(
-                    """
-                    MATCH (source:Component {id: $source})
-                    MATCH (target:Component {id: $target})
-                    RETURN count(source) > 0 AND count(target) > 0 as both_exist
-                    """,
-                    source=source,
-                    target=target
-                ).single()
-                
-                if not check_result or not check_result['both_exist']:
-                    errors += 1
-                    current_app.logger.error(f"No se encontraron los nodos para la relación: {source} -> {target}")
-                    details.append({'source': source, 'target': target, 'status': 'error: nodes not found'})
-                    continue
-                
-                # Verificar si la relación ya existe
-                exists_check = session.run(
-                    """
-                    MATCH (source:Component {id: $source})-[r:CONNECTS_TO]->(target:Component {id: $target})
-                    RETURN count(r) > 0 as exists
-                    """,
-                    source=source,
-                    target=target
-                ).single()
-                
-                if exists_check and exists_check['exists']:
-                    current_app.logger.info(f"La relación ya existe: {source} -> {target}, actualizando propiedades")
-                    
-                    # Actualizar propiedades
-                    update_result = session.run(
-                        """
-                        MATCH (source:Component {id: $source})-[r:CONNECTS_TO]->(target:Component {id: $target})
-                        SET r.type_of_relation = $rel_type
-                        RETURN r
-                        """,
-                        source=source,
-                        target=target,
-                        rel_type=rel_type
-                    ).single()
-                    
-                    if update_result:
-                        updated += 1
-                        details.append({'source': source, 'target': target, 'status': 'updated'})
-                        current_app.logger.info(f"Relación actualizada: {source} -> {target}")
-                    else:
-                        errors += 1
-                        details.append({'source': source, 'target': target, 'status': 'error: could not update relation'})
-                        current_app.logger.error(f"No se pudo actualizar la relación: {source} -> {target}")
-                    continue
-                
-                # Crear la relación
-                result = session.run(
-                    """
-                    MATCH (source:Component {id: $source})
-                    MATCH (target:Component {id: $target})
-                    CREATE (source)-[r:CONNECTS_TO {type_of_relation: $rel_type}]->(target)
-                    RETURN r
-                    """,
-                    source=source,
-                    target=target,
-                    rel_type=rel_type
-                ).single()
-                
-                if result:
-                    created += 1
-                    details.append({'source': source, 'target': target, 'status': 'created'})
-                    current_app.logger.info(f"Relación creada: {source} -> {target}")
-                else:
-                    errors += 1
-                    details.append({'source': source, 'target': target, 'status': 'error: could not create relation'})
-                    current_app.logger.error(f"No se pudo crear la relación: {source} -> {target}")
-            
-        except Exception as e:
-            errors += 1
-            current_app.logger.error(f"Error al procesar relación {source} -> {target}: {str(e)}", exc_info=True)
-            details.append({'source': source, 'target': target, 'status': f'error: {str(e)}'})
+    details = details if details is not None else []
+    workers = max(1, workers)
+    streams, shared = _partition_edges(edges, workers)
+    logger.info(f"Relaciones en flujos paralelos: {sum(len(s) for s in streams)}, en nodos compartidos: {len(shared)}")
+    
+    if workers == 1:
+        summaries = [_write_edge_stream(repo, streams[0], batch_size, logger, details)]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='edge-import') as pool:
+            summaries = list(pool.map(lambda stream: _write_edge_stream(repo, stream, batch_size, logger, details), streams))
+    summaries.append(_write_edge_stream(repo, shared, batch_size, logger, details))
+    
+    result = {'created': 0, 'updated': 0, 'errors': 0, 'details': details, 'batches': 0, 'retries': 0}
+    for summary in summaries:
+        for key in ('created', 'updated', 'errors', 'batches', 'retries'):
+            result[key] += summary[key]
+    result['workers'] = workers
+    result['parallel_edges'] = len(edges) - len(shared)
+    result['serial_edges'] = len(shared)
     
-    current_app.logger.info(f"Resultado final: creados={created}, actualizados={updated}, errores={errors}")
+    logger.info(f"Resultado final: creados={result['created']}, actualizados={result['updated']}, errores={result['errors']}")
     
     # Verificar cuántas relaciones CONNECTS_TO existen ahora
     try:
-        with repo.driver.session(database=repo.database) as session:
-            count = session.run("MATCH ()-[r:CONNECTS_TO]->() RETURN count(r) as count").single()
-            current_app.logger.info(f"Número de relaciones CONNECTS_TO existentes: {count['count']}")
+        logger.info(f"Número de relaciones CONNECTS_TO existentes: {repo.count_relationships()}")
     except Exception as e:
-        current_app.logger.error(f"Error al contar relaciones: {str(e)}")
+        logger.error(f"Error al contar relaciones: {str(e)}")
         
     repo.close()
-    return {'created': created, 'updated': updated, 'errors': errors, 'details': details}
+    return result
+
+def component_content_hash(component: Dict[str, Any]) -> str:
+    """
+    Computes a stable hash of a component's fields, independent of dict order.
+    """
+    values = [component.get(field, '') or '' for field in COMPONENT_FIELDS]
+    return hashlib.sha256(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def sync_nodes(components: List[Dict[str, Any]], delete_missing: bool = False, batch_size: int = SYNC_BATCH_SIZE, details=None) -> dict:
+    """
+    Sincroniza el grafo con el CSV escribiendo solo las filas que cambiaron.
+    Compara el hash de contenido de cada fila con el guardado en cada nodo (leído en bloque)
+    y crea, actualiza u opcionalmente elimina en lotes.
+    Args:
+        components (List[Dict[str, Any]]): Lista de componentes leídos del CSV.
+        delete_missing (bool): Elimina los componentes que no aparecen en el CSV.
+        batch_size (int): Número de filas por transacción.
+        details (optional): Destino del resultado por fila (lista o ImportResultWriter). Por defecto una lista nueva.
+    Returns:
+        dict: {'created': int, 'updated': int, 'unchanged': int, 'deleted': int, 'errors': int, 'details': list}
+    """
+    current_app.logger.info(f"Iniciando sincronización de {len(components)} componentes")
+    repo = get_repository()
+    
+    # La última fila gana si un ID aparece repetido
+    rows = {comp['id']: comp for comp in components}
+    stored_hashes = repo.get_content_hashes()
+    
+    to_create, to_update = [], []
+    details = details if details is not None else []
+    unchanged = 0
+    for component_id, comp in rows.items():
+        row = {field: comp.get(field, '') for field in COMPONENT_FIELDS}
+        row['content_hash'] = component_content_hash(row)
+        if component_id not in stored_hashes:
+            to_create.append(row)
+        elif stored_hashes[component_id] != row['content_hash']:
+            to_update.append(row)
+        else:
+            unchanged += 1
+    to_delete = [cid for cid in stored_hashes if cid not in rows] if delete_missing else []
+    
+    result = {'created': 0, 'updated': 0, 'unchanged': unchanged, 'deleted': 0, 'errors': 0, 'details': details}
+    for status, key, batch_rows in (('created', 'created', to_create), ('updated', 'updated', to_update)):
+        for start in range(0, len(batch_rows), batch_size):
+            batch = batch_rows[start:start + batch_size]
+            try:
+                repo.upsert_many(batch)
+                result[key] += len(batch)
+                details.extend({'id': row['id'], 'status': status} for row in batch)
+            except DatabaseUnavailable:
+                raise
+            except Exception as e:
+                current_app.logger.error(f"Error al escribir lote de componentes: {str(e)}", exc_info=True)
+                result['errors'] += len(batch)
+                details.extend({'id': row['id'], 'status': f'error: {str(e)}'} for row in batch)
+    for start in range(0, len(to_delete), batch_size):
+        batch = to_delete[start:start + batch_size]
+        try:
+            result['deleted'] += repo.delete_many(batch)
+            details.extend({'id': cid, 'status': 'deleted'} for cid in batch)
+        except DatabaseUnavailable:
+            raise
+        except Exception as e:
+            current_app.logger.error(f"Error al eliminar lote de componentes: {str(e)}", exc_info=True)
+            result['errors'] += len(batch)
+            details.extend({'id': cid, 'status': f'error: {str(e)}'} for cid in batch)
+    
+    current_app.logger.info(
+        f"Sincronización terminada: creados={result['created']}, actualizados={result['updated']}, "
+        f"sin cambios={unchanged}, eliminados={result['deleted']}, errores={result['errors']}"
+    )
+    repo.close()
+    return result
+
+def _stage_upload(file: FileStorage) -> Optional[str]:
+    """
+    Copia el archivo subido al directorio de importación de Neo4j (NEO4J_IMPORT_DIR, volumen compartido).
+    Returns:
+        Optional[str]: Nombre del archivo dentro del directorio, o None si no hay directorio configurado.
+    """
+    import_dir = current_app.config.get('NEO4J_IMPORT_DIR')
+    if not import_dir or not os.path.isdir(import_dir):
+        return None
+    name = f"upload-{uuid.uuid4().hex}.csv"
+    file.stream.seek(0)
+    with open(os.path.join(import_dir, name), 'wb') as staged:
+        shutil.copyfileobj(file.stream, staged)
+    return name
+
+def _read_header(file: FileStorage) -> Tuple[str, List[str]]:
+    """
+    Reads the header line of the upload and returns the detected delimiter and the lower-cased column names.
+    """
+    file.stream.seek(0)
+    first_line = file.stream.readline().decode('utf-8-sig').strip()
+    delimiter = _detect_delimiter(first_line)
+    header = next(csv.reader([first_line], delimiter=delimiter), [])
+    return delimiter, [h.strip().lower() for h in header]
+
+def _run_load_csv(file: FileStorage, load) -> Optional[dict]:
+    """
+    Stages the upload and runs `load(repo, url, delimiter, header)` on the Neo4j server.
+    Returns None when the server-side path is not available so the caller falls back to Python:
+    the repository is not Neo4j, no import directory is shared, or the server cannot read the file.
+    """
+    repo = get_repository()
+    staged = None
+    try:
+        if not hasattr(repo, 'can_load_csv'):
+            current_app.logger.info("LOAD CSV no disponible para este repositorio, usando importación en Python")
+            return None
+        staged = _stage_upload(file)
+        if staged is None:
+            current_app.logger.info("NEO4J_IMPORT_DIR no configurado, usando importación en Python")
+            return None
+        url = f"file:///{staged}"
+        if not repo.can_load_csv(url):
+            current_app.logger.warning(f"Neo4j no puede leer {url}, usando importación en Python")
+            return None
+        delimiter, header = _read_header(file)
+        current_app.logger.info(f"Importando {url} con LOAD CSV (delimitador {delimiter!r})")
+        result = load(repo, url, delimiter, header)
+        result['engine'] = 'load_csv'
+        return result
+    finally:
+        if staged is not None:
+            os.remove(os.path.join(current_app.config['NEO4J_IMPORT_DIR'], staged))
+        repo.close()
+
+def load_csv_nodes(file: FileStorage, on_conflict: str = 'skip') -> Optional[dict]:
+    """
+    Importa nodos con LOAD CSV ... CALL { ... } IN TRANSACTIONS en el servidor Neo4j,
+    sin pasar las filas por Python. Las columnas se asignan por posición, como en
+    import_nodes_components_from_csv.
+    Returns:
+        Optional[dict]: {'created', 'updated', 'skipped', 'errors', 'rows', 'engine'}, o None si hay que
+        usar la importación en Python (incluida la política 'error', que necesita el detalle por fila).
+    """
+    if on_conflict == 'error':
+        return None
+    batch_size = current_app.config.get('IMPORT_LOAD_CSV_BATCH_SIZE', 10000)
+
+    def load(repo, url, delimiter, header):
+        counts = repo.load_csv_components(url, delimiter, on_conflict, batch_size)
+        existing = counts['rows'] - counts['created']
+        return {
+            'created': counts['created'],
+            'updated': existing if on_conflict in ('update', 'replace') else 0,
+            'skipped': existing if on_conflict == 'skip' else 0,
+            'errors': 0,
+            'rows': counts['rows'],
+        }
+
+    return _run_load_csv(file, load)
+
+def load_csv_edges(file: FileStorage) -> Optional[dict]:
+    """
+    Importa relaciones con LOAD CSV ... CALL { ... } IN TRANSACTIONS en el servidor Neo4j,
+    con la misma detección de columnas y expansión de múltiples targets separados por ';'
+    que import_edges_from_csv.
+    Returns:
+        Optional[dict]: {'created', 'updated', 'errors', 'rows', 'engine'}, o None si hay que usar la importación en Python.
+    """
+    batch_size = current_app.config.get('IMPORT_LOAD_CSV_BATCH_SIZE', 10000)
+
+    def load(repo, url, delimiter, header):
+        source_idx, target_idx, type_idx = _edge_column_indexes(header)
+        counts = repo.load_csv_edges(url, delimiter, source_idx, target_idx, type_idx, batch_size)
+        return {
+            'created': counts['created'],
+            'updated': counts['matched'] - counts['created'],
+            'errors': counts['rows'] - counts['matched'],
+            'rows': counts['rows'],
+        }
+
+    return _run_load_csv(file, load)
@@ -0,0 +1,4 @@
+from app.interfaces.asgi_app import create_asgi_app
+
+# Async read API: uvicorn asgi:app --host 0.0.0.0 --port 5001
+app = create_asgi_app()
@@ -0,0 +1,60 @@
+"""
+Benchmark de serialización JSON de listados de componentes (GET /components).
+
+Compara el proveedor JSON por defecto de Flask (stdlib + to_dict() por elemento, como antes)
+con el proveedor configurable de la app (orjson serializando los Component directamente).
+
+Uso:
+    python benchmarks/bench_json.py [--sizes 10000 100000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from app.domain.component import Component
+from app.interfaces.json_provider import create_json_provider, orjson
+
+def make_components(n):
+    return [
+        Component(id=f"c{i}", label=f"Component {i}", component_type='Service', category='API',
+                  location='Private Site', technology='Java', host=f"host-{i % 50}",
+                  description='Generated for the JSON benchmark', interface='REST')
+        for i in range(n)
+    ]
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    stdlib_app, fast_app = Flask('stdlib'), Flask('fast')
+    stdlib_app.json = create_json_provider(stdlib_app, 'stdlib')
+    fast_app.json = create_json_provider(fast_app, 'auto')
+    if orjson is None:
+        print("orjson no está instalado: ambos casos usan el codificador de la biblioteca estándar")
+
+    print(f"{'elementos':>10} {'stdlib+to_dict (s)':>20} {'proveedor app (s)':>18} {'mejora':>8} {'tamaño (MB)':>12}")
+    for n in args.sizes:
+        components = make_components(n)
+        with stdlib_app.app_context():
+            baseline = best_of(args.repeat, lambda: stdlib_app.json.response([c.to_dict() for c in components]))
+        with fast_app.app_context():
+            fast = best_of(args.repeat, lambda: fast_app.json.response(components))
+            size = len(fast_app.json.response(components).get_data()) / 1e6
+        print(f"{n:>10} {baseline:>20.4f} {fast:>18.4f} {baseline / fast:>7.1f}x {size:>12.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark del arranque en frío de la API (lo que paga cada worker nuevo de gunicorn).
+
+Cada repetición se ejecuta en un intérprete nuevo y mide:
+- import: tiempo de `from app import create_app` (coste de importar módulos)
+- create_app: tiempo de construir la aplicación
+Además lista los módulos más costosos según `python -X importtime`.
+
+Uso:
+    python benchmarks/bench_startup.py [--repeat 5] [--top 10] [--max-ms 800]
+Con --max-ms termina con código 1 si la mediana de import + create_app supera el umbral.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app()
+created = time.perf_counter()
+print(json.dumps({'import': imported - start, 'create_app': created - imported}))
+"""
+
+def run_probe(env):
+    out = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def import_costs(env, top):
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'from app import create_app; create_app()'],
+                            cwd=ROOT, env=env, check=True, capture_output=True, text=True).stderr
+    costs = []
+    for line in stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            costs.append((int(parts[1]), parts[2].rstrip()))
+    # Solo los dos primeros niveles del árbol de imports, para no repetir submódulos
+    roots = [(us, name.strip()) for us, name in costs if not name.startswith('    ')]
+    return sorted(roots, reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=None)
+    args = parser.parse_args()
+
+    env = dict(os.environ, REPOSITORY_BACKEND=os.environ.get('REPOSITORY_BACKEND', 'memory'))
+    samples = [run_probe(env) for _ in range(args.repeat)]
+    imports = [s['import'] * 1000 for s in samples]
+    creates = [s['create_app'] * 1000 for s in samples]
+    totals = [i + c for i, c in zip(imports, creates)]
+
+    print(f"{'fase':<12} {'mediana (ms)':>13} {'mín (ms)':>10} {'máx (ms)':>10}")
+    for name, values in (('import', imports), ('create_app', creates), ('total', totals)):
+        print(f"{name:<12} {statistics.median(values):>13.1f} {min(values):>10.1f} {max(values):>10.1f}")
+
+    print("\nMódulos más costosos (acumulado, ms):")
+    for us, name in import_costs(env, args.top):
+        print(f"  {us / 1000:>8.1f}  {name}")
+
+    if args.max_ms is not None and statistics.median(totals) > args.max_ms:
+        print(f"\nArranque por encima del umbral: {statistics.median(totals):.1f} ms > {args.max_ms} ms")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -9,3 +9,78 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Component storage adapter: 'neo4j' or 'memory'
+    REPOSITORY_BACKEND = os.environ.get('REPOSITORY_BACKEND') or 'neo4j'
+    # Results of completed imports are replayed for identical uploads within this window
+    IMPORT_FINGERPRINT_TTL = int(os.environ.get('IMPORT_FINGERPRINT_TTL') or 3600)
+    IMPORT_FINGERPRINT_MAX_ENTRIES = int(os.environ.get('IMPORT_FINGERPRINT_MAX_ENTRIES') or 256)
+    # Concurrent writers used by /import-edges (1 = single writer)
+    IMPORT_EDGE_WORKERS = int(os.environ.get('IMPORT_EDGE_WORKERS') or 1)
+    # Per-row import outcomes go to compressed side files paged through /import-results/<id>
+    IMPORT_RESULTS_DIR = os.environ.get('IMPORT_RESULTS_DIR')
+    IMPORT_RESULTS_TTL = int(os.environ.get('IMPORT_RESULTS_TTL') or 86400)
+    IMPORT_RESULT_MAX_ERRORS = int(os.environ.get('IMPORT_RESULT_MAX_ERRORS') or 20)
+    # Import engine: 'python' or 'load_csv' (server-side, needs NEO4J_IMPORT_DIR shared with Neo4j)
+    IMPORT_ENGINE = os.environ.get('IMPORT_ENGINE') or 'python'
+    NEO4J_IMPORT_DIR = os.environ.get('NEO4J_IMPORT_DIR')
+    IMPORT_LOAD_CSV_BATCH_SIZE = int(os.environ.get('IMPORT_LOAD_CSV_BATCH_SIZE') or 10000)
+    # Components deleted per transaction by DELETE /components
+    PURGE_BATCH_SIZE = int(os.environ.get('PURGE_BATCH_SIZE') or 10000)
+    # Upper bound on how long GET /stats serves cached results (writes from this process invalidate them at once)
+    STATS_CACHE_TTL = int(os.environ.get('STATS_CACHE_TTL') or 60)
+    # JSON encoder for API responses: 'auto' (orjson when installed), 'orjson' or 'stdlib'
+    JSON_SERIALIZER = os.environ.get('JSON_SERIALIZER') or 'auto'
+    # Response compression: encodings offered in server preference order ('br' and 'zstd' need
+    # the brotli / zstandard packages), minimum buffered body size and level per codec
+    COMPRESSION_ALGORITHMS = os.environ.get('COMPRESSION_ALGORITHMS', 'zstd,br,gzip')
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE') or 1024)
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL') or 6)
+    COMPRESSION_BROTLI_LEVEL = int(os.environ.get('COMPRESSION_BROTLI_LEVEL') or 4)
+    COMPRESSION_ZSTD_LEVEL = int(os.environ.get('COMPRESSION_ZSTD_LEVEL') or 3)
+    # Import bulkhead: imports running and waiting per process (the rest get 429 + Retry-After);
+    # keep their sum below WEB_THREADS so reads always have threads left
+    IMPORT_MAX_CONCURRENT = int(os.environ.get('IMPORT_MAX_CONCURRENT') or 1)
+    IMPORT_MAX_QUEUED = int(os.environ.get('IMPORT_MAX_QUEUED') or 1)
+    IMPORT_QUEUE_TIMEOUT = float(os.environ.get('IMPORT_QUEUE_TIMEOUT') or 30)
+    # Cluster-wide import slots held as lock nodes in Neo4j (0 = per-process limit only)
+    IMPORT_CLUSTER_SLOTS = int(os.environ.get('IMPORT_CLUSTER_SLOTS') or 0)
+    IMPORT_CLUSTER_LOCK_TTL = int(os.environ.get('IMPORT_CLUSTER_LOCK_TTL') or 3600)
+    # Swagger UI at /apidocs/ ('false' removes it); the spec is built on first request unless
+    # a precompiled one exists at API_DOCS_SPEC_FILE (see `flask openapi-export`)
+    API_DOCS = (os.environ.get('API_DOCS') or 'true').lower() == 'true'
+    API_DOCS_SPEC_FILE = os.environ.get('API_DOCS_SPEC_FILE')
+    # Background database probe behind /healthz and /readyz
+    HEALTH_PROBE_INTERVAL = float(os.environ.get('HEALTH_PROBE_INTERVAL') or 5)
+    HEALTH_MAX_LATENCY_MS = float(os.environ.get('HEALTH_MAX_LATENCY_MS') or 1000)
+    HEALTH_FAILURE_THRESHOLD = int(os.environ.get('HEALTH_FAILURE_THRESHOLD') or 2)
+    # Start the probe when the app is created (development server); gunicorn turns it off in
+    # the master and starts it in each worker after the fork instead
+    HEALTH_PROBE_AUTOSTART = os.environ.get('HEALTH_PROBE_AUTOSTART', 'true').lower() == 'true'
+    # Group commit of concurrent POST /components and PUT /components/<id>: writes arriving within
+    # the window (or until the batch is full) share one transaction
+    WRITE_COALESCING = (os.environ.get('WRITE_COALESCING') or 'false').lower() == 'true'
+    WRITE_COALESCE_WINDOW_MS = float(os.environ.get('WRITE_COALESCE_WINDOW_MS') or 2)
+    WRITE_COALESCE_MAX_BATCH = int(os.environ.get('WRITE_COALESCE_MAX_BATCH') or 500)
+    # Change feed (GET /changes): ordered log of the graph mutations, compacted every
+    # CHANGE_LOG_COMPACT_EVERY changes and keeping the last CHANGE_LOG_RETENTION sequence numbers
+    CHANGE_FEED = (os.environ.get('CHANGE_FEED') or 'true').lower() == 'true'
+    CHANGE_LOG_RETENTION = int(os.environ.get('CHANGE_LOG_RETENTION') or 100000)
+    CHANGE_LOG_COMPACT_EVERY = int(os.environ.get('CHANGE_LOG_COMPACT_EVERY') or 10000)
+    # Server-Sent Events of the change log on the async API (GET /events): polling period,
+    # events a client may fall behind before it gets a resync marker, and keep-alive period
+    EVENTS_POLL_INTERVAL = float(os.environ.get('EVENTS_POLL_INTERVAL') or 0.5)
+    EVENTS_QUEUE_SIZE = int(os.environ.get('EVENTS_QUEUE_SIZE') or 1000)
+    EVENTS_MAX_SUBSCRIBERS = int(os.environ.get('EVENTS_MAX_SUBSCRIBERS') or 1000)
+    EVENTS_HEARTBEAT = float(os.environ.get('EVENTS_HEARTBEAT') or 15)
+    # Autocomplete index (GET /components/suggest): seconds between change log polls, and between
+    # full reloads when the change feed is disabled
+    SUGGEST_REFRESH_INTERVAL = float(os.environ.get('SUGGEST_REFRESH_INTERVAL') or 1)
+    SUGGEST_RELOAD_INTERVAL = float(os.environ.get('SUGGEST_RELOAD_INTERVAL') or 300)
+    # Centrality analytics (GET /analysis/centrality): cache lifetime, sources sampled to estimate
+    # betweenness, and components per transaction when writing scores back
+    ANALYSIS_CACHE_TTL = int(os.environ.get('ANALYSIS_CACHE_TTL') or 300)
+    ANALYSIS_BETWEENNESS_SAMPLES = int(os.environ.get('ANALYSIS_BETWEENNESS_SAMPLES') or 64)
+    ANALYSIS_WRITE_BATCH_SIZE = int(os.environ.get('ANALYSIS_WRITE_BATCH_SIZE') or 10000)
+    # Graph layout (GET /layout): most affected nodes for which a force-directed layout is
+    # relaxed incrementally instead of recomputed
+    LAYOUT_INCREMENTAL_MAX = int(os.environ.get('LAYOUT_INCREMENTAL_MAX') or 200)
@@ -1,100 +1,50 @@
 """
 Script para verificar si la aplicación está mostrando correctamente las relaciones en Neo4j.
-Este script genera un informe simple de los nodos y relaciones en la base de datos.
+Este script genera un informe simple de los nodos y relaciones en la base de datos
+a partir de las mismas estadísticas agregadas que expone GET /stats (flask graph-stats).
 """
-import os
-import sys
-from neo4j import GraphDatabase
 import logging
+from app import create_app
+from app.application.component_service import ComponentService
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def generate_neo4j_report():
+def generate_neo4j_report(top: int = 5):
     """Generate a report of nodes and relationships in Neo4j"""
-    # Usar las mismas variables de entorno que usa la app
-    uri = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
-    user = os.environ.get("NEO4J_USER", "neo4j")
-    password = os.environ.get("NEO4J_PASSWORD", "test1234")
-    database = os.environ.get("NEO4J_DATABASE", "neo4j")
-    
     try:
-        # Conectar a Neo4j
-        driver = GraphDatabase.driver(uri, auth=(user, password))
-        driver.verify_connectivity()
-        logger.info("✅ Conexión a Neo4j establecida")
+        app = create_app()
+        with app.app_context():
+            service = ComponentService()
+            stats = service.get_graph_stats(top)
+            service.close()
         
-        with driver.session(database=database) as session:
-            # Contar nodos por etiqueta
-            node_count = session.run(
-                """
-                MATCH (n) 
-                RETURN labels(n) as label, count(*) as count
-                ORDER BY count DESC
-                """
-            ).data()
+        logger.info("=== NODOS EN LA BASE DE DATOS ===")
+        for label, count in stats['nodes']['by_label'].items():
+            logger.info(f"  {label}: {count} nodos")
             
-            logger.info("=== NODOS EN LA BASE DE DATOS ===")
-            for item in node_count:
-                logger.info(f"  {item['label']}: {item['count']} nodos")
-                
-            # Contar relaciones por tipo
-            rel_count = session.run(
-                """
-                MATCH ()-[r]->() 
-                RETURN type(r) as type, count(*) as count
-                ORDER BY count DESC
-                """
-            ).data()
+        logger.info("\n=== RELACIONES EN LA BASE DE DATOS ===")
+        for rel_type, count in stats['relationships']['by_type'].items():
+            logger.info(f"  {rel_type}: {count} relaciones")
+        for relation, count in stats['relationships']['by_type_of_relation'].items():
+            logger.info(f"    type_of_relation={relation!r}: {count}")
             
-            logger.info("\n=== RELACIONES EN LA BASE DE DATOS ===")
-            for item in rel_count:
-                logger.info(f"  {item['type']}: {item['count']} relaciones")
-                
-            # Mostrar algunos nodos con sus conexiones
-            sample_nodes = session.run(
-                """
-                MATCH (n:Component)
-                RETURN n.id as id, n.label as label, n.component_type as type 
-                LIMIT 5
-                """
-            ).data()
+        logger.info("\n=== DISTRIBUCIÓN DE GRADO ===")
+        for item in stats['degree_distribution']:
+            logger.info(f"  grado {item['degree']}: {item['nodes']} nodos")
             
-            logger.info("\n=== MUESTRA DE NODOS ===")
-            for node in sample_nodes:
-                logger.info(f"  ID: {node['id']}, Label: {node['label']}, Tipo: {node['type']}")
-                
-                # Buscar relaciones salientes
-                out_relations = session.run(
-                    """
-                    MATCH (n:Component {id: $id})-[r]->(m)
-                    RETURN type(r) as type, m.id as target_id, m.label as target_label
-                    """,
-                    id=node['id']
-                ).data()
-                
-                if out_relations:
-                    logger.info(f"    Relaciones salientes:")
-                    for rel in out_relations:
-                        logger.info(f"      {rel['type']} -> {rel['target_id']} ({rel['target_label']})")
-                
-                # Buscar relaciones entrantes
-                in_relations = session.run(
-                    """
-                    MATCH (n:Component {id: $id})<-[r]-(m)
-                    RETURN type(r) as type, m.id as source_id, m.label as source_label
-                    """,
-                    id=node['id']
-                ).data()
-                
-                if in_relations:
-                    logger.info(f"    Relaciones entrantes:")
-                    for rel in in_relations:
-                        logger.info(f"      {rel['type']} <- {rel['source_id']} ({rel['source_label']})")
+        logger.info("\n=== NODOS CON MÁS CONEXIONES ===")
+        for direction, title in (('out', 'Relaciones salientes'), ('in', 'Relaciones entrantes')):
+            logger.info(f"  {title}:")
+            for hub in stats['top_hubs'][direction]:
+                logger.info(f"    ID: {hub['id']}, Label: {hub['label']}, Grado: {hub['degree']}")
+        
+        logger.info(f"\n=== NODOS SIN RELACIONES: {stats['orphans']['count']} ===")
+        for orphan_id in stats['orphans']['ids']:
+            logger.info(f"  ID: {orphan_id}")
             
-        driver.close()
         logger.info("\n✅ Reporte generado correctamente")
         return True
     
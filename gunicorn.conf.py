@@ -0,0 +1,99 @@
+"""
+Configuración de gunicorn para servir la API en producción.
+
+Modelo de concurrencia:
+- Gunicorn arranca WEB_WORKERS procesos (por defecto 2 * núcleos + 1). Cada proceso
+  tiene su propio intérprete y GIL, así que el throughput escala con los núcleos.
+- Cada worker usa la clase gthread con WEB_THREADS hilos. Las peticiones pasan casi
+  todo el tiempo esperando a Neo4j (E/S de red, sin GIL), por lo que varios hilos por
+  proceso solapan esas esperas.
+- Cada worker crea su propio driver de Neo4j después del fork (post_fork). El pool de
+  conexiones nunca se comparte entre procesos; su tamaño (NEO4J_MAX_POOL_SIZE) debe
+  ser al menos WEB_THREADS. Con NEO4J_WARM_CONNECTIONS > 0 se abren esas conexiones
+  al arrancar el worker para no pagar el handshake en las primeras peticiones.
+- La aplicación se carga en el maestro (preload_app) para que el fork comparta las
+  páginas de código; el driver no se crea hasta el primer uso en el worker.
+- Recarga sin cortes: `kill -HUP <pid maestro>` arranca workers nuevos y deja que los
+  antiguos terminen sus peticiones en curso (hasta WEB_GRACEFUL_TIMEOUT segundos);
+  worker_exit cierra el driver de cada worker saliente.
+- Las importaciones pasan por un bulkhead (IMPORT_MAX_CONCURRENT en curso más
+  IMPORT_MAX_QUEUED en espera por proceso; el resto recibe 429 con Retry-After). Su
+  suma debe quedar por debajo de WEB_THREADS para que las lecturas siempre tengan
+  hilos libres; when_ready avisa si no es así.
+- Cada worker carga el índice de autocompletado (GET /components/suggest) justo
+  después del fork, con una sola consulta, y lo mantiene al día leyendo el registro
+  de cambios.
+- Cada worker arranca también la sonda de salud después del fork y espera a su primera
+  comprobación, así el primer /readyz ya tiene respuesta. El maestro no la arranca
+  (HEALTH_PROBE_AUTOSTART=false): no debe tener hilos ni conexiones a Neo4j al hacer fork.
+- Con REPOSITORY_BACKEND=memory cada worker tiene su propio almacén en memoria; use
+  WEB_WORKERS=1 si necesita un único estado compartido.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("WEB_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("WEB_THREADS", "8"))
+timeout = int(os.environ.get("WEB_TIMEOUT", "120"))
+graceful_timeout = int(os.environ.get("WEB_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("WEB_KEEPALIVE", "5"))
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.environ.get("WEB_MAX_REQUESTS_JITTER", "0"))
+preload_app = os.environ.get("WEB_PRELOAD", "true").lower() == "true"
+# The master must not start threads or open connections before forking
+os.environ.setdefault("HEALTH_PROBE_AUTOSTART", "false")
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("WEB_LOG_LEVEL", "info")
+
+def _uses_neo4j() -> bool:
+    return os.environ.get("REPOSITORY_BACKEND", "neo4j").lower() == "neo4j"
+
+def when_ready(server):
+    """Warn when imports could take every thread of a worker away from reads."""
+    import_threads = int(os.environ.get("IMPORT_MAX_CONCURRENT", "1")) + int(os.environ.get("IMPORT_MAX_QUEUED", "1"))
+    if import_threads >= threads:
+        server.log.warning(
+            f"IMPORT_MAX_CONCURRENT + IMPORT_MAX_QUEUED ({import_threads}) >= WEB_THREADS ({threads}): "
+            "las importaciones pueden dejar sin hilos a las lecturas"
+        )
+
+def post_fork(server, worker):
+    """
+    Create this worker's Neo4j driver, pre-open connections, start the health probe and load
+    the suggestion index.
+    """
+    database_ready = True
+    if _uses_neo4j():
+        from app.infrastructure.neo4j_driver import init_driver
+        try:
+            init_driver(int(os.environ.get("NEO4J_WARM_CONNECTIONS", threads)))
+        except Exception as e:
+            # The worker still boots; the driver is retried on the first request.
+            server.log.error(f"Worker {worker.pid}: no se pudo inicializar Neo4j: {e}")
+            database_ready = False
+    from app.infrastructure.health import get_health_probe
+    try:
+        with worker.app.wsgi().app_context():
+            get_health_probe(wait=True)
+    except Exception as e:
+        # Started again on the first health request.
+        server.log.error(f"Worker {worker.pid}: no se pudo arrancar la sonda de salud: {e}")
+    if not database_ready:
+        return
+    from app.infrastructure.suggest_index import get_suggest_index
+    try:
+        with worker.app.wsgi().app_context():
+            get_suggest_index()
+    except Exception as e:
+        # Loaded again on the first suggestion request.
+        server.log.error(f"Worker {worker.pid}: no se pudo cargar el índice de sugerencias: {e}")
+
+def worker_exit(server, worker):
+    """Close this worker's driver once its in-flight requests are done."""
+    if not _uses_neo4j():
+        return
+    from app.infrastructure.neo4j_driver import close_driver
+    close_driver()
@@ -1,6 +1,8 @@
+import os
 from app import create_app
 
 app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # Development server only; production uses gunicorn (see gunicorn.conf.py).
+    app.run(debug=os.environ.get('FLASK_DEBUG', '1') == '1')
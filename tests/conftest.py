@@ -1,24 +1,55 @@
 import pytest
 from app import create_app
-from neo4j import GraphDatabase
 import os
 
+# Tests run against the in-memory repository unless TEST_REPOSITORY_BACKEND=neo4j is set.
+TEST_REPOSITORY_BACKEND = os.environ.get("TEST_REPOSITORY_BACKEND", "memory")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "neo4j: needs a Neo4j server, skipped unless TEST_REPOSITORY_BACKEND=neo4j")
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the tests of Neo4j-only queries when no database is configured."""
+    if TEST_REPOSITORY_BACKEND == "neo4j":
+        return
+    skip = pytest.mark.skip(reason="needs Neo4j (TEST_REPOSITORY_BACKEND=neo4j)")
+    for item in items:
+        if item.get_closest_marker("neo4j"):
+            item.add_marker(skip)
+
 @pytest.fixture
-def app():
-    app = create_app()
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'REPOSITORY_BACKEND': TEST_REPOSITORY_BACKEND,
+        'IMPORT_RESULTS_DIR': str(tmp_path / 'import-results'),
+    })
     yield app
 
 @pytest.fixture
 def client(app):
     return app.test_client()
 
+@pytest.fixture
+def neo4j_repo(app):
+    """The Neo4j repository itself, without the change log wrapper."""
+    from app.infrastructure.neo4j_repository import Neo4jComponentRepository
+    with app.app_context():
+        repo = Neo4jComponentRepository()
+        yield repo
+        repo.close()
+
 @pytest.fixture(autouse=True)
 def clean_neo4j():
-    """Clean all Component nodes in Neo4j before each test."""
+    """Clean all Component nodes and the change log in Neo4j before each test when running against Neo4j."""
+    if TEST_REPOSITORY_BACKEND != "neo4j":
+        return
+    from neo4j import GraphDatabase
     uri = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
     user = os.environ.get("NEO4J_USER", "neo4j")
     password = os.environ.get("NEO4J_PASSWORD", "test1234")
     driver = GraphDatabase.driver(uri, auth=(user, password))
     with driver.session() as session:
-        session.run("MATCH (c:Component) DETACH DELETE c")
+        session.run("MATCH (c:Component) CALL { WITH c DETACH DELETE c } IN TRANSACTIONS OF 10000 ROWS")
+        session.run("MATCH (c) WHERE c:Change OR c:ChangeLogHead CALL { WITH c DELETE c } IN TRANSACTIONS OF 10000 ROWS")
     driver.close()
@@ -0,0 +1,63 @@
+import io
+import threading
+import time
+import pytest
+from app.infrastructure.admission import AdmissionRejected, ImportAdmission, get_import_admission
+
+def test_rejects_when_running_and_queued_slots_are_taken():
+    admission = ImportAdmission(max_concurrent=1, max_queued=0, queue_timeout=1)
+    with admission.admit():
+        with pytest.raises(AdmissionRejected) as rejected:
+            with admission.admit():
+                pass
+    assert rejected.value.retry_after >= 1
+    with admission.admit():
+        assert admission.active == 1
+
+def test_queued_request_runs_when_a_slot_frees():
+    admission = ImportAdmission(max_concurrent=1, max_queued=1, queue_timeout=5)
+    release, done = threading.Event(), []
+
+    def hold():
+        with admission.admit():
+            release.wait()
+
+    def wait_for_slot():
+        with admission.admit():
+            done.append(True)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    while admission.active == 0:
+        time.sleep(0.001)
+    waiter = threading.Thread(target=wait_for_slot)
+    waiter.start()
+    while admission.waiting == 0:
+        time.sleep(0.001)
+    with pytest.raises(AdmissionRejected):
+        with admission.admit():
+            pass
+    release.set()
+    holder.join()
+    waiter.join()
+    assert done == [True]
+
+def test_queued_request_times_out():
+    admission = ImportAdmission(max_concurrent=1, max_queued=1, queue_timeout=0.05)
+    with admission.admit():
+        with pytest.raises(AdmissionRejected):
+            with admission.admit():
+                pass
+        assert admission.waiting == 0
+
+def test_import_endpoint_answers_429_with_retry_after(app, client):
+    app.config.update(IMPORT_MAX_CONCURRENT=1, IMPORT_MAX_QUEUED=0)
+    with app.app_context():
+        admission = get_import_admission()
+    with admission.admit():
+        response = client.post('/import-edges', data={'file': (io.BytesIO(b'source,target\na,b\n'), 'edges.csv')})
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) >= 1
+        assert client.get('/components').status_code == 200
+    response = client.post('/import-edges', data={'file': (io.BytesIO(b'source,target\na,b\n'), 'edges.csv')})
+    assert response.status_code != 429
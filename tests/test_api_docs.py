@@ -0,0 +1,28 @@
+import json
+import subprocess
+import sys
+from app import create_app
+
+def test_spec_is_built_on_first_request_and_cached(app, client):
+    assert 'openapi_spec' not in app.extensions
+    spec = client.get('/apispec_1.json').json
+    assert '/components' in spec['paths']
+    assert app.extensions['openapi_spec'] is not None
+    assert client.get('/apispec_1.json').json == spec
+    assert client.get('/apidocs/').status_code == 200
+
+def test_precompiled_spec_is_served(tmp_path):
+    spec_file = tmp_path / 'openapi.json'
+    spec_file.write_text(json.dumps({'swagger': '2.0', 'paths': {'/precompiled': {}}}))
+    app = create_app({'TESTING': True, 'REPOSITORY_BACKEND': 'memory', 'API_DOCS_SPEC_FILE': str(spec_file)})
+    assert app.test_client().get('/apispec_1.json').json['paths'] == {'/precompiled': {}}
+
+def test_docs_can_be_disabled():
+    client = create_app({'TESTING': True, 'REPOSITORY_BACKEND': 'memory', 'API_DOCS': False}).test_client()
+    assert client.get('/apidocs/').status_code == 404
+    assert client.get('/apispec_1.json').status_code == 404
+
+def test_create_app_does_not_import_heavy_modules():
+    code = "import sys; from app import create_app; create_app(); print(sorted(m for m in ('flasgger', 'neo4j') if m in sys.modules))"
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == '[]'
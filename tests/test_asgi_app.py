@@ -0,0 +1,170 @@
+import asyncio
+import json
+import pytest
+from app.domain.component import Component
+from app.domain.component_search import search_terms
+from app.interfaces.asgi_app import ComponentReadApp, create_asgi_app
+
+def _get(app, path, method='GET', headers=None, query=b''):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    async def call():
+        await app({'type': 'http', 'method': method, 'path': path, 'query_string': query}, receive, send)
+
+    asyncio.run(call())
+    status = messages[0]['status']
+    body = messages[1]['body']
+    if headers is not None:
+        headers.update(messages[0]['headers'])
+    return status, json.loads(body) if body else None
+
+def test_read_endpoints():
+    app = create_asgi_app({'REPOSITORY_BACKEND': 'memory'})
+    assert _get(app, '/components') == (200, [])
+
+    app.repo.repo.create(Component(id='web', label='WebServer'))
+    status, body = _get(app, '/components')
+    assert status == 200 and [c['id'] for c in body] == ['web']
+    status, body = _get(app, '/components/web')
+    assert status == 200 and body['label'] == 'WebServer'
+    assert _get(app, '/components/missing')[0] == 404
+    assert _get(app, '/components', method='POST')[0] == 405
+    assert _get(app, '/other')[0] == 404
+
+def test_search_endpoint():
+    app = create_asgi_app({'REPOSITORY_BACKEND': 'memory'})
+    assert _get(app, '/components/search')[0] == 400
+    app.repo.repo.create(Component(id='web', label='Servidor Web', technology='nginx'))
+    app.repo.repo.create(Component(id='db', label='Base de datos'))
+    status, body = _get(app, '/components/search', query=b'q=servidor&limit=1')
+    assert status == 200 and body['next'] is None
+    assert [hit['component']['id'] for hit in body['items']] == ['web']
+    assert body['items'][0]['highlights']['label'] == '<em>Servidor</em> Web'
+
+def test_suggest_endpoint():
+    app = create_asgi_app({'REPOSITORY_BACKEND': 'memory'})
+    asyncio.run(app.startup())
+    app.repo.repo.create(Component(id='pay', label='Gestión de Pagos'))
+    app.repo.repo.create(Component(id='gw', label='Gateway'))
+    assert _get(app, '/components/suggest', query=b'prefix=gest') == (200, [{'id': 'pay', 'label': 'Gestión de Pagos'}])
+    status, body = _get(app, '/components/suggest', query=b'prefix=g&limit=1')
+    assert status == 200 and len(body) == 1
+    assert _get(app, '/components/suggest') == (200, [])
+
+def test_async_suggest_index_follows_the_change_log():
+    from app.infrastructure.change_log import MemoryChangeLog
+    from app.infrastructure.memory_repository import InMemoryComponentRepository
+    from app.infrastructure.neo4j_async_repository import AsyncRepositoryAdapter
+    from app.infrastructure.suggest_index import AsyncSuggestIndexFollower, SuggestIndex
+    changes = MemoryChangeLog()
+    repo = AsyncRepositoryAdapter(InMemoryComponentRepository(), changes)
+    follower = AsyncSuggestIndexFollower(repo, SuggestIndex())
+
+    async def run():
+        await follower.reload()
+        changes.append([{'entity': 'component', 'op': 'create', 'key': 'web', 'data': {'label': 'WebServer'}}])
+        await follower.follow()
+        return follower.index.suggest('web')
+
+    assert asyncio.run(run()) == [{'id': 'web', 'label': 'WebServer'}]
+
+def test_subgraph_endpoint():
+    app = create_asgi_app({'REPOSITORY_BACKEND': 'memory'})
+    asyncio.run(app.startup())
+    repo = app.repo.repo
+    for component_id, location in (('a', 'dc1'), ('b', 'dc1'), ('c', 'dc2')):
+        repo.create(Component(id=component_id, label=component_id.upper(), location=location))
+    repo.connect_components('a', 'b', {})
+    repo.connect_components('b', 'c', {})
+    status, body = _get(app, '/subgraph', query=b'location=dc1&limit=1')
+    assert status == 200 and [n['id'] for n in body['nodes']] == ['a'] and body['next'] == 'a'
+    status, body = _get(app, '/subgraph', query=b'location=dc1&include_boundary=true&after=a')
+    assert [n['id'] for n in body['nodes']] == ['b'] and body['next'] is None
+    assert [(e['source'], e['target'], e['boundary']) for e in body['edges']] == [('b', 'c', True)]
+
+def test_stats_endpoint():
+    app = create_asgi_app({'REPOSITORY_BACKEND': 'memory'})
+    asyncio.run(app.startup())
+    app.repo.repo.create(Component(id='a', label='A', location='dc1'))
+    status, body = _get(app, '/stats', query=b'top=1')
+    assert status == 200 and body['graph_version'] == 0
+    assert body['nodes'] == {'total': 1, 'by_label': {'Component': 1}} and body['orphans'] == {'count': 1, 'ids': ['a']}
+
+    # Cached until the change log head moves
+    app.repo.repo.create(Component(id='b', label='B'))
+    assert _get(app, '/stats', query=b'top=1')[1]['nodes']['total'] == 1
+    app.repo.changes.append([{'entity': 'component', 'op': 'create', 'key': 'b', 'data': {'label': 'B'}}])
+    status, body = _get(app, '/stats', query=b'top=1')
+    assert body['nodes']['total'] == 2 and body['graph_version'] == 1
+
+def test_async_queries_go_through_the_circuit_breaker(monkeypatch):
+    from neo4j.exceptions import ServiceUnavailable
+    from app.infrastructure import neo4j_driver
+    from app.infrastructure.circuit_breaker import CircuitBreaker
+    from app.infrastructure.neo4j_async_repository import AsyncNeo4jComponentRepository
+
+    class DownDriver:
+        def __init__(self):
+            self.sessions = 0
+
+        def session(self, database=None):
+            self.sessions += 1
+            raise ServiceUnavailable("connection refused")
+
+    driver = DownDriver()
+    monkeypatch.setattr(neo4j_driver, 'breaker', CircuitBreaker(failure_threshold=1, reset_timeout=30))
+
+    async def repo_factory(app):
+        return AsyncNeo4jComponentRepository(driver)
+
+    app = ComponentReadApp(repo_factory)
+    headers = {}
+    status, body = _get(app, '/components', headers=headers)
+    assert status == 503 and body['retry_after'] == 30 and headers[b'retry-after'] == b'30'
+    assert _get(app, '/components/web')[0] == 503
+    assert driver.sessions == 1
+
+def _with_async_neo4j(work):
+    """Run `work(repo)` on an AsyncNeo4jComponentRepository in one event loop."""
+    from app.infrastructure.neo4j_async_repository import AsyncNeo4jComponentRepository, create_async_driver
+
+    async def run():
+        driver = create_async_driver()
+        try:
+            return await work(AsyncNeo4jComponentRepository(driver))
+        finally:
+            await driver.close()
+
+    return asyncio.run(run())
+
+@pytest.mark.neo4j
+def test_neo4j_async_search_matches_the_sync_repository(neo4j_repo):
+    neo4j_repo.create(Component(id='1', label='Token Service', technology='Java'))
+    neo4j_repo.create(Component(id='2', label='Cache', description='token cache'))
+    terms = search_terms('token')
+    hits = _with_async_neo4j(lambda repo: repo.search(terms, 0, 10))
+    assert hits == neo4j_repo.search(terms, 0, 10) and [c.id for c, _ in hits] == ['1', '2']
+
+@pytest.mark.neo4j
+def test_neo4j_async_subgraph_matches_the_sync_repository(neo4j_repo):
+    for component_id, location in (('a', 'dc1'), ('b', 'dc1'), ('c', 'dc2')):
+        neo4j_repo.create(Component(id=component_id, label=component_id.upper(), location=location))
+    neo4j_repo.connect_components('a', 'b', {'type_of_relation': 'http'})
+    neo4j_repo.connect_components('b', 'c', {})
+    rows = _with_async_neo4j(lambda repo: repo.subgraph({'location': 'dc1'}, True, '', 10))
+    assert rows == neo4j_repo.subgraph({'location': 'dc1'}, True, '', 10)
+    assert [(e['source'], e['target'], e['boundary']) for _, edges in rows for e in edges] == [('a', 'b', False), ('b', 'c', True)]
+
+@pytest.mark.neo4j
+def test_neo4j_async_stats_match_the_sync_repository(neo4j_repo):
+    neo4j_repo.create(Component(id='a', label='A', location='dc1'))
+    neo4j_repo.create(Component(id='b', label='B'))
+    neo4j_repo.connect_components('a', 'b', {'type_of_relation': 'http'})
+    stats = _with_async_neo4j(lambda repo: repo.graph_stats(5))
+    assert stats == neo4j_repo.graph_stats(5) and stats['relationships']['by_type_of_relation'] == {'http': 1}
@@ -0,0 +1,87 @@
+import itertools
+from collections import deque
+import pytest
+from app.infrastructure import centrality
+from app.infrastructure.centrality import Topology
+
+def _brute_force_betweenness(ids, edges):
+    """Betweenness by enumerating every shortest path, for comparison."""
+    adjacency = {i: sorted({t for s, t in edges if s == i}) for i in ids}
+
+    def paths(source, target):
+        found, queue = [], deque([[source]])
+        while queue:
+            path = queue.popleft()
+            if found and len(path) > len(found[0]):
+                break
+            if path[-1] == target:
+                found.append(path)
+                continue
+            queue.extend(path + [n] for n in adjacency[path[-1]] if n not in path)
+        return found
+
+    scores = dict.fromkeys(ids, 0.0)
+    for s, t in itertools.permutations(ids, 2):
+        shortest = paths(s, t)
+        for path in shortest:
+            for node in path[1:-1]:
+                scores[node] += 1 / len(shortest)
+    n = len(ids)
+    return [scores[i] / ((n - 1) * (n - 2)) for i in ids]
+
+GRAPH = (['a', 'b', 'c', 'd', 'e', 'f'],
+         [('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd'), ('d', 'e'), ('e', 'f'), ('f', 'd'), ('a', 'b')])
+
+def test_degree_and_pagerank():
+    topology = Topology(*GRAPH)
+    assert topology.edges == 7
+    degree = centrality.degree(topology)
+    assert degree['score'].tolist() == [2, 2, 2, 4, 2, 2]
+    rank = centrality.pagerank(topology)['score']
+    assert rank.sum() == pytest.approx(1.0)
+    assert rank.argmax() == topology.ids.index('d')
+
+def test_exact_betweenness_matches_brute_force():
+    topology = Topology(*GRAPH)
+    scores = centrality.betweenness(topology, samples=100, batch=4)['score']
+    assert scores.tolist() == pytest.approx(_brute_force_betweenness(*GRAPH))
+
+def test_endpoint_caches_per_graph_version_and_writes_back(app, client):
+    ids, edges = GRAPH
+    for component_id in ids:
+        client.post('/components', json={'id': component_id})
+    for source, target in set(edges):
+        client.post(f'/components/{source}/connect/{target}', json={})
+
+    body = client.get('/analysis/centrality?metric=degree&top=2').get_json()
+    assert body['top'][0] == {'id': 'd', 'score': 4.0, 'in': 3.0, 'out': 1.0} and len(body['top']) == 2
+    assert body['nodes'] == 6 and body['relationships'] == 7 and body['written'] is None
+
+    assert client.get('/analysis/centrality?metric=betweenness&write=true').get_json()['written'] is None
+    body = client.post('/analysis/centrality?metric=betweenness').get_json()
+    assert body['top'][0]['id'] == 'd' and body['written'] == 6
+    repo = app.extensions['component_repository']
+    assert repo.get_scores('d')['centrality_betweenness'] == body['top'][0]['score']
+    client.put('/components/d', json={'label': 'D'})
+    assert 'centrality_betweenness' in repo.get_scores('d')
+    client.delete('/components/e')
+    assert repo.get_scores('e') == {}
+    client.post('/components', json={'id': 'e'})
+    client.post('/components/d/connect/e', json={})
+    client.post('/components/e/connect/f', json={})
+
+    client.post('/components/f/connect/a', json={})
+    assert client.get('/analysis/centrality?metric=degree').get_json()['relationships'] == 8
+    assert client.get('/analysis/centrality?metric=closeness').status_code == 400
+
+def test_cache_follows_writes_of_other_processes(app, client):
+    for component_id in 'abc':
+        client.post('/components', json={'id': component_id})
+    client.post('/components/a/connect/b', json={})
+    assert client.get('/analysis/centrality?metric=degree').get_json()['relationships'] == 1
+
+    # Another worker writes to the shared database and its change log
+    app.extensions['component_repository'].connect_components('b', 'c', {})
+    app.extensions['change_log'].append([{'entity': 'relationship', 'op': 'create', 'key': 'b->c',
+                                          'data': {'source': 'b', 'target': 'c'}, 'ts': 0}])
+    assert client.get('/analysis/centrality?metric=degree').get_json()['relationships'] == 2
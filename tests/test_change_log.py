@@ -0,0 +1,181 @@
+import io
+import pytest
+from app.infrastructure.change_log import ChangeLogTruncated, MemoryChangeLog
+
+def test_api_mutations_are_read_back_in_order(client):
+    client.post('/components', json={'id': 'a', 'label': 'A'})
+    client.post('/components', json={'id': 'b', 'label': 'B'})
+    client.post('/components/a/connect/b', json={'type_of_relation': 'calls'})
+    client.put('/components/a', json={'label': 'A2'})
+    client.delete('/components/b')
+
+    page = client.get('/changes?since=0&limit=3').get_json()
+    assert [(c['seq'], c['entity'], c['op'], c['key']) for c in page['changes']] == [
+        (1, 'component', 'create', 'a'), (2, 'component', 'create', 'b'), (3, 'relationship', 'create', 'a->b')]
+    assert page['next'] == 3 and page['has_more'] and page['last_seq'] == 5
+
+    page = client.get(f"/changes?since={page['next']}").get_json()
+    assert [(c['op'], c['key']) for c in page['changes']] == [('update', 'a'), ('delete', 'b')]
+    assert page['changes'][0]['data']['label'] == 'A2'
+    assert not page['has_more']
+    assert client.get('/changes?since=5').get_json()['changes'] == []
+
+def test_failed_writes_are_not_logged(client):
+    client.post('/components', json={'id': 'a'})
+    client.post('/components', json={'id': 'a'})
+    client.put('/components/missing', json={'label': 'x'})
+    assert client.get('/changes').get_json()['last_seq'] == 1
+
+def test_compaction_keeps_latest_change_per_key():
+    log = MemoryChangeLog(retention=100, compact_every=3)
+    for i in range(5):
+        log.append([{'entity': 'component', 'op': 'update', 'key': 'a', 'data': {'n': i}, 'ts': 0}])
+    log.append([{'entity': 'component', 'op': 'delete', 'key': 'b', 'data': {}, 'ts': 0}])
+    log.compact(log.head() - 1)
+    page = log.read(0, 100)
+    assert [(c['seq'], c['key']) for c in page['changes']] == [(5, 'a'), (6, 'b')]
+    assert page['changes'][0]['data'] == {'n': 4}
+
+def test_retention_truncates_and_reports_gone(app, client):
+    log = MemoryChangeLog(retention=2, compact_every=10)
+    for key in 'abcd':
+        log.append([{'entity': 'component', 'op': 'create', 'key': key, 'data': {}, 'ts': 0}])
+    log.maintain()
+    with pytest.raises(ChangeLogTruncated) as e:
+        log.read(1, 10)
+    assert e.value.floor == 2
+    assert [c['key'] for c in log.read(2, 10)['changes']] == ['c', 'd']
+
+    app.extensions['change_log'] = log
+    response = client.get('/changes?since=0')
+    assert response.status_code == 410 and response.get_json()['oldest_since'] == 2
+
+def test_feed_can_be_disabled(app, client):
+    app.config['CHANGE_FEED'] = False
+    client.post('/components', json={'id': 'a'})
+    assert client.get('/changes').status_code == 404
+
+def test_imports_are_logged_per_row(client):
+    csv = 'id,label,component_type,category,location,technology,host,description,interface\n1,One,,,,,,,\n2,Two,,,,,,,\n'
+    client.post('/import-nodes-components', data={'file': (io.BytesIO(csv.encode()), 'nodes.csv')})
+    csv = 'id,label,component_type,category,location,technology,host,description,interface\n1,Uno,,,,,,,\n'
+    client.post('/import-nodes-components', data={'file': (io.BytesIO(csv.encode()), 'nodes.csv')}, query_string={'mode': 'sync', 'delete_missing': 'true'})
+    changes = client.get('/changes').get_json()['changes']
+    assert [(c['op'], c['key']) for c in changes] == [('create', '1'), ('create', '2'), ('update', '1'), ('delete', '2')]
+    assert 'content_hash' not in changes[2]['data']
+
+def test_compaction_keeps_deletes_that_drop_relationships():
+    log = MemoryChangeLog(retention=100, compact_every=10)
+    log.append([{'entity': 'component', 'op': 'create', 'key': 'x', 'data': {}, 'ts': 0},
+                {'entity': 'relationship', 'op': 'create', 'key': 'x->y', 'data': {'source': 'x', 'target': 'y'}, 'ts': 0},
+                {'entity': 'component', 'op': 'delete', 'key': 'x', 'data': {}, 'ts': 0},
+                {'entity': 'component', 'op': 'create', 'key': 'x', 'data': {}, 'ts': 0}])
+    log.compact(log.head())
+    assert [(c['op'], c['key']) for c in log.read(0, 10)['changes']] == [
+        ('create', 'x->y'), ('delete', 'x'), ('create', 'x')]
+
+def test_compaction_folds_partial_updates_into_the_survivor():
+    log = MemoryChangeLog(retention=100, compact_every=10)
+    log.append([{'entity': 'component', 'op': 'create', 'key': 'a', 'data': {'id': 'a', 'label': 'A', 'host': 'h1'}, 'ts': 0},
+                {'entity': 'relationship', 'op': 'create', 'key': 'a->b', 'data': {'source': 'a', 'target': 'b', 'type_of_relation': 'http'}, 'ts': 0},
+                {'entity': 'component', 'op': 'update', 'key': 'a', 'data': {'id': 'a', 'host': 'h2'}, 'ts': 0},
+                {'entity': 'relationship', 'op': 'update', 'key': 'a->b', 'data': {'source': 'a', 'target': 'b', 'weight': 2}, 'ts': 0},
+                {'entity': 'component', 'op': 'delete', 'key': 'c', 'data': {}, 'ts': 0},
+                {'entity': 'component', 'op': 'create', 'key': 'c', 'data': {'id': 'c'}, 'ts': 0},
+                {'entity': 'component', 'op': 'update', 'key': 'c', 'data': {'id': 'c', 'label': 'C'}, 'ts': 0}])
+    log.compact(log.head() - 1)
+    changes = log.read(0, 10)['changes']
+    assert [(c['op'], c['key'], c['data']) for c in changes] == [
+        ('update', 'a', {'id': 'a', 'label': 'A', 'host': 'h2'}),
+        ('update', 'a->b', {'source': 'a', 'target': 'b', 'type_of_relation': 'http', 'weight': 2}),
+        ('update', 'c', {'id': 'c', 'label': 'C'})]
+
+def test_changes_are_appended_in_the_write_transaction():
+    from contextlib import contextmanager
+    from app.infrastructure.graph_events import GraphVersion, ObservedRepository
+
+    class TransactionalRepo:
+        def __init__(self):
+            self.hook = None
+
+        @contextmanager
+        def recording(self, hook):
+            self.hook = hook
+            yield
+
+        def delete(self, component_id):
+            self.hook('tx', True)
+            return True
+
+    class Log(MemoryChangeLog):
+        def append(self, entries, tx=None):
+            if tx != 'tx':
+                raise AssertionError('appended outside the transaction')
+            return super().append(entries, tx)
+
+    log = Log()
+    published = []
+    log.add_listener(published.extend)
+    assert ObservedRepository(TransactionalRepo(), GraphVersion(), log).delete('a') is True
+    assert [(c['seq'], c['op'], c['key']) for c in published] == [(1, 'delete', 'a')]
+
+def test_failed_append_fails_the_write():
+    from app.infrastructure.graph_events import GraphVersion, ObservedRepository
+    from app.infrastructure.memory_repository import InMemoryComponentRepository
+    from app.domain.component import Component
+
+    class BrokenLog(MemoryChangeLog):
+        def append(self, entries, tx=None):
+            raise RuntimeError('log unavailable')
+
+    version = GraphVersion()
+    with pytest.raises(RuntimeError):
+        ObservedRepository(InMemoryComponentRepository(), version, BrokenLog()).create(Component(id='a'))
+    assert version.value == 1
+
+@pytest.mark.neo4j
+def test_neo4j_change_log_queries(app, client):
+    from app.infrastructure.change_log import Neo4jChangeLog
+    def entry(entity, op, key, **data):
+        return {'entity': entity, 'op': op, 'key': key, 'data': data, 'ts': 0}
+
+    with app.app_context():
+        log = Neo4jChangeLog(retention=100, compact_every=100)
+        assert log.head() == 0
+        assert log.append([
+            entry('component', 'create', 'a', id='a', host='h1'), entry('component', 'create', 'b', id='b'),
+            entry('relationship', 'create', 'a->b', source='a', target='b'),
+            entry('component', 'update', 'a', id='a', label='A2'),
+            entry('component', 'delete', 'b'), entry('component', 'create', 'b', id='b'),
+        ]) == 1
+        assert log.head() == 6
+        page = log.read(0, 4)
+        assert [(c['seq'], c['op'], c['key']) for c in page['changes']] == [
+            (1, 'create', 'a'), (2, 'create', 'b'), (3, 'create', 'a->b'), (4, 'update', 'a')]
+        assert page['changes'][2]['data'] == {'source': 'a', 'target': 'b'} and page['has_more']
+
+        # The delete of b stays: replaying it drops a->b
+        log.compact(6)
+        changes = log.read(0, 10)['changes']
+        assert [c['seq'] for c in changes] == [3, 4, 5, 6]
+        assert changes[1]['data'] == {'id': 'a', 'host': 'h1', 'label': 'A2'}
+        log.truncate(4)
+        with pytest.raises(ChangeLogTruncated):
+            log.read(0, 10)
+        assert [c['seq'] for c in log.read(4, 10)['changes']] == [5, 6]
+
+        # Entries staged in a write transaction are numbered after the commit, with any left
+        # pending by another process, in the order they were staged
+        left, mine = [entry('component', 'create', 'x', id='x')], [entry('component', 'create', 'y', id='y')]
+        log._write(lambda tx: log.append(left, tx))
+        log._write(lambda tx: log.append(mine, tx))
+        assert log.read(6, 10)['changes'] == [] and log.head() == 6
+        assert log.settle(mine) == (7, 8) and mine[0]['seq'] == 8 and 'seq' not in left[0]
+        assert [(c['seq'], c['key']) for c in log.read(6, 10)['changes']] == [(7, 'x'), (8, 'y')]
+        assert set(log.read(6, 10)['changes'][0]) == {'seq', 'ts', 'entity', 'op', 'key', 'data'}
+
+    # Writes through the API commit with their entries; a rejected write logs nothing
+    assert client.post('/components', json={'id': 'c'}).status_code == 201
+    assert client.post('/components', json={'id': 'c'}).status_code == 400
+    page = client.get('/changes?since=8').get_json()
+    assert [(c['seq'], c['op'], c['key']) for c in page['changes']] == [(9, 'create', 'c')]
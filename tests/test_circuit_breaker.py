@@ -0,0 +1,81 @@
+import pytest
+from neo4j.exceptions import ClientError, ServiceUnavailable
+from app.infrastructure import neo4j_driver
+from app.infrastructure.circuit_breaker import CircuitBreaker, DatabaseUnavailable
+
+def test_opens_after_consecutive_failures_and_recovers_after_a_trial(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('app.infrastructure.circuit_breaker.time.monotonic', lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    with pytest.raises(DatabaseUnavailable) as rejected:
+        breaker.before_call()
+    assert rejected.value.retry_after == 10
+
+    now[0] = 10
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(DatabaseUnavailable):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_failed_trial_reopens_the_circuit(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('app.infrastructure.circuit_breaker.time.monotonic', lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5)
+    breaker.record_failure()
+    now[0] = 5
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(DatabaseUnavailable):
+        breaker.before_call()
+
+def test_guarded_counts_only_connectivity_failures(monkeypatch):
+    monkeypatch.setattr(neo4j_driver, 'breaker', CircuitBreaker(failure_threshold=1, reset_timeout=30))
+    with pytest.raises(ClientError):
+        with neo4j_driver.guarded():
+            raise ClientError("syntax error")
+    assert neo4j_driver.breaker.state == CircuitBreaker.CLOSED
+
+    with pytest.raises(DatabaseUnavailable):
+        with neo4j_driver.guarded():
+            raise ServiceUnavailable("connection refused")
+    assert neo4j_driver.breaker.state == CircuitBreaker.OPEN
+    calls = []
+    with pytest.raises(DatabaseUnavailable):
+        with neo4j_driver.guarded():
+            calls.append(True)
+    assert calls == []
+
+def test_api_answers_503_with_retry_after(app, client):
+    with app.app_context():
+        from app.infrastructure.repository_factory import get_repository
+        repo = get_repository().wrapped
+
+    def unavailable():
+        raise DatabaseUnavailable("Neo4j unavailable", retry_after=7)
+    repo.get_all = unavailable
+    response = client.get('/components')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '7'
+
+def test_create_answers_503_while_the_circuit_is_open(app, client, monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    monkeypatch.setattr(neo4j_driver, 'breaker', breaker)
+    with app.app_context():
+        from app.infrastructure.repository_factory import get_repository
+        repo = get_repository().wrapped
+
+    def create(component):
+        with neo4j_driver.guarded():
+            raise AssertionError("the open circuit should reject the write")
+    repo.create = create
+    response = client.post('/components', json={'id': 'web', 'label': 'WebServer'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '30'
+    assert client.post('/components', json=['not', 'an', 'object']).status_code == 400
@@ -0,0 +1,48 @@
+import gzip
+import zlib
+from flask import Response, stream_with_context
+
+def _components(client, n):
+    for i in range(n):
+        client.post('/components', json={'id': f"c{i}", 'label': f"C{i}", 'location': 'Private Site'})
+
+def test_large_listing_is_gzipped(client):
+    _components(client, 50)
+    response = client.get('/components', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert int(response.headers['Content-Length']) == len(response.data)
+    plain = client.get('/components').data
+    assert gzip.decompress(response.data) == plain
+    assert len(response.data) < len(plain) / 4
+
+def test_small_or_unaccepted_responses_are_not_compressed(client):
+    assert 'Content-Encoding' not in client.get('/components/missing', headers={'Accept-Encoding': 'gzip'}).headers
+    _components(client, 50)
+    assert 'Content-Encoding' not in client.get('/components', headers={'Accept-Encoding': 'identity'}).headers
+    assert 'Content-Encoding' not in client.get('/components', headers={'Accept-Encoding': 'gzip;q=0'}).headers
+
+def test_streamed_response_is_compressed_incrementally(app, client):
+    chunks = [f"data: {i}\n\n" * 10 for i in range(5)]
+
+    @app.route('/test-stream')
+    def stream():
+        return Response(stream_with_context(iter(chunks)), mimetype='text/event-stream')
+
+    response = client.get('/test-stream', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    decoder = zlib.decompressobj(31)
+    body = response.iter_encoded()
+    first = decoder.decompress(next(body))
+    assert first == chunks[0].encode()
+    rest = b''.join(decoder.decompress(part) for part in body)
+    assert first + rest == ''.join(chunks).encode()
+    response.close()
+
+def test_compression_time_is_exported(client):
+    _components(client, 50)
+    client.get('/components', headers={'Accept-Encoding': 'gzip'})
+    metrics = client.get('/metrics').get_data(as_text=True)
+    assert 'http_response_compression_seconds_count{encoding="gzip"} 1' in metrics
+    assert 'http_response_compression_bytes_total{encoding="gzip",stage="in"}' in metrics
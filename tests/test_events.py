@@ -0,0 +1,88 @@
+import asyncio
+from app.infrastructure.event_broadcaster import Subscriber
+from app.interfaces.asgi_app import create_asgi_app
+
+def _change(key):
+    return [{'entity': 'component', 'op': 'create', 'key': key, 'data': {'id': key}, 'ts': 0}]
+
+async def _stream(app, on_open, headers=()):
+    """Open /events, run on_open(log) once the stream started, then disconnect and return the body."""
+    messages = []
+    disconnect = asyncio.Event()
+    started = asyncio.Event()
+
+    async def receive():
+        await disconnect.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+        started.set()
+
+    scope = {'type': 'http', 'method': 'GET', 'path': '/events', 'query_string': b'', 'headers': list(headers)}
+    task = asyncio.ensure_future(app(scope, receive, send))
+    await started.wait()
+    await on_open(app.repo.changes)
+    disconnect.set()
+    await task
+    assert messages[0]['status'] == 200
+    return b''.join(m.get('body', b'') for m in messages[1:]).decode()
+
+def test_changes_are_pushed_to_subscribers():
+    app = create_asgi_app({'REPOSITORY_BACKEND': 'memory', 'EVENTS_POLL_INTERVAL': 0.01})
+
+    async def scenario():
+        await app.startup()
+        app.repo.changes.append(_change('before'))
+
+        async def on_open(log):
+            log.append(_change('a'))
+            log.append(_change('b'))
+            await asyncio.sleep(0.1)
+        body = await _stream(app, on_open)
+        assert 'before' not in body
+        assert 'id: 2\nevent: change\n' in body and '"key":"b"' in body
+        assert app.broadcaster.subscribers == 0
+
+        async def nothing(log):
+            await asyncio.sleep(0.1)
+        body = await _stream(app, nothing, headers=[(b'last-event-id', b'1')])
+        assert [line for line in body.splitlines() if line.startswith('id:')] == ['id: 2', 'id: 3']
+    asyncio.run(scenario())
+
+def test_bulk_changes_are_pushed_as_resync():
+    app = create_asgi_app({'REPOSITORY_BACKEND': 'memory', 'EVENTS_POLL_INTERVAL': 0.01})
+
+    async def scenario():
+        await app.startup()
+
+        async def on_open(log):
+            log.append(_change('a'))
+            log.append([{'entity': 'component', 'op': 'delete_where', 'key': None, 'data': {'host': 'h1'}, 'ts': 0}])
+            await asyncio.sleep(0.1)
+        body = await _stream(app, on_open)
+        assert 'id: 1\nevent: change\n' in body and 'event: resync\ndata: {"seq":2}' in body
+        assert 'delete_where' not in body
+    asyncio.run(scenario())
+
+def test_slow_subscriber_gets_a_resync_marker():
+    async def scenario():
+        subscriber = Subscriber(maxsize=2)
+        for seq in range(1, 5):
+            subscriber.offer({'seq': seq})
+        assert subscriber.queue.get_nowait() == {'event': 'resync', 'seq': 3}
+        assert subscriber.queue.get_nowait() == {'seq': 4}
+        assert subscriber.resyncs == 1
+    asyncio.run(scenario())
+
+def test_subscriber_limit():
+    app = create_asgi_app({'REPOSITORY_BACKEND': 'memory', 'EVENTS_MAX_SUBSCRIBERS': 0})
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    async def scenario():
+        await app({'type': 'http', 'method': 'GET', 'path': '/events', 'query_string': b'', 'headers': []}, None, send)
+    asyncio.run(scenario())
+    assert messages[0]['status'] == 503
@@ -0,0 +1,68 @@
+from app.infrastructure import health
+from app.infrastructure.health import HealthProbe
+
+def test_probe_states():
+    outcomes = []
+
+    def check():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return {'pool': outcome}
+
+    probe = HealthProbe(check, interval=5, max_latency=1.0, failure_threshold=2)
+    assert probe.snapshot()['status'] == 'starting' and not probe.snapshot()['ready']
+
+    outcomes[:] = [{'in_use': 1}, ConnectionError('down'), ConnectionError('down'), {'in_use': 0}]
+    probe.run_once()
+    assert probe.snapshot()['ready'] and probe.snapshot()['details'] == {'pool': {'in_use': 1}}
+    probe.run_once()
+    assert probe.snapshot()['status'] == 'unstable' and probe.snapshot()['ready']
+    probe.run_once()
+    assert probe.snapshot()['status'] == 'failing' and not probe.snapshot()['ready']
+    probe.run_once()
+    assert probe.snapshot()['status'] == 'ok' and probe.snapshot()['consecutive_failures'] == 0
+
+def test_slow_and_stale_probes_are_not_ready(monkeypatch):
+    probe = HealthProbe(lambda: None, interval=5, max_latency=0)
+    probe.run_once()
+    assert probe.snapshot()['status'] == 'slow' and not probe.snapshot()['ready']
+
+    probe = HealthProbe(lambda: None, interval=5, max_latency=1)
+    probe.run_once()
+    now = health.time.time()
+    monkeypatch.setattr(health.time, 'time', lambda: now + 60)
+    assert probe.snapshot()['status'] == 'stale' and not probe.snapshot()['ready']
+
+def test_endpoints_answer_from_the_cached_probe(app, client):
+    app.config['HEALTH_PROBE_INTERVAL'] = 3600
+    with app.app_context():
+        probe = health.get_health_probe()
+    probe.stop()
+    probe._thread.join()
+    probe.run_once()
+    calls = []
+    probe.check = lambda: calls.append(True)
+    probe.start = lambda wait=False: None
+
+    assert client.get('/healthz').json['status'] == 'alive'
+    response = client.get('/readyz')
+    assert response.status_code == 200
+    assert response.json['details']['backend'] == 'memory'
+
+    probe._state = dict(probe._state, status='failing')
+    assert client.get('/readyz').status_code == 503
+    assert calls == []
+
+def test_start_can_wait_for_the_first_check():
+    probe = HealthProbe(lambda: {'pool': None}, interval=3600, max_latency=5)
+    probe.start(wait=True)
+    assert probe.snapshot()['status'] == 'ok'
+    probe.stop()
+
+def test_probe_starts_when_the_app_is_created():
+    from app import create_app
+    app = create_app({'REPOSITORY_BACKEND': 'memory', 'HEALTH_PROBE_INTERVAL': 3600})
+    probe = app.extensions['health_probe']
+    probe.stop()
+    assert probe._thread is not None
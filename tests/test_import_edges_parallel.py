@@ -0,0 +1,56 @@
+import io
+from app import services
+from app.infrastructure.memory_repository import InMemoryComponentRepository
+from app.services import _partition_edges, _write_edge_stream
+
+NODES = 'id,label\n' + ''.join(f'{i},Component {i}\n' for i in range(1, 41))
+
+def _edge(source, target):
+    return {'source': source, 'target': target, 'type_of_relation': 'CONNECTS_TO'}
+
+def test_partitions_never_share_nodes():
+    edges = [_edge(str(s), str(t)) for s in range(1, 30) for t in (str(s + 1), str(s + 2), 'hub')]
+    streams, shared = _partition_edges(edges, 4)
+
+    assert sum(len(s) for s in streams) + len(shared) == len(edges)
+    assert all(e in shared for e in edges if e['target'] == 'hub')
+    nodes_per_stream = [{n for e in stream for n in (e['source'], e['target'])} for stream in streams]
+    for i, a in enumerate(nodes_per_stream):
+        for b in nodes_per_stream[i + 1:]:
+            assert not a & b
+
+class TransientError(Exception):
+    def is_retryable(self):
+        return True
+
+class FlakyRepository(InMemoryComponentRepository):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def upsert_relationships(self, edges):
+        if self.failures:
+            self.failures -= 1
+            raise TransientError('deadlock detected')
+        return super().upsert_relationships(edges)
+
+def test_transient_batch_errors_are_retried(app, monkeypatch):
+    monkeypatch.setattr(services, 'EDGE_RETRY_BACKOFF', 0)
+    repo = FlakyRepository(failures=2)
+    repo.upsert_many([{'id': 'a'}, {'id': 'b'}])
+
+    summary = _write_edge_stream(repo, [_edge('a', 'b')], 10, app.logger, [])
+    assert summary['created'] == 1
+    assert summary['retries'] == 2
+
+def test_parallel_import(client):
+    client.post('/import-nodes-components', data={'file': (io.BytesIO(NODES.encode()), 'nodes.csv')})
+    rows = ''.join(f'{s},{";".join(str(t) for t in range(s + 1, min(s + 4, 41)))},CONNECTS_TO\n' for s in range(1, 40))
+    data = {'file': (io.BytesIO(('source,target,type_of_relation\n' + rows).encode()), 'edges.csv')}
+    response = client.post('/import-edges', data=data, query_string={'workers': 4})
+
+    assert response.status_code == 201
+    assert response.json['workers'] == 4
+    assert response.json['created'] == 114
+    assert response.json['errors'] == 0
+    assert response.json['parallel_edges'] + response.json['serial_edges'] == 114
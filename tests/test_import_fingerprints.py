@@ -0,0 +1,34 @@
+import hashlib
+import io
+from app.infrastructure.import_fingerprints import HashingStream, ImportFingerprintStore
+
+def test_hashing_stream_hashes_rereads_once():
+    content = b'source,target\n1,2\n2,3\n'
+    stream = HashingStream(io.BytesIO(content))
+    stream.readline()
+    stream.seek(0)
+    assert list(stream) == [b'source,target\n', b'1,2\n', b'2,3\n']
+    assert stream.hexdigest() == hashlib.sha256(content).hexdigest()
+
+def test_hashing_stream_completes_partial_reads():
+    content = b'id,label\n1,a\n'
+    stream = HashingStream(io.BytesIO(content))
+    stream.readline()
+    assert stream.hexdigest() == hashlib.sha256(content).hexdigest()
+    assert stream.tell() == len(b'id,label\n')
+
+def test_fingerprint_store_evicts_least_recently_used():
+    store = ImportFingerprintStore(ttl=60, max_entries=2)
+    store.put('a', 1, 0)
+    store.put('b', 2, 0)
+    store.get('a', 0)
+    store.put('c', 3, 0)
+    assert store.get('b', 0) is None
+    assert store.get('a', 0) == 1 and store.get('c', 0) == 3
+
+def test_fingerprint_store_only_replays_in_the_recorded_state():
+    store = ImportFingerprintStore()
+    store.put('a', 1, 5)
+    store.put('b', 2, None)
+    assert store.get('a', 6) is None and store.get('a', 5) == 1
+    assert store.get('b', None) is None
@@ -0,0 +1,122 @@
+import io
+import os
+import uuid
+import pytest
+from app import services
+
+class FakeServerRepository:
+    """Stands in for Neo4j: reads the staged file from the shared import directory."""
+    def __init__(self, import_dir, readable=True):
+        self.import_dir = import_dir
+        self.readable = readable
+        self.calls = []
+
+    def _path(self, url):
+        return os.path.join(self.import_dir, url[len('file:///'):])
+
+    def can_load_csv(self, url):
+        return self.readable and os.path.exists(self._path(url))
+
+    def load_csv_components(self, url, delimiter, on_conflict, batch_size):
+        with open(self._path(url), 'rb') as f:
+            rows = f.read().decode().splitlines()[1:]
+        self.calls.append(('nodes', delimiter, on_conflict))
+        return {'rows': len(rows), 'created': len(rows) - 1}
+
+    def load_csv_edges(self, url, delimiter, source_idx, target_idx, type_idx, batch_size):
+        self.calls.append(('edges', delimiter, source_idx, target_idx, type_idx))
+        return {'rows': 3, 'matched': 2, 'created': 1}
+
+    def close(self):
+        self.closed = True
+
+def _post(client, path, content, **params):
+    return client.post(path, data={'file': (io.BytesIO(content.encode()), 'file.csv')}, query_string=params)
+
+def test_load_csv_stages_file_and_cleans_up(client, app, tmp_path, monkeypatch):
+    app.config['NEO4J_IMPORT_DIR'] = str(tmp_path)
+    repo = FakeServerRepository(str(tmp_path))
+    monkeypatch.setattr(services, 'get_repository', lambda: repo)
+
+    response = _post(client, '/import-nodes-components', 'id;label\n1;a\n2;b\n', engine='load_csv')
+    assert response.json == {'created': 1, 'updated': 0, 'skipped': 1, 'errors': 0, 'rows': 2, 'engine': 'load_csv'}
+
+    response = _post(client, '/import-edges', 'type_of_relation\tsource\ttarget\nX\t1\t2;3\n', engine='load_csv')
+    assert response.json['created'] == 1 and response.json['updated'] == 1 and response.json['errors'] == 1
+
+    assert repo.calls == [('nodes', ';', 'skip'), ('edges', '\t', 1, 2, 0)]
+    assert os.listdir(tmp_path) == []
+
+def test_load_csv_falls_back_to_python(client):
+    response = _post(client, '/import-nodes-components', 'id,label\n1,a\n', engine='load_csv')
+    assert response.status_code == 201
+    assert response.json['engine'] == 'python'
+    assert response.json['created'] == 1
+
+def test_fallback_closes_the_repository(client, app, tmp_path, monkeypatch):
+    repo = FakeServerRepository(str(tmp_path))
+    monkeypatch.setattr(services, 'get_repository', lambda: repo)
+    response = _post(client, '/import-edges', 'source,target\n1,2\n', engine='load_csv')
+    assert response.json['engine'] == 'python'
+    assert repo.closed and repo.calls == []
+
+def test_invalid_engine(client):
+    assert _post(client, '/import-edges', 'source,target\n1,2\n', engine='bogus').status_code == 400
+
+@pytest.fixture
+def import_dir():
+    path = os.environ.get('NEO4J_IMPORT_DIR')
+    if not path or not os.path.isdir(path):
+        pytest.skip("needs NEO4J_IMPORT_DIR shared with the Neo4j server")
+    before = set(os.listdir(path))
+    yield path
+    for name in set(os.listdir(path)) - before:
+        os.remove(os.path.join(path, name))
+
+def _stage(import_dir, content):
+    name = f"test-{uuid.uuid4().hex}.csv"
+    with open(os.path.join(import_dir, name), 'w', encoding='utf-8') as f:
+        f.write(content)
+    return f"file:///{name}"
+
+@pytest.mark.neo4j
+def test_neo4j_load_csv_queries(neo4j_repo, import_dir):
+    url = _stage(import_dir, 'id;label;component_type;category;location;technology;host\na;A;;;;;h1\nb;B;;;;;\n;sin id;;;;;\n')
+    assert neo4j_repo.can_load_csv(url)
+    assert not neo4j_repo.can_load_csv('file:///missing.csv')
+    assert neo4j_repo.load_csv_components(url, ';', 'skip', 1) == {'rows': 2, 'created': 2}
+
+    url = _stage(import_dir, 'id,label\na,A2\nc,C\n')
+    assert neo4j_repo.load_csv_components(url, ',', 'update', 1000) == {'rows': 2, 'created': 1}
+    component = neo4j_repo.get_by_id('a')
+    assert (component.label, component.host) == ('A2', 'h1')
+
+    url = _stage(import_dir, 'source,target,type_of_relation\na,b;x,calls\n,c,calls\nc,a,\n')
+    assert neo4j_repo.load_csv_edges(url, ',', 0, 1, 2, 1) == {'rows': 3, 'matched': 2, 'created': 2}
+    assert neo4j_repo.count_relationships() == 2
+    url = _stage(import_dir, 'source,target\na,b\n')
+    assert neo4j_repo.load_csv_edges(url, ',', 0, 1, -1, 1) == {'rows': 1, 'matched': 1, 'created': 0}
+
+@pytest.mark.neo4j
+def test_neo4j_load_csv_edges_match_the_python_import(client, app, neo4j_repo, import_dir):
+    from app.domain.component import Component
+    app.config['NEO4J_IMPORT_DIR'] = import_dir
+    for component_id in 'abc':
+        neo4j_repo.create(Component(id=component_id, label=component_id.upper()))
+    # BOM before the header, empty type, several targets and a missing endpoint
+    content = '\ufeffsource,target,type_of_relation\na,b;c,calls\nb,c,\nc,x,calls\n,a,calls\n'
+
+    def relationships():
+        return neo4j_repo._read(lambda tx: sorted(
+            (r["source"], r["target"], r["type"]) for r in tx.run(
+                "MATCH (s:Component)-[r:CONNECTS_TO]->(t:Component) RETURN s.id AS source, t.id AS target, r.type_of_relation AS type")
+        ))
+
+    outcomes = []
+    for engine in ('python', 'load_csv'):
+        response = _post(client, '/import-edges', content, engine=engine, force='true')
+        assert response.json['engine'] == engine
+        outcomes.append(({key: response.json[key] for key in ('created', 'updated', 'errors')}, relationships()))
+        neo4j_repo._write(lambda tx: tx.run("MATCH (:Component)-[r:CONNECTS_TO]->(:Component) DELETE r").consume())
+    assert outcomes[0] == outcomes[1]
+    assert outcomes[0][1] == [('a', 'b', 'calls'), ('a', 'c', 'calls'), ('b', 'c', 'CONNECTS_TO')]
@@ -0,0 +1,57 @@
+import io
+import os
+
+def _upload_edges(client, rows, **params):
+    data = {'file': (io.BytesIO(('source,target,type_of_relation\n' + ''.join(rows)).encode()), 'edges.csv')}
+    return client.post('/import-edges', data=data, query_string=params)
+
+def test_import_returns_summary_and_pages_details(client, app):
+    app.config['IMPORT_RESULT_MAX_ERRORS'] = 2
+    nodes = 'id,label\n' + ''.join(f'{i},Component {i}\n' for i in range(5))
+    client.post('/import-nodes-components', data={'file': (io.BytesIO(nodes.encode()), 'nodes.csv')})
+
+    rows = ['0,1;2;3;4,CONNECTS_TO\n', '0,x;y;z,CONNECTS_TO\n']
+    response = _upload_edges(client, rows)
+    result = response.json
+    assert 'details' not in result
+    assert result['created'] == 4 and result['errors'] == 3
+    assert result['rows'] == 7
+    assert len(result['first_errors']) == 2
+
+    page = client.get(f"/import-results/{result['result_id']}", query_string={'status': 'error', 'limit': 2}).json
+    assert [row['target'] for row in page['items']] == ['x', 'y']
+    page = client.get(f"/import-results/{result['result_id']}", query_string={'status': 'error', 'after': page['next']}).json
+    assert [row['target'] for row in page['items']] == ['z']
+    assert page['next'] is None
+
+    created = client.get(f"/import-results/{result['result_id']}", query_string={'status': 'created'}).json
+    assert len(created['items']) == 4
+
+def test_full_details_inline(client):
+    nodes = 'id,label\n1,a\n2,b\n'
+    response = client.post('/import-nodes-components', data={'file': (io.BytesIO(nodes.encode()), 'nodes.csv')}, query_string={'details': 'full'})
+    assert [row['status'] for row in response.json['details']] == ['created', 'created']
+    assert 'result_id' not in response.json
+
+def test_unknown_result(client):
+    assert client.get('/import-results/../../etc/passwd').status_code == 404
+    assert client.get('/import-results/' + '0' * 32).status_code == 404
+
+def test_pages_seek_to_their_chunk(tmp_path):
+    from app.infrastructure.import_results import ImportResultStore
+    store = ImportResultStore(str(tmp_path), chunk_rows=10)
+    writer = store.create_writer()
+    writer.extend({'status': 'error' if i % 7 == 0 else 'created', 'row': i} for i in range(35))
+    writer.close()
+    assert sorted(os.listdir(tmp_path)) == [f'{writer.result_id}.idx.json', f'{writer.result_id}.jsonl.gz']
+
+    page = store.read_page(writer.result_id, after=18, limit=3)
+    assert [row['row'] for row in page['items']] == [19, 20, 21] and page['next'] == 21
+    page = store.read_page(writer.result_id, status='error', after=page['next'])
+    assert [row['row'] for row in page['items']] == [28] and page['next'] is None
+    seqs, after = [], -1
+    while after is not None:
+        page = store.read_page(writer.result_id, after=after, limit=4)
+        seqs += [row['seq'] for row in page['items']]
+        after = page['next']
+    assert seqs == list(range(35))
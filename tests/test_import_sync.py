@@ -0,0 +1,125 @@
+import io
+import pytest
+from app.domain.component import Component
+
+HEADER = 'id,label,component_type,category,location,technology,host,description,interface\n'
+
+def _upload(client, rows, **params):
+    data = {'file': (io.BytesIO((HEADER + ''.join(rows)).encode('utf-8')), 'nodes.csv')}
+    return client.post('/import-nodes-components', data=data, query_string=params)
+
+def test_sync_only_writes_changed_rows(client):
+    rows = [f'{i},Component {i},Logico,Api,Private Site,python,Principal,,http\n' for i in range(1, 11)]
+    response = _upload(client, rows, mode='sync')
+    assert response.status_code == 201
+    assert response.json['created'] == 10
+
+    response = _upload(client, rows, mode='sync', force='true')
+    assert response.json['created'] == 0
+    assert response.json['updated'] == 0
+    assert response.json['unchanged'] == 10
+
+    rows[3] = '4,Renamed,Logico,Api,Private Site,python,Principal,,http\n'
+    response = _upload(client, rows[:-1], mode='sync', delete_missing='true')
+    assert response.json['updated'] == 1
+    assert response.json['unchanged'] == 8
+    assert response.json['deleted'] == 1
+    assert client.get('/components/4').json['label'] == 'Renamed'
+    assert client.get('/components/10').status_code == 404
+
+def test_sync_rewrites_rows_edited_through_the_api(client):
+    rows = ['1,Component 1,Logico,Api,Private Site,python,Principal,,http\n']
+    _upload(client, rows, mode='sync')
+    client.put('/components/1', json={'label': 'Edited'})
+
+    response = _upload(client, rows, mode='sync')
+    assert response.json['updated'] == 1
+    assert client.get('/components/1').json['label'] == 'Component 1'
+
+def test_invalid_mode(client):
+    assert _upload(client, [], mode='bogus').status_code == 400
+
+def test_identical_upload_is_replayed(client):
+    rows = ['1,Component 1,Logico,Api,Private Site,python,Principal,,http\n']
+    first = _upload(client, rows)
+    assert first.json['created'] == 1
+    assert 'X-Import-Replayed' not in first.headers
+
+    replayed = _upload(client, rows)
+    assert replayed.headers['X-Import-Replayed'] == 'true'
+    assert replayed.json == first.json
+
+    forced = _upload(client, rows, force='true')
+    assert 'X-Import-Replayed' not in forced.headers
+    assert forced.json['skipped'] == 1
+
+    other_mode = _upload(client, rows, mode='sync')
+    assert 'X-Import-Replayed' not in other_mode.headers
+
+def test_api_writes_invalidate_recorded_imports(client):
+    rows = ['1,Component 1,Logico,Api,Private Site,python,Principal,,http\n']
+    _upload(client, rows)
+    client.delete('/components/1')
+
+    response = _upload(client, rows)
+    assert 'X-Import-Replayed' not in response.headers
+    assert response.json['created'] == 1
+
+def test_other_imports_invalidate_recorded_imports(client):
+    first = ['1,First,Logico,Api,Private Site,python,Principal,,http\n']
+    _upload(client, first, on_conflict='update')
+    _upload(client, ['1,Second,,,,,,,\n'], on_conflict='update')
+
+    response = _upload(client, first, on_conflict='update')
+    assert 'X-Import-Replayed' not in response.headers
+    assert client.get('/components/1').json['label'] == 'First'
+
+def test_writes_from_other_processes_invalidate_recorded_imports(app, client):
+    rows = ['1,Component 1,Logico,Api,Private Site,python,Principal,,http\n']
+    _upload(client, rows)
+    # Another worker sharing the change log
+    app.extensions['change_log'].append([{'entity': 'component', 'op': 'delete', 'key': '1', 'data': {}, 'ts': 0}])
+    assert 'X-Import-Replayed' not in _upload(client, rows).headers
+
+def test_on_conflict_policies(client):
+    _upload(client, ['1,Original,Logico,Api,Private Site,python,Principal,keep me,http\n'])
+    corrected = ['1,Corrected,,,,,,,\n', '2,New,Logico,Api,Private Site,python,Principal,,http\n']
+
+    response = _upload(client, corrected, on_conflict='error')
+    assert response.json['created'] == 1
+    assert response.json['errors'] == 1
+    assert client.get('/components/1').json['label'] == 'Original'
+
+    response = _upload(client, corrected, on_conflict='update')
+    assert response.json['updated'] == 2
+    component = client.get('/components/1').json
+    assert component['label'] == 'Corrected'
+    assert component['description'] == 'keep me'
+
+    response = _upload(client, corrected, on_conflict='replace')
+    assert response.json['updated'] == 2
+    component = client.get('/components/1').json
+    assert component['label'] == 'Corrected'
+    assert component['description'] == ''
+
+    assert _upload(client, corrected, on_conflict='bogus').status_code == 400
+
+@pytest.mark.neo4j
+def test_neo4j_merge_policies_and_unique_ids(neo4j_repo):
+    neo4j_repo.create(Component(id='a', label='A', host='h1'))
+    assert neo4j_repo.merge_components([{'id': 'a', 'label': 'Other'}], 'skip') == [False]
+    assert neo4j_repo.get_by_id('a').label == 'A'
+
+    assert neo4j_repo.merge_components([{'id': 'a', 'label': '', 'host': 'h2'}, {'id': 'b', 'label': 'B'}], 'update') == [False, True]
+    component = neo4j_repo.get_by_id('a')
+    assert (component.label, component.host) == ('A', 'h2')
+
+    assert neo4j_repo.merge_components([{'id': 'a', 'label': 'New'}], 'replace') == [False]
+    component = neo4j_repo.get_by_id('a')
+    assert (component.label, component.host) == ('New', '')
+    assert neo4j_repo.count() == 2
+
+    with pytest.raises(ValueError):
+        neo4j_repo.create(Component(id='a'))
+    with pytest.raises(ValueError):
+        neo4j_repo.merge_components([{'id': 'c'}], 'bogus')
@@ -0,0 +1,29 @@
+import json
+import pytest
+from app import create_app
+from app.domain.component import Component
+from app.interfaces import json_provider
+from app.interfaces.json_provider import OrjsonProvider, dumps
+
+def test_default_serializer_uses_orjson_when_installed(app):
+    if json_provider.orjson is None:
+        pytest.skip("orjson not installed")
+    assert isinstance(app.json, OrjsonProvider)
+
+@pytest.mark.parametrize('serializer', ['stdlib', 'auto'])
+def test_component_listing_is_identical_across_serializers(tmp_path, serializer):
+    app = create_app({'TESTING': True, 'REPOSITORY_BACKEND': 'memory', 'JSON_SERIALIZER': serializer,
+                      'IMPORT_RESULTS_DIR': str(tmp_path)})
+    client = app.test_client()
+    client.post('/components', json={'id': 'c1', 'label': 'Núcleo', 'location': 'Private Site'})
+    response = client.get('/components')
+    assert response.status_code == 200
+    assert response.get_json() == [Component(id='c1', label='Núcleo', location='Private Site').to_dict()]
+
+def test_unknown_serializer_is_rejected():
+    with pytest.raises(ValueError):
+        create_app({'JSON_SERIALIZER': 'yaml'})
+
+def test_dumps_serializes_components_without_to_dict():
+    payload = dumps({'items': [Component(id='c1', label='API')], 1: 'non-string key'})
+    assert json.loads(payload) == {'items': [Component(id='c1', label='API').to_dict()], '1': 'non-string key'}
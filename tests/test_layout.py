@@ -0,0 +1,61 @@
+import numpy as np
+from app.infrastructure import layout
+from app.infrastructure.centrality import Topology
+
+def _random_topology(n, m, seed=0):
+    rng = np.random.default_rng(seed)
+    ids = [str(i) for i in range(n)]
+    return Topology(ids, [(ids[s], ids[t]) for s, t in rng.integers(0, n, (m, 2))])
+
+def test_hierarchical_layers_follow_relationships():
+    topology = Topology(['a', 'b', 'c', 'd'], [('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd'), ('a', 'd')])
+    positions = layout.compute_layout(topology, 'auto')
+    y = dict(zip(topology.ids, positions[:, 1]))
+    assert y['a'] > y['b'] == y['c'] > y['d']
+    assert positions[1, 0] != positions[2, 0]
+
+def test_force_layout_spreads_nodes():
+    topology = _random_topology(300, 600)
+    positions = layout.compute_layout(topology, 'force')
+    assert np.isfinite(positions).all()
+    assert len({tuple(p) for p in positions.round(3).tolist()}) == 300
+
+def test_grid_repulsion_approximates_exact_forces():
+    pos = np.random.default_rng(1).uniform(0, 40, (1500, 2))
+    exact = layout._pairwise_repulsion(pos, pos, None, 1.0)
+    approximate = layout._grid_repulsion(pos, 1.0)
+    error = np.linalg.norm(approximate - exact, axis=1) / np.linalg.norm(exact, axis=1)
+    assert np.median(error) < 0.05
+
+def test_endpoint_caches_and_relaxes_incrementally(client):
+    for i in range(12):
+        client.post('/components', json={'id': f'n{i}', 'host': 'edge' if i < 4 else 'core'})
+    for i in range(11):
+        client.post(f'/components/n{i}/connect/n{i + 1}', json={})
+    client.post('/components/n11/connect/n0', json={})
+
+    body = client.get('/layout?algorithm=force').get_json()
+    assert len(body['nodes']) == 12 and len(body['edges']) == 12 and body['incremental'] is False
+    assert client.get('/layout?algorithm=force').get_json() == body
+    before = {node['id']: (node['x'], node['y']) for node in body['nodes']}
+
+    client.post('/components', json={'id': 'n12', 'host': 'core'})
+    client.post('/components/n12/connect/n6', json={})
+    body = client.get('/layout?algorithm=force').get_json()
+    after = {node['id']: (node['x'], node['y']) for node in body['nodes']}
+    assert body['incremental'] is True and len(after) == 13
+    assert after['n0'] == before['n0'] and after['n1'] == before['n1']
+    assert after['n6'] != before['n6']
+
+def test_filtered_subgraph_and_validation(client):
+    for i in range(6):
+        client.post('/components', json={'id': f'n{i}', 'host': 'edge' if i < 3 else 'core'})
+    for i in range(5):
+        client.post(f'/components/n{i}/connect/n{i + 1}', json={})
+
+    body = client.get('/layout?host=edge').get_json()
+    assert sorted(node['id'] for node in body['nodes']) == ['n0', 'n1', 'n2']
+    assert sorted(body['edges']) == [['n0', 'n1'], ['n1', 'n2']]
+    ys = {node['id']: node['y'] for node in body['nodes']}
+    assert ys['n0'] > ys['n1'] > ys['n2']
+    assert client.get('/layout?algorithm=spring').status_code == 400
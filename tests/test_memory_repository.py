@@ -0,0 +1,67 @@
+import io
+import os
+import threading
+from app.domain.component import Component
+from app.domain.component_repository import ComponentRepository
+from app.infrastructure.memory_repository import InMemoryComponentRepository
+
+CSV_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'csv')
+
+def _component(id, **kwargs):
+    return Component(id=id, label=kwargs.pop('label', f'Component {id}'), **kwargs)
+
+def test_implements_repository_port():
+    assert isinstance(InMemoryComponentRepository(), ComponentRepository)
+
+def test_find_by_uses_attribute_index():
+    repo = InMemoryComponentRepository()
+    repo.create(_component('1', location='Private Site', category='Api'))
+    repo.create(_component('2', location='Private Site', category='WebSite'))
+    repo.create(_component('3', location='Public Site', category='Api'))
+
+    assert {c.id for c in repo.find_by(location='Private Site')} == {'1', '2'}
+    assert [c.id for c in repo.find_by(location='Private Site', category='Api')] == ['1']
+
+    repo.update('2', {'location': 'Public Site'})
+    assert {c.id for c in repo.find_by(location='Public Site')} == {'2', '3'}
+
+def test_delete_detaches_relationships():
+    repo = InMemoryComponentRepository()
+    for cid in ('1', '2', '3'):
+        repo.create(_component(cid))
+    assert repo.upsert_relationship('1', '2', {'type_of_relation': 'CONNECTS_TO'}) == 'created'
+    assert repo.upsert_relationship('1', '2', {'type_of_relation': 'USES'}) == 'updated'
+    assert repo.upsert_relationship('2', '3', {}) == 'created'
+    assert repo.upsert_relationship('2', 'missing', {}) is None
+    assert repo.get_relationships('2')['incoming'] == {'1': {'type_of_relation': 'USES'}}
+
+    assert repo.delete('2')
+    assert repo.count_relationships() == 0
+    assert repo.get_relationships('1')['outgoing'] == {}
+
+def test_concurrent_creates():
+    repo = InMemoryComponentRepository()
+
+    def worker(offset):
+        for i in range(200):
+            repo.create(_component(f'{offset}-{i}', host='h1'))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert repo.count() == 1600
+    assert len(repo.find_by(host='h1')) == 1600
+
+def test_import_pipeline_without_neo4j(client):
+    with open(os.path.join(CSV_DIR, 'nodes_clean.csv'), 'rb') as f:
+        response = client.post('/import-nodes-components', data={'file': (io.BytesIO(f.read()), 'nodes.csv')})
+    assert response.status_code == 201
+    assert response.json['created'] == 26
+
+    with open(os.path.join(CSV_DIR, 'edges_multiple_targets.csv'), 'rb') as f:
+        response = client.post('/import-edges', data={'file': (io.BytesIO(f.read()), 'edges.csv')})
+    assert response.status_code == 201
+    assert response.json['created'] == 9
+    assert response.json['errors'] == 0
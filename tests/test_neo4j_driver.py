@@ -0,0 +1,26 @@
+from app.infrastructure import neo4j_driver
+
+class FakeDriver:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def test_driver_is_recreated_after_fork(monkeypatch):
+    monkeypatch.setattr(neo4j_driver, '_create_driver', FakeDriver)
+    monkeypatch.setattr(neo4j_driver, '_driver', None)
+    monkeypatch.setattr(neo4j_driver, '_driver_pid', None)
+
+    monkeypatch.setattr(neo4j_driver.os, 'getpid', lambda: 100)
+    parent = neo4j_driver.get_driver()
+    assert neo4j_driver.get_driver() is parent
+
+    monkeypatch.setattr(neo4j_driver.os, 'getpid', lambda: 200)
+    child = neo4j_driver.get_driver()
+    assert child is not parent
+    assert not parent.closed
+
+    neo4j_driver.close_driver()
+    assert child.closed
+    assert neo4j_driver._driver is None
@@ -93,3 +93,20 @@ def test_delete_component(client):
     # Verify it's gone
     get_response = client.get(f'/components/{component_id}')
     assert get_response.status_code == 404
+
+def test_purge_components_by_filter(client, app):
+    app.config['PURGE_BATCH_SIZE'] = 2
+    for i in range(5):
+        client.post('/components', json={'id': f'p{i}', 'label': f'P{i}', 'location': 'Private Site'})
+    client.post('/components', json={'id': 'pub', 'label': 'Pub', 'location': 'Public Site'})
+    client.post('/components/pub/connect/p0', json={'connection_type': 'http'})
+
+    response = client.delete('/components', query_string={'location': 'Private Site', 'dry_run': 'true'})
+    assert response.json == {'matched': 5, 'deleted': 0, 'batches': 3, 'dry_run': True}
+    assert client.get('/components/p0').status_code == 200
+
+    response = client.delete('/components', query_string={'location': 'Private Site'})
+    assert response.json == {'matched': 5, 'deleted': 5, 'batches': 3, 'dry_run': False}
+    assert [c['id'] for c in client.get('/components').json] == ['pub']
+
+    assert client.delete('/components').status_code == 400
@@ -0,0 +1,52 @@
+import pytest
+from app.domain.component import Component
+from app.domain.component_search import highlight, search_terms
+from app.infrastructure.memory_repository import InMemoryComponentRepository
+
+def _repo():
+    repo = InMemoryComponentRepository()
+    repo.create(Component(id='1', label='Token Service', technology='python', description='Emite tokens de sesión'))
+    repo.create(Component(id='2', label='AuthTokenCache', technology='redis', host='cache01'))
+    repo.create(Component(id='3', label='Gestión de pagos', technology='java', description='Integración con el banco'))
+    return repo
+
+def test_ranking_prefers_whole_words_then_prefixes_then_infixes():
+    repo = _repo()
+    assert [c.id for c, _ in repo.search(search_terms('token'), 0, 10)] == ['1', '2']
+    assert [c.id for c, _ in repo.search(search_terms('GESTION pagos'), 0, 10)] == ['3']
+    assert repo.search(search_terms('token java'), 0, 10) == []
+    assert [c.id for c, _ in repo.search(search_terms('token'), 1, 10)] == ['2']
+
+def test_index_follows_updates_and_deletes():
+    repo = _repo()
+    repo.update('1', {'label': 'Session Service', 'description': ''})
+    assert [c.id for c, _ in repo.search(['token'], 0, 10)] == ['2']
+    repo.delete('2')
+    assert repo.search(['token'], 0, 10) == []
+
+def test_highlights_are_escaped_and_accent_insensitive():
+    component = Component(id='x', label='Gestión <de> Gestion', host='h')
+    assert highlight(component, search_terms('gestion')) == {'label': '<em>Gestión</em> &lt;de&gt; <em>Gestion</em>'}
+
+def test_search_endpoint_pages_and_highlights(client):
+    for i, label in enumerate(['Token API', 'Token Worker', 'Tokenizer', 'Billing']):
+        client.post('/components', json={'id': str(i), 'label': label})
+    page = client.get('/components/search?q=token&limit=2').get_json()
+    assert [item['component']['id'] for item in page['items']] == ['0', '1']
+    assert page['items'][0]['highlights'] == {'label': '<em>Token</em> API'}
+    assert page['next'] == 2
+    page = client.get('/components/search?q=token&offset=2&limit=2').get_json()
+    assert [item['component']['id'] for item in page['items']] == ['2'] and page['next'] is None
+    assert client.get('/components/search').status_code == 400
+
+@pytest.mark.neo4j
+def test_neo4j_full_text_index_matches_like_the_memory_index(neo4j_repo):
+    for component in _repo().get_all():
+        neo4j_repo.create(component)
+    assert [c.id for c, _ in neo4j_repo.search(search_terms('token'), 0, 10)] == ['1', '2']
+    assert [c.id for c, _ in neo4j_repo.search(search_terms('GESTION pagos'), 0, 10)] == ['3']
+    assert [c.id for c, _ in neo4j_repo.search(search_terms('cache'), 0, 10)] == ['2']
+    assert neo4j_repo.search(search_terms('token java'), 0, 10) == []
+    hits = neo4j_repo.search(search_terms('token'), 0, 10)
+    assert hits[0][1] > hits[1][1]
+    assert [c.id for c, _ in neo4j_repo.search(search_terms('token'), 1, 10)] == ['2']
@@ -0,0 +1,52 @@
+import pytest
+
+def _component(client, cid, **attrs):
+    client.post('/components', json={'id': cid, 'label': cid.upper(), **attrs})
+
+def test_stats(client):
+    _component(client, 'a', location='Private Site', category='Api')
+    _component(client, 'b', location='Private Site', category='Db')
+    _component(client, 'c', location='Public Site', category='Api')
+    _component(client, 'd', location='Public Site', category='Api')
+    client.post('/components/a/connect/b', json={'type_of_relation': 'USES'})
+    client.post('/components/c/connect/b', json={'type_of_relation': 'USES'})
+    client.post('/components/a/connect/c', json={})
+
+    stats = client.get('/stats').json
+    assert stats['nodes'] == {'total': 4, 'by_label': {'Component': 4}}
+    assert stats['attributes']['location'] == {'Private Site': 2, 'Public Site': 2}
+    assert stats['relationships'] == {'total': 3, 'by_type': {'CONNECTS_TO': 3}, 'by_type_of_relation': {'USES': 2, '': 1}}
+    assert stats['degree_distribution'] == [{'degree': 0, 'nodes': 1}, {'degree': 2, 'nodes': 3}]
+    assert stats['top_hubs']['in'][0] == {'id': 'b', 'label': 'B', 'degree': 2}
+    assert stats['top_hubs']['out'][0] == {'id': 'a', 'label': 'A', 'degree': 2}
+    assert stats['orphans'] == {'count': 1, 'ids': ['d']}
+
+def test_stats_cached_until_graph_changes(client, app):
+    _component(client, 'a')
+    first = client.get('/stats').json
+    calls = []
+    repo = app.extensions['component_repository']
+    original = repo.graph_stats
+    repo.graph_stats = lambda top: calls.append(top) or original(top)
+
+    assert client.get('/stats').json == first
+    assert calls == []
+
+    _component(client, 'b')
+    second = client.get('/stats').json
+    assert second['nodes']['total'] == 2
+    assert second['graph_version'] > first['graph_version']
+    assert calls == [10]
+
+def test_stats_cli(app):
+    result = app.test_cli_runner().invoke(args=['graph-stats', '--top', '3'])
+    assert result.exit_code == 0
+    assert '"nodes"' in result.output
+
+@pytest.mark.neo4j
+def test_neo4j_stats_count_only_component_nodes(client, neo4j_repo):
+    # The writes also leave change log nodes in the database
+    _component(client, 'a')
+    _component(client, 'b')
+    client.put('/components/a', json={'label': 'A2'})
+    assert neo4j_repo.graph_stats()['nodes'] == {'total': 2, 'by_label': {'Component': 2}}
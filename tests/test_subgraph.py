@@ -0,0 +1,46 @@
+import pytest
+
+def _site(client):
+    for i, location in enumerate(['private', 'private', 'private', 'public', 'public']):
+        client.post('/components', json={'id': f'c{i}', 'location': location, 'category': 'app'})
+    for source, target in [('c0', 'c1'), ('c1', 'c2'), ('c2', 'c0'), ('c2', 'c3'), ('c4', 'c1'), ('c3', 'c4')]:
+        client.post(f'/components/{source}/connect/{target}', json={'type_of_relation': 'http'})
+
+def test_subgraph_returns_matching_nodes_and_edges_among_them(client):
+    _site(client)
+    body = client.get('/subgraph?location=private&category=app').get_json()
+    assert [node['id'] for node in body['nodes']] == ['c0', 'c1', 'c2']
+    assert sorted((e['source'], e['target']) for e in body['edges']) == [('c0', 'c1'), ('c1', 'c2'), ('c2', 'c0')]
+    assert body['edges'][0]['props'] == {'type_of_relation': 'http'} and not any(e['boundary'] for e in body['edges'])
+    assert body['next'] is None
+
+def test_subgraph_boundary_edges(client):
+    _site(client)
+    body = client.get('/subgraph?location=private&include_boundary=true').get_json()
+    boundary = sorted((e['source'], e['target']) for e in body['edges'] if e['boundary'])
+    assert boundary == [('c2', 'c3'), ('c4', 'c1')]
+    assert len(body['edges']) == 5
+
+def test_subgraph_pages_return_every_edge_once(client):
+    _site(client)
+    nodes, edges, after = [], [], ''
+    while after is not None:
+        body = client.get(f'/subgraph?include_boundary=true&limit=2&after={after}').get_json()
+        nodes += [node['id'] for node in body['nodes']]
+        edges += [(e['source'], e['target']) for e in body['edges']]
+        after = body['next']
+    assert nodes == ['c0', 'c1', 'c2', 'c3', 'c4']
+    assert len(edges) == len(set(edges)) == 6
+
+@pytest.mark.neo4j
+def test_neo4j_pattern_comprehensions(client, neo4j_repo):
+    _site(client)
+    rows = neo4j_repo.subgraph({'location': 'private'}, True, '', 10)
+    assert [component.id for component, _ in rows] == ['c0', 'c1', 'c2']
+    edges = {(e['source'], e['target']): e['boundary'] for _, relationships in rows for e in relationships}
+    assert edges == {('c0', 'c1'): False, ('c1', 'c2'): False, ('c2', 'c0'): False, ('c2', 'c3'): True, ('c4', 'c1'): True}
+    assert rows[0][1] == [{'source': 'c0', 'target': 'c1', 'props': {'type_of_relation': 'http'}, 'boundary': False}]
+
+    rows = neo4j_repo.subgraph({'location': 'private'}, False, 'c0', 1)
+    assert [(component.id, [(e['source'], e['target']) for e in relationships]) for component, relationships in rows] == [('c1', [('c1', 'c2')])]
+    assert len(neo4j_repo.subgraph({}, True, '', 10)) == 5
@@ -0,0 +1,65 @@
+import time
+from app.infrastructure.suggest_index import SuggestIndex, get_suggest_index
+
+def _index():
+    index = SuggestIndex()
+    index.load([('svc-token', 'Token Service'), ('db-01', 'Base de datos'), ('pay', 'Gestión de Pagos'),
+                ('tok-cache', 'AuthToken Cache')])
+    return index
+
+def test_prefix_matching_is_case_and_accent_insensitive():
+    index = _index()
+    assert index.suggest('GESTION') == [{'id': 'pay', 'label': 'Gestión de Pagos'}]
+    assert index.suggest('gestión de p') == [{'id': 'pay', 'label': 'Gestión de Pagos'}]
+    assert [s['id'] for s in index.suggest('tok')] == ['svc-token', 'tok-cache']
+    assert [s['id'] for s in index.suggest('pagos')] == ['pay']
+    assert index.suggest('db-0') == [{'id': 'db-01', 'label': 'Base de datos'}]
+    assert [s['id'] for s in index.suggest('d', limit=1)] == ['db-01']
+    assert index.suggest('  ') == []
+
+def test_changes_update_the_index():
+    index = _index()
+    assert index.apply([
+        {'entity': 'component', 'op': 'update', 'key': 'pay', 'data': {'id': 'pay', 'label': 'Cobros'}},
+        {'entity': 'component', 'op': 'delete', 'key': 'svc-token', 'data': {}},
+        {'entity': 'relationship', 'op': 'create', 'key': 'a->b', 'data': {}},
+    ])
+    assert index.suggest('gestion') == [] and index.suggest('cobr')[0]['id'] == 'pay'
+    assert [s['id'] for s in index.suggest('tok')] == ['tok-cache']
+    assert not index.apply([{'entity': 'component', 'op': 'delete_where', 'key': None, 'data': {}}])
+
+def test_endpoint_follows_writes(app, client):
+    client.post('/components', json={'id': 'api', 'label': 'Configuración API'})
+    assert client.get('/components/suggest?prefix=config').get_json() == [{'id': 'api', 'label': 'Configuración API'}]
+    client.post('/components', json={'id': 'web', 'label': 'Configurador web', 'host': 'h1'})
+    client.delete('/components/api')
+    assert client.get('/components/suggest?prefix=config').get_json() == [{'id': 'web', 'label': 'Configurador web'}]
+
+    client.delete('/components', query_string={'host': 'h1'})
+    with app.app_context():
+        get_suggest_index()
+        app.extensions['suggest_index'].follow()
+    assert client.get('/components/suggest?prefix=config').get_json() == []
+
+def test_index_follows_writes_without_the_change_feed():
+    from app import create_app
+    app = create_app({'TESTING': True, 'REPOSITORY_BACKEND': 'memory', 'CHANGE_FEED': False})
+    client = app.test_client()
+    assert client.get('/components/suggest?prefix=config').get_json() == []
+    client.post('/components', json={'id': 'api', 'label': 'Configuración API', 'host': 'h1'})
+    assert client.get('/components/suggest?prefix=config').get_json() == [{'id': 'api', 'label': 'Configuración API'}]
+
+    client.delete('/components', query_string={'host': 'h1'})
+    follower = app.extensions['suggest_index']
+    assert follower._reload_pending.is_set()
+    with app.app_context():
+        follower.reload()
+    assert client.get('/components/suggest?prefix=config').get_json() == []
+
+def test_suggest_is_fast():
+    index = SuggestIndex()
+    index.load((f'id-{i}', f'Componente número {i}') for i in range(50000))
+    started = time.perf_counter()
+    for _ in range(1000):
+        index.suggest('componente numero 4', 10)
+    assert (time.perf_counter() - started) / 1000 < 0.001
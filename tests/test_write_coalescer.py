@@ -0,0 +1,60 @@
+import threading
+from app.infrastructure.metrics import get_metrics
+from app.infrastructure.write_coalescer import WriteCoalescer
+
+def test_concurrent_submissions_share_one_flush():
+    batches = []
+
+    def flush(items):
+        batches.append(list(items))
+        return [ValueError('odd') if item % 2 else item * 10 for item in items]
+
+    coalescer = WriteCoalescer(flush, window=0.2, max_batch=100)
+    results = {}
+
+    def submit(item):
+        try:
+            results[item] = coalescer.submit(item)
+        except ValueError as e:
+            results[item] = str(e)
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(batches) == 1 and sorted(batches[0]) == list(range(8))
+    assert results == {i: 'odd' if i % 2 else i * 10 for i in range(8)}
+
+def test_full_batch_flushes_without_waiting_and_errors_reach_every_caller():
+    coalescer = WriteCoalescer(lambda items: [len(items)], window=60, max_batch=1)
+    assert coalescer.submit('a') == 1
+
+    def failing(items):
+        raise RuntimeError('transaction failed')
+    coalescer = WriteCoalescer(failing, window=0)
+    try:
+        coalescer.submit('a')
+        assert False, 'expected the batch error'
+    except RuntimeError as e:
+        assert str(e) == 'transaction failed'
+
+def test_api_writes_are_group_committed(app, client):
+    app.config.update(WRITE_COALESCING=True, WRITE_COALESCE_WINDOW_MS=200)
+    responses = []
+
+    def post(cid):
+        responses.append(client.post('/components', json={'id': cid, 'label': cid}).status_code)
+
+    threads = [threading.Thread(target=post, args=(cid,)) for cid in ['a', 'b', 'c', 'a']]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(responses) == [201, 201, 201, 400]
+    assert client.put('/components/b', json={'label': 'B'}).get_json()['label'] == 'B'
+    assert client.put('/components/missing', json={'label': 'x'}).status_code == 404
+    with app.app_context():
+        metrics = get_metrics()
+        assert metrics.value('write_coalescer_items_total', operation='create') == 4
+        assert metrics.value('write_coalescer_commits_total', operation='create') == 1